@@ -29,1675 +29,305 @@ Description:
 """
 
 
+import os
+import sys
+import threading
+from types import MappingProxyType
+
+# the GREET extract shipped with GLEAM
+DATA_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "GLEAM_data.json"
+)
+
+# result of a key that is not found
+_NOT_FOUND = (None, None)
+# serializes the creation of lazily built shared objects; readers of
+# an already built object never take it
+_LAZY_LOCK = threading.Lock()
+# named fuel groups usable in exclusion sets, e.g. "no hydrogen"
+FUEL_GROUPS = {
+    "hydrogen": ("GH2", "LH2", "Gaseous-Hydrogen"),
+    "electricity": ("Electricity",),
+    "heavy-fuel-oil": ("HFO-2.7", "HFO-0.5", "HFO-0.1"),
+}
+
+
+# store names re-exported from GLEAM_store, imported on first access
+_STORE_NAMES = (
+    "EmissionStore", "load_store", "load_json", "default_cache_dir"
+)
+
+
+def __getattr__(name):
+    """
+    Lazy module attributes: `GLEAM.EmissionStore`, `GLEAM.load_store`,
+    `GLEAM.load_json` and `GLEAM.default_cache_dir` import
+    `GLEAM_store` (and numpy) on first access only.
+    """
+    if name in _STORE_NAMES:
+        import GLEAM_store
+        return getattr(GLEAM_store, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _freeze(table):
+    """
+    Recursively wraps a nested dict into read-only mappings.
+    inputs:
+    `table`: dict, the nested GLEAM data.
+    outputs:
+    MappingProxyType, a read-only view that is safe to share.
+    """
+    return MappingProxyType({
+        key: _freeze(value) if isinstance(value, dict) else value
+        for key, value in table.items()
+    })
+
+
+def _check_unit(unit, rate):
+    """
+    Checks once per call that a target unit has the right kind, instead
+    of returning NaN for every row.
+    inputs:
+    `unit`: str, a `GLEAM_units` unit name or alias.
+    `rate`: bool, True for an emission rate unit (e.g. "g/km"), False
+        for a mass unit of totals (e.g. "kg").
+    """
+    import GLEAM_units
+    mass = GLEAM_units.DIMENSIONS[GLEAM_units.code(unit)] == (
+        GLEAM_units.MASS
+    )
+    if rate and mass:
+        raise ValueError(
+            f"unit {unit!r} is a mass unit, expected a rate unit, "
+            "e.g. 'g/km'"
+        )
+    if not rate and not mass:
+        raise ValueError(
+            f"unit {unit!r} is a rate unit, expected a mass unit, e.g. 'kg'"
+        )
+
+
+class _TrackedDict(dict):
+    """
+    Nested dict of the private data of a `GLEAM(mutable=True)`
+    instance. Every write, at any depth, calls `changed`, which drops
+    the instance's columnar store; it is rebuilt from the data on next
+    use. Copies (`copy.deepcopy`, pickle) are plain dicts.
+    """
+    __slots__ = ("_changed",)
+
+    def __init__(self, table, changed):
+        """
+        init
+        inputs:
+        `table`: dict, the nested data to wrap.
+        `changed`: callable, called after every write.
+        """
+        super().__init__(
+            (key, _track(value, changed)) for key, value in table.items()
+        )
+        self._changed = changed
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, _track(value, self._changed))
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._changed()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+
+def _track(value, changed):
+    """
+    Wraps nested dicts into `_TrackedDict`s; other values unchanged.
+    """
+    if isinstance(value, dict) and not isinstance(value, _TrackedDict):
+        return _TrackedDict(value, changed)
+    return value
+
+
+def _invalidator(gleam):
+    """
+    Write callback of the private data of `gleam`: drops the store of
+    the instance (without keeping the instance alive).
+    """
+    import weakref
+    reference = weakref.ref(gleam)
+
+    def changed():
+        gleam = reference()
+        if gleam is not None:
+            gleam.__dict__.pop("store", None)
+    return changed
+
+
+class _StoreFromData():
+    """
+    Class-level fallback of `GLEAM.store`. Instances hold their store
+    as an instance attribute, which takes precedence; once an edit of
+    the private data drops it, the next access rebuilds it here.
+    """
+    def __get__(self, gleam, owner=None):
+        if gleam is None:
+            return self
+        from GLEAM_store import EmissionStore
+        gleam.store = EmissionStore.from_nested(gleam.data)
+        return gleam.store
+
+
 class GLEAM():
     """
     GLEAM
     """
-    def __init__(self):
+    # read-only GLEAM data and its columnar store, built once per process
+    # and shared by instances
+    _shared_data = None
+    _shared_store = None
+    # rebuilds the store of an instance whose private data was edited
+    store = _StoreFromData()
+
+    def __init__(self, mutable=False, store=None):
         """
         init
+        inputs:
+        `mutable`: bool, if True, the instance gets its own private
+            (mutable) copy of the GLEAM data instead of the shared
+            read-only table. Edits of `data` are picked up by the next
+            query, which rebuilds the store.
+        `store`: EmissionStore, queries this store instead of the
+            packaged GLEAM data (see `from_file`).
+        """
+        self._resolver = None
+        # GLEAM_metrics.Metrics of the instance, see `enable_metrics`
+        self.metrics = None
+        if store is not None:
+            # the nested view is only built if `data` is accessed
+            self._data = None
+            if mutable:
+                self.data = store.to_nested()
+            self.store = store
+        elif mutable:
+            self.data = GLEAM._build_data()
+            self.reload()
+        else:
+            # the shared nested view is only built if `data` is accessed
+            self._data = None
+            self.store = GLEAM.shared_store()
+
+    @property
+    def data(self):
+        """
+        The nested GLEAM data: year -> mode -> engine -> fuel ->
+        {"GHG", "Unit"}.
+        """
+        if self._data is None:
+            if self.store is GLEAM._shared_store:
+                self._data = GLEAM.shared_data()
+            else:
+                self._data = _freeze(self.store.to_nested())
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        # a new table (or edits of a private one) replace the store
+        self._data = _track(value, _invalidator(self))
+        self.__dict__.pop("store", None)
+
+    @classmethod
+    def from_file(cls, path=DATA_FILE, cache_dir=None, use_cache=False):
+        """
+        Creates a GLEAM instance from a GREET extract in the GLEAM JSON
+        layout, optionally through the binary store cache (see
+        `load_store`).
+        inputs:
+        `path`: str, the JSON file, `GLEAM_data.json` by default.
+        `cache_dir`: str, the cache directory.
+        `use_cache`: bool, if True, go through the binary store cache.
+        outputs:
+        GLEAM.
+        """
+        from GLEAM_store import load_store
+        return cls(store=load_store(path, cache_dir, use_cache))
+
+    @classmethod
+    def shared_data(cls):
+        """
+        Returns the process-wide, read-only GLEAM data.
+        The table is built on first use only, from the shared store.
+        outputs:
+        MappingProxyType, year -> mode -> engine -> fuel -> record.
+        """
+        if cls._shared_data is None:
+            store = cls.shared_store()
+            with _LAZY_LOCK:
+                if cls._shared_data is None:
+                    cls._shared_data = _freeze(store.to_nested())
+        return cls._shared_data
+
+    @classmethod
+    def shared_store(cls):
+        """
+        Returns the process-wide columnar store of the GLEAM data.
+        Loaded on first use from `GLEAM_data.json`; the binary store
+        cache is not used (it does not make this small table load
+        faster), so `GLEAM()` writes nothing to disk.
+        outputs:
+        EmissionStore.
+        """
+        if cls._shared_store is None:
+            with _LAZY_LOCK:
+                if cls._shared_store is None:
+                    from GLEAM_store import load_store
+                    cls._shared_store = load_store(DATA_FILE)
+        return cls._shared_store
+
+    def reload(self):
         """
-        # GLEAM data
-        self.data = {
-            'metadata': "RECOIL GLEAM data - extracted from GREET 2023rev1 "
-            "- MIT License - Copyright (c) 2024 Dr. Zeyu Liu",
-            2025: {
-                "Long_Haul": {
-                    "CIDI": {
-                        "Diesel": {
-                            "GHG": 1489.00,
-                            "Unit": "g/mile"
-                        },
-                        "Biodiesel": {
-                            "GHG": 1303.00,
-                            "Unit": "g/mile"
-                        },
-                        "Renewable-Diesel": {
-                            "GHG": 405.00,
-                            "Unit": "g/mile"
-                        },
-                        "DME": {
-                            "GHG": 1609.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 1427.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "SL": {
-                        "CNG": {
-                            "GHG": 1357.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 1407.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Electric": {
-                        "Electricity": {
-                            "GHG": 981.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Co-Optimized": {
-                        "Algae-HTL": {
-                            "GHG": 546.45,
-                            "Unit": "g/mile"
-                        },
-                        "Wastewater-Sludge-HTL": {
-                            "GHG": 1266.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "MCCI": {
-                        "Waste-Feedstock": {
-                            "GHG": 761.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Fuel-Cell": {
-                        "GH2": {
-                            "GHG": 1254.00,
-                            "Unit": "g/mile"
-                        },
-                        "LH2": {
-                            "GHG": 1736.00,
-                            "Unit": "g/mile"
-                        },
-                    }
-                },
-                "Short_Haul": {
-                    "CIDI": {
-                        "Diesel": {
-                            "GHG": 2753.00,
-                            "Unit": "g/mile"
-                        },
-                        "Biodiesel": {
-                            "GHG": 2408.00,
-                            "Unit": "g/mile"
-                        },
-                        "Renewable-Diesel": {
-                            "GHG": 748.00,
-                            "Unit": "g/mile"
-                        },
-                        "DME": {
-                            "GHG": 2974.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 2694.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "SL": {
-                        "CNG": {
-                            "GHG": 2504.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 2600.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Electric": {
-                        "Electricity": {
-                            "GHG": 938.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Fuel-Cell": {
-                        "GH2": {
-                            "GHG": 1342.00,
-                            "Unit": "g/mile"
-                        },
-                        "LH2": {
-                            "GHG": 1858.00,
-                            "Unit": "g/mile"
-                        }
-                    }
-                },
-                "Rail": {
-                    "Diesel-Electric": {
-                        "Diesel": {
-                            "GHG": 26.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "LNG": {
-                            "GHG": 23.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "LPG": {
-                            "GHG": 23.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "DME": {
-                            "GHG": 28.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "FTD": {
-                            "GHG": 27.0,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biodiesel-20": {
-                            "GHG": 23.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Renewable-Diesel-II": {
-                            "GHG": 9.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Renewable-Gasoline": {
-                            "GHG": 4.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Gaseous-Hydrogen": {
-                            "GHG": 18.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Electricity": {
-                            "GHG": 13.00,
-                            "Unit": "g/ton.mile"
-                        }
-                    }
-                },
-                "Marine": {
-                    "HFO": {
-                        "HFO-2.7": {
-                            "GHG": 16.61,
-                            "Unit": "g/ton.mile"
-                        },
-                        "HFO-0.5": {
-                            "GHG": 16.82,
-                            "Unit": "g/ton.mile"
-                        },
-                        "HFO-0.1": {
-                            "GHG": 16.88,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "MDO": {
-                        "MDO-1.92": {
-                            "GHG": 15.90,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MDO-0.5": {
-                            "GHG": 16.04,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MDO-0.1": {
-                            "GHG": 16.09,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "MGO": {
-                        "MGO-1": {
-                            "GHG": 15.97,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MGO-0.5": {
-                            "GHG": 16.04,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MGO-0.1": {
-                            "GHG": 16.09,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "LNG": {
-                        "LNG": {
-                            "GHG": 15.59,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "FTD": {
-                        "Natural-Gas": {
-                            "GHG": 18.28,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass-Coal": {
-                            "GHG": 20.87,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass-Natural-Gas": {
-                            "GHG": 11.85,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass": {
-                            "GHG": 1.05,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "Renewable-Diesel": {
-                        "Yellow-Grease-HFO": {
-                            "GHG": 8.88,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Yellow-Grease": {
-                            "GHG": 2.60,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "SVO": {
-                        "SVO": {
-                            "GHG": 2.51,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "Bio-Oil": {
-                        "Pyrolysis-Oil-Woody-Biomass": {
-                            "GHG": 1.77,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "Biodiesel": {
-                        "Biodiesel": {
-                            "GHG": 5.66,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "MeOH": {
-                        "Natural-Gas": {
-                            "GHG": 23.11,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Flare-Gas": {
-                            "GHG": 1.77,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Renewable-Natural-Gas": {
-                            "GHG": -64.45,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass": {
-                            "GHG": 4.24,
-                            "Unit": "g/ton.mile"
-                        },
-                    },
-                }
-            },
-            2030: {
-                "Long_Haul": {
-                    "CIDI": {
-                        "Diesel": {
-                            "GHG": 1342.00,
-                            "Unit": "g/mile"
-                        },
-                        "Biodiesel": {
-                            "GHG": 1172.00,
-                            "Unit": "g/mile"
-                        },
-                        "Renewable-Diesel": {
-                            "GHG": 334.00,
-                            "Unit": "g/mile"
-                        },
-                        "DME": {
-                            "GHG": 1430.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 1293.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "SL": {
-                        "CNG": {
-                            "GHG": 1215.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 1277.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Electric": {
-                        "Electricity": {
-                            "GHG": 524.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Co-Optimized": {
-                        "Algae-HTL": {
-                            "GHG": 469.27,
-                            "Unit": "g/mile"
-                        },
-                        "Wastewater-Sludge-HTL": {
-                            "GHG": 1140.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "MCCI": {
-                        "Waste-Feedstock": {
-                            "GHG": 678.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Fuel-Cell": {
-                        "GH2": {
-                            "GHG": 1056.00,
-                            "Unit": "g/mile"
-                        },
-                        "LH2": {
-                            "GHG": 1333.00,
-                            "Unit": "g/mile"
-                        },
-                    }
-                },
-                "Short_Haul": {
-                    "CIDI": {
-                        "Diesel": {
-                            "GHG": 2625.00,
-                            "Unit": "g/mile"
-                        },
-                        "Biodiesel": {
-                            "GHG": 2292.00,
-                            "Unit": "g/mile"
-                        },
-                        "Renewable-Diesel": {
-                            "GHG": 653.00,
-                            "Unit": "g/mile"
-                        },
-                        "DME": {
-                            "GHG": 2797.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 2583.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "SL": {
-                        "CNG": {
-                            "GHG": 2373.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 2492.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Electric": {
-                        "Electricity": {
-                            "GHG": 516.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Fuel-Cell": {
-                        "GH2": {
-                            "GHG": 1175.00,
-                            "Unit": "g/mile"
-                        },
-                        "LH2": {
-                            "GHG": 1484.00,
-                            "Unit": "g/mile"
-                        }
-                    }
-                },
-                "Rail": {
-                    "Diesel-Electric": {
-                        "Diesel": {
-                            "GHG": 26.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "LNG": {
-                            "GHG": 23.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "LPG": {
-                            "GHG": 22.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "DME": {
-                            "GHG": 28.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "FTD": {
-                            "GHG": 27.0,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biodiesel-20": {
-                            "GHG": 23.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Renewable-Diesel-II": {
-                            "GHG": 9.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Renewable-Gasoline": {
-                            "GHG": 4.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Gaseous-Hydrogen": {
-                            "GHG": 17.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Electricity": {
-                            "GHG": 8.00,
-                            "Unit": "g/ton.mile"
-                        }
-                    }
-                },
-                "Marine": {
-                    "HFO": {
-                        "HFO-2.7": {
-                            "GHG": 16.51,
-                            "Unit": "g/ton.mile"
-                        },
-                        "HFO-0.5": {
-                            "GHG": 16.72,
-                            "Unit": "g/ton.mile"
-                        },
-                        "HFO-0.1": {
-                            "GHG": 16.78,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "MDO": {
-                        "MDO-1.92": {
-                            "GHG": 15.81,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MDO-0.5": {
-                            "GHG": 15.94,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MDO-0.1": {
-                            "GHG": 16.00,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "MGO": {
-                        "MGO-1": {
-                            "GHG": 15.87,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MGO-0.5": {
-                            "GHG": 15.94,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MGO-0.1": {
-                            "GHG": 15.99,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "LNG": {
-                        "LNG": {
-                            "GHG": 15.56,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "FTD": {
-                        "Natural-Gas": {
-                            "GHG": 18.26,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass-Coal": {
-                            "GHG": 20.79,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass-Natural-Gas": {
-                            "GHG": 11.82,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass": {
-                            "GHG": 0.99,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "Renewable-Diesel": {
-                        "YG&HFO": {
-                            "GHG": 8.80,
-                            "Unit": "g/ton.mile"
-                        },
-                        "YG": {
-                            "GHG": 2.50,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "SVO": {
-                        "SVO": {
-                            "GHG": 2.39,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "Bio-Oil": {
-                        "PO-WB": {
-                            "GHG": 1.43,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "Biodiesel": {
-                        "Biodiesel": {
-                            "GHG": 5.48,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "MeOH": {
-                        "Natural-Gas": {
-                            "GHG": 22.74,
-                            "Unit": "g/ton.mile"
-                        },
-                        "FG": {
-                            "GHG": 1.41,
-                            "Unit": "g/ton.mile"
-                        },
-                        "RNG": {
-                            "GHG": -66.72,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass": {
-                            "GHG": 3.69,
-                            "Unit": "g/ton.mile"
-                        },
-                    },
-                }
-            },
-            2035: {
-                "Long_Haul": {
-                    "CIDI": {
-                        "Diesel": {
-                            "GHG": 1238.00,
-                            "Unit": "g/mile"
-                        },
-                        "Biodiesel": {
-                            "GHG": 1081.00,
-                            "Unit": "g/mile"
-                        },
-                        "Renewable-Diesel": {
-                            "GHG": 301.00,
-                            "Unit": "g/mile"
-                        },
-                        "DME": {
-                            "GHG": 1316.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 1293.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "SL": {
-                        "CNG": {
-                            "GHG": 1121.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 1181.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Electric": {
-                        "Electricity": {
-                            "GHG": 413.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Co-Optimized": {
-                        "Algae-HTL": {
-                            "GHG": 434.46,
-                            "Unit": "g/mile"
-                        },
-                        "Wastewater-Sludge-HTL": {
-                            "GHG": 1051.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "MCCI": {
-                        "Waste-Feedstock": {
-                            "GHG": 623.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Fuel-Cell": {
-                        "GH2": {
-                            "GHG": 933.00,
-                            "Unit": "g/mile"
-                        },
-                        "LH2": {
-                            "GHG": 1160.00,
-                            "Unit": "g/mile"
-                        },
-                    }
-                },
-                "Short_Haul": {
-                    "CIDI": {
-                        "Diesel": {
-                            "GHG": 2537.00,
-                            "Unit": "g/mile"
-                        },
-                        "Biodiesel": {
-                            "GHG": 2215.00,
-                            "Unit": "g/mile"
-                        },
-                        "Renewable-Diesel": {
-                            "GHG": 617.00,
-                            "Unit": "g/mile"
-                        },
-                        "DME": {
-                            "GHG": 2697.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 2498.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "SL": {
-                        "CNG": {
-                            "GHG": 2292.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 2410.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Electric": {
-                        "Electricity": {
-                            "GHG": 421.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Fuel-Cell": {
-                        "GH2": {
-                            "GHG": 1080.00,
-                            "Unit": "g/mile"
-                        },
-                        "LH2": {
-                            "GHG": 1342.00,
-                            "Unit": "g/mile"
-                        }
-                    }
-                },
-                "Rail": {
-                    "Diesel-Electric": {
-                        "Diesel": {
-                            "GHG": 26.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "LNG": {
-                            "GHG": 23.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "LPG": {
-                            "GHG": 22.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "DME": {
-                            "GHG": 28.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "FTD": {
-                            "GHG": 27.0,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biodiesel-20": {
-                            "GHG": 22.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Renewable-Diesel-II": {
-                            "GHG": 9.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Renewable-Gasoline": {
-                            "GHG": 4.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Gaseous-Hydrogen": {
-                            "GHG": 17.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Electricity": {
-                            "GHG": 7.00,
-                            "Unit": "g/ton.mile"
-                        }
-                    }
-                },
-                "Marine": {
-                    "HFO": {
-                        "HFO-2.7": {
-                            "GHG": 16.49,
-                            "Unit": "g/ton.mile"
-                        },
-                        "HFO-0.5": {
-                            "GHG": 16.70,
-                            "Unit": "g/ton.mile"
-                        },
-                        "HFO-0.1": {
-                            "GHG": 16.76,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "MDO": {
-                        "MDO-1.92": {
-                            "GHG": 15.79,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MDO-0.5": {
-                            "GHG": 15.93,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MDO-0.1": {
-                            "GHG": 15.98,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "MGO": {
-                        "MGO-1": {
-                            "GHG": 15.85,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MGO-0.5": {
-                            "GHG": 15.91,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MGO-0.1": {
-                            "GHG": 15.97,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "LNG": {
-                        "LNG": {
-                            "GHG": 15.56,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "FTD": {
-                        "Natural-Gas": {
-                            "GHG": 18.25,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass-Coal": {
-                            "GHG": 20.77,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass-Natural-Gas": {
-                            "GHG": 11.81,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass": {
-                            "GHG": 0.96,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "Renewable-Diesel": {
-                        "YG&HFO": {
-                            "GHG": 8.79,
-                            "Unit": "g/ton.mile"
-                        },
-                        "YG": {
-                            "GHG": 2.48,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "SVO": {
-                        "SVO": {
-                            "GHG": 2.37,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "Bio-Oil": {
-                        "PO-WB": {
-                            "GHG": 1.35,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "Biodiesel": {
-                        "Biodiesel": {
-                            "GHG": 5.45,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "MeOH": {
-                        "Natural-Gas": {
-                            "GHG": 22.68,
-                            "Unit": "g/ton.mile"
-                        },
-                        "FG": {
-                            "GHG": 1.34,
-                            "Unit": "g/ton.mile"
-                        },
-                        "RNG": {
-                            "GHG": -67.12,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass": {
-                            "GHG": 3.88,
-                            "Unit": "g/ton.mile"
-                        },
-                    },
-                }
-            },
-            2040: {
-                "Long_Haul": {
-                    "CIDI": {
-                        "Diesel": {
-                            "GHG": 1238.00,
-                            "Unit": "g/mile"
-                        },
-                        "Biodiesel": {
-                            "GHG": 1080.00,
-                            "Unit": "g/mile"
-                        },
-                        "Renewable-Diesel": {
-                            "GHG": 299.00,
-                            "Unit": "g/mile"
-                        },
-                        "DME": {
-                            "GHG": 1315.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 1194.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "SL": {
-                        "CNG": {
-                            "GHG": 1120.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 1181.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Electric": {
-                        "Electricity": {
-                            "GHG": 396.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Co-Optimized": {
-                        "Algae-HTL": {
-                            "GHG": 432.55,
-                            "Unit": "g/mile"
-                        },
-                        "Wastewater-Sludge-HTL": {
-                            "GHG": 1051.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "MCCI": {
-                        "Waste-Feedstock": {
-                            "GHG": 623.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Fuel-Cell": {
-                        "GH2": {
-                            "GHG": 930.00,
-                            "Unit": "g/mile"
-                        },
-                        "LH2": {
-                            "GHG": 1149.00,
-                            "Unit": "g/mile"
-                        },
-                    }
-                },
-                "Short_Haul": {
-                    "CIDI": {
-                        "Diesel": {
-                            "GHG": 2537.00,
-                            "Unit": "g/mile"
-                        },
-                        "Biodiesel": {
-                            "GHG": 2214.00,
-                            "Unit": "g/mile"
-                        },
-                        "Renewable-Diesel": {
-                            "GHG": 613.00,
-                            "Unit": "g/mile"
-                        },
-                        "DME": {
-                            "GHG": 2694.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 2498.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "SL": {
-                        "CNG": {
-                            "GHG": 2290.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 2410.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Electric": {
-                        "Electricity": {
-                            "GHG": 403.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Fuel-Cell": {
-                        "GH2": {
-                            "GHG": 1077.00,
-                            "Unit": "g/mile"
-                        },
-                        "LH2": {
-                            "GHG": 1330.00,
-                            "Unit": "g/mile"
-                        }
-                    }
-                },
-                "Rail": {
-                    "Diesel-Electric": {
-                        "Diesel": {
-                            "GHG": 26.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "LNG": {
-                            "GHG": 23.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "LPG": {
-                            "GHG": 22.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "DME": {
-                            "GHG": 28.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "FTD": {
-                            "GHG": 27.0,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biodiesel-20": {
-                            "GHG": 22.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Renewable-Diesel-II": {
-                            "GHG": 9.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Renewable-Gasoline": {
-                            "GHG": 4.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Gaseous-Hydrogen": {
-                            "GHG": 17.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Electricity": {
-                            "GHG": 6.00,
-                            "Unit": "g/ton.mile"
-                        }
-                    }
-                },
-                "Marine": {
-                    "HFO": {
-                        "HFO-2.7": {
-                            "GHG": 16.48,
-                            "Unit": "g/ton.mile"
-                        },
-                        "HFO-0.5": {
-                            "GHG": 16.70,
-                            "Unit": "g/ton.mile"
-                        },
-                        "HFO-0.1": {
-                            "GHG": 16.75,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "MDO": {
-                        "MDO-1.92": {
-                            "GHG": 15.78,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MDO-0.5": {
-                            "GHG": 15.92,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MDO-0.1": {
-                            "GHG": 15.97,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "MGO": {
-                        "MGO-1": {
-                            "GHG": 15.85,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MGO-0.5": {
-                            "GHG": 15.91,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MGO-0.1": {
-                            "GHG": 15.96,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "LNG": {
-                        "LNG": {
-                            "GHG": 15.56,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "FTD": {
-                        "Natural-Gas": {
-                            "GHG": 18.25,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass-Coal": {
-                            "GHG": 20.77,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass-Natural-Gas": {
-                            "GHG": 11.81,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass": {
-                            "GHG": 0.96,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "Renewable-Diesel": {
-                        "YG&HFO": {
-                            "GHG": 8.78,
-                            "Unit": "g/ton.mile"
-                        },
-                        "YG": {
-                            "GHG": 2.47,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "SVO": {
-                        "SVO": {
-                            "GHG": 2.37,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "Bio-Oil": {
-                        "PO-WB": {
-                            "GHG": 1.34,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "Biodiesel": {
-                        "Biodiesel": {
-                            "GHG": 5.44,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "MeOH": {
-                        "Natural-Gas": {
-                            "GHG": 22.66,
-                            "Unit": "g/ton.mile"
-                        },
-                        "FG": {
-                            "GHG": 1.32,
-                            "Unit": "g/ton.mile"
-                        },
-                        "RNG": {
-                            "GHG": -67.24,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass": {
-                            "GHG": 3.87,
-                            "Unit": "g/ton.mile"
-                        },
-                    },
-                }
-            },
-            2045: {
-                "Long_Haul": {
-                    "CIDI": {
-                        "Diesel": {
-                            "GHG": 1237.00,
-                            "Unit": "g/mile"
-                        },
-                        "Biodiesel": {
-                            "GHG": 1080.00,
-                            "Unit": "g/mile"
-                        },
-                        "Renewable-Diesel": {
-                            "GHG": 298.00,
-                            "Unit": "g/mile"
-                        },
-                        "DME": {
-                            "GHG": 1313.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 1194.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "SL": {
-                        "CNG": {
-                            "GHG": 1119.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 1181.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Electric": {
-                        "Electricity": {
-                            "GHG": 378.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Co-Optimized": {
-                        "Algae-HTL": {
-                            "GHG": 430.60,
-                            "Unit": "g/mile"
-                        },
-                        "Wastewater-Sludge-HTL": {
-                            "GHG": 1050.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "MCCI": {
-                        "Waste-Feedstock": {
-                            "GHG": 622.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Fuel-Cell": {
-                        "GH2": {
-                            "GHG": 928.00,
-                            "Unit": "g/mile"
-                        },
-                        "LH2": {
-                            "GHG": 1139.00,
-                            "Unit": "g/mile"
-                        },
-                    }
-                },
-                "Short_Haul": {
-                    "CIDI": {
-                        "Diesel": {
-                            "GHG": 2536.00,
-                            "Unit": "g/mile"
-                        },
-                        "Biodiesel": {
-                            "GHG": 2213.00,
-                            "Unit": "g/mile"
-                        },
-                        "Renewable-Diesel": {
-                            "GHG": 610.00,
-                            "Unit": "g/mile"
-                        },
-                        "DME": {
-                            "GHG": 2690.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 2498.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "SL": {
-                        "CNG": {
-                            "GHG": 2289.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 2410.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Electric": {
-                        "Electricity": {
-                            "GHG": 385.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Fuel-Cell": {
-                        "GH2": {
-                            "GHG": 1074.00,
-                            "Unit": "g/mile"
-                        },
-                        "LH2": {
-                            "GHG": 1318.00,
-                            "Unit": "g/mile"
-                        }
-                    }
-                },
-                "Rail": {
-                    "Diesel-Electric": {
-                        "Diesel": {
-                            "GHG": 26.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "LNG": {
-                            "GHG": 23.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "LPG": {
-                            "GHG": 22.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "DME": {
-                            "GHG": 28.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "FTD": {
-                            "GHG": 27.0,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biodiesel-20": {
-                            "GHG": 22.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Renewable-Diesel-II": {
-                            "GHG": 9.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Renewable-Gasoline": {
-                            "GHG": 4.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Gaseous-Hydrogen": {
-                            "GHG": 17.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Electricity": {
-                            "GHG": 6.00,
-                            "Unit": "g/ton.mile"
-                        }
-                    }
-                },
-                "Marine": {
-                    "HFO": {
-                        "HFO-2.7": {
-                            "GHG": 16.48,
-                            "Unit": "g/ton.mile"
-                        },
-                        "HFO-0.5": {
-                            "GHG": 16.69,
-                            "Unit": "g/ton.mile"
-                        },
-                        "HFO-0.1": {
-                            "GHG": 16.75,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "MDO": {
-                        "MDO-1.92": {
-                            "GHG": 15.78,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MDO-0.5": {
-                            "GHG": 15.92,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MDO-0.1": {
-                            "GHG": 15.97,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "MGO": {
-                        "MGO-1": {
-                            "GHG": 15.84,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MGO-0.5": {
-                            "GHG": 15.90,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MGO-0.1": {
-                            "GHG": 15.96,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "LNG": {
-                        "LNG": {
-                            "GHG": 15.56,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "FTD": {
-                        "Natural-Gas": {
-                            "GHG": 18.25,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass-Coal": {
-                            "GHG": 20.77,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass-Natural-Gas": {
-                            "GHG": 11.81,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass": {
-                            "GHG": 0.96,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "Renewable-Diesel": {
-                        "YG&HFO": {
-                            "GHG": 8.78,
-                            "Unit": "g/ton.mile"
-                        },
-                        "YG": {
-                            "GHG": 2.46,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "SVO": {
-                        "SVO": {
-                            "GHG": 2.36,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "Bio-Oil": {
-                        "PO-WB": {
-                            "GHG": 1.32,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "Biodiesel": {
-                        "Biodiesel": {
-                            "GHG": 5.43,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "MeOH": {
-                        "Natural-Gas": {
-                            "GHG": 22.64,
-                            "Unit": "g/ton.mile"
-                        },
-                        "FG": {
-                            "GHG": 1.30,
-                            "Unit": "g/ton.mile"
-                        },
-                        "RNG": {
-                            "GHG": -67.36,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass": {
-                            "GHG": 3.86,
-                            "Unit": "g/ton.mile"
-                        },
-                    },
-                }
-            },
-            2050: {
-                "Long_Haul": {
-                    "CIDI": {
-                        "Diesel": {
-                            "GHG": 1096.00,
-                            "Unit": "g/mile"
-                        },
-                        "Biodiesel": {
-                            "GHG": 957.00,
-                            "Unit": "g/mile"
-                        },
-                        "Renewable-Diesel": {
-                            "GHG": 259.00,
-                            "Unit": "g/mile"
-                        },
-                        "DME": {
-                            "GHG": 1162.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 1050.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "SL": {
-                        "CNG": {
-                            "GHG": 994.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 1181.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Electric": {
-                        "Electricity": {
-                            "GHG": 307.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Co-Optimized": {
-                        "Algae-HTL": {
-                            "GHG": 386.46,
-                            "Unit": "g/mile"
-                        },
-                        "Wastewater-Sludge-HTL": {
-                            "GHG": 931.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "MCCI": {
-                        "Waste-Feedstock": {
-                            "GHG": 550.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Fuel-Cell": {
-                        "GH2": {
-                            "GHG": 789.00,
-                            "Unit": "g/mile"
-                        },
-                        "LH2": {
-                            "GHG": 962.00,
-                            "Unit": "g/mile"
-                        },
-                    }
-                },
-                "Short_Haul": {
-                    "CIDI": {
-                        "Diesel": {
-                            "GHG": 2425.00,
-                            "Unit": "g/mile"
-                        },
-                        "Biodiesel": {
-                            "GHG": 2116.00,
-                            "Unit": "g/mile"
-                        },
-                        "Renewable-Diesel": {
-                            "GHG": 573.00,
-                            "Unit": "g/mile"
-                        },
-                        "DME": {
-                            "GHG": 2571.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 2391.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "SL": {
-                        "CNG": {
-                            "GHG": 2190.00,
-                            "Unit": "g/mile"
-                        },
-                        "LNG": {
-                            "GHG": 2306.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Electric": {
-                        "Electricity": {
-                            "GHG": 316.00,
-                            "Unit": "g/mile"
-                        }
-                    },
-                    "Fuel-Cell": {
-                        "GH2": {
-                            "GHG": 934.00,
-                            "Unit": "g/mile"
-                        },
-                        "LH2": {
-                            "GHG": 1139.00,
-                            "Unit": "g/mile"
-                        }
-                    }
-                },
-                "Rail": {
-                    "Diesel-Electric": {
-                        "Diesel": {
-                            "GHG": 26.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "LNG": {
-                            "GHG": 23.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "LPG": {
-                            "GHG": 22.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "DME": {
-                            "GHG": 28.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "FTD": {
-                            "GHG": 27.0,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biodiesel-20": {
-                            "GHG": 22.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Renewable-Diesel-II": {
-                            "GHG": 9.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Renewable-Gasoline": {
-                            "GHG": 4.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Gaseous-Hydrogen": {
-                            "GHG": 16.00,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Electricity": {
-                            "GHG": 6.00,
-                            "Unit": "g/ton.mile"
-                        }
-                    }
-                },
-                "Marine": {
-                    "HFO": {
-                        "HFO-2.7": {
-                            "GHG": 16.46,
-                            "Unit": "g/ton.mile"
-                        },
-                        "HFO-0.5": {
-                            "GHG": 16.68,
-                            "Unit": "g/ton.mile"
-                        },
-                        "HFO-0.1": {
-                            "GHG": 16.73,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "MDO": {
-                        "MDO-1.92": {
-                            "GHG": 15.76,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MDO-0.5": {
-                            "GHG": 15.90,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MDO-0.1": {
-                            "GHG": 15.95,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "MGO": {
-                        "MGO-1": {
-                            "GHG": 15.82,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MGO-0.5": {
-                            "GHG": 15.88,
-                            "Unit": "g/ton.mile"
-                        },
-                        "MGO-0.1": {
-                            "GHG": 15.94,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "LNG": {
-                        "LNG": {
-                            "GHG": 15.55,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "FTD": {
-                        "Natural-Gas": {
-                            "GHG": 18.25,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass-Coal": {
-                            "GHG": 20.74,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass-Natural-Gas": {
-                            "GHG": 11.80,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass": {
-                            "GHG": 0.92,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "Renewable-Diesel": {
-                        "YG&HFO": {
-                            "GHG": 8.77,
-                            "Unit": "g/ton.mile"
-                        },
-                        "YG": {
-                            "GHG": 2.45,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "SVO": {
-                        "SVO": {
-                            "GHG": 2.35,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "Bio-Oil": {
-                        "PO-WB": {
-                            "GHG": 1.26,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "Biodiesel": {
-                        "Biodiesel": {
-                            "GHG": 5.41,
-                            "Unit": "g/ton.mile"
-                        }
-                    },
-                    "MeOH": {
-                        "Natural-Gas": {
-                            "GHG": 22.60,
-                            "Unit": "g/ton.mile"
-                        },
-                        "FG": {
-                            "GHG": 1.27,
-                            "Unit": "g/ton.mile"
-                        },
-                        "RNG": {
-                            "GHG": -67.59,
-                            "Unit": "g/ton.mile"
-                        },
-                        "Biomass": {
-                            "GHG": 3.86,
-                            "Unit": "g/ton.mile"
-                        },
-                    },
-                }
-            }
-        }
+        Rebuilds the columnar store from `data` now, instead of on the
+        next query after an edit of a `GLEAM(mutable=True)` instance.
+        """
+        from GLEAM_store import EmissionStore
+        self.store = EmissionStore.from_nested(self.data)
+
+    @staticmethod
+    def _build_data():
+        """
+        Builds a new (mutable) copy of the GLEAM data, read from
+        `GLEAM_data.json`.
+        """
+        from GLEAM_store import load_json
+        return load_json(DATA_FILE)
 
     def query(self, year, mode, engine, fuel):
         """
@@ -1712,10 +342,431 @@ class GLEAM():
         (float, str): GHGs Emission and Emission Unit,
             or (None, None) if not found.
         """
-        try:
-            emission = self.data[year][mode][engine][fuel]["GHG"]
-            unit = self.data[year][mode][engine][fuel]["Unit"]
+        # single lookup in the flat key -> result map;
         # If no match is found, return None
-        except KeyError:
+        return self.store._lookup_get((year, mode, engine, fuel), _NOT_FOUND)
+
+    def handle(self, year, mode, engine, fuel):
+        """
+        Resolves a key once to a reusable handle (its record row), e.g.
+        for tight loops over the same key: `query_handle(handle)` is a
+        single tuple index.
+        inputs:
+        `year`, `mode`, `engine`, `fuel`: as in `query`.
+        outputs:
+        int, the handle, or -1 if not found.
+        """
+        return self.store.index.get((year, mode, engine, fuel), -1)
+
+    def query_handle(self, handle):
+        """
+        Retrieves the GHGs emission and emission unit of a handle.
+        inputs:
+        `handle`: int, from `handle`.
+        outputs:
+        (float, str): GHGs Emission and Emission Unit,
+            or (None, None) for the -1 handle.
+        """
+        if handle < 0:
+            return _NOT_FOUND
+        return self.store.records[handle]
+
+    def query_handles(self, handles):
+        """
+        Vectorized `query_handle`.
+        inputs:
+        `handles`: int array of handles, e.g. from `store.locate`.
+        outputs:
+        (np.ndarray, np.ndarray, np.ndarray): as in `query_many`.
+        """
+        import numpy as np
+        handles = np.asarray(handles)
+        found = handles >= 0
+        emission = np.where(found, self.store.ghg[handles], np.nan)
+        unit = np.where(found, self.store.unit_codes[handles], -1)
+        return emission, unit.astype(np.int8), found
+
+    def enable_metrics(self, metrics=None):
+        """
+        Instruments the lookups of this instance: hit counts per key,
+        misses by the key level that failed and latency histograms,
+        exported with `metrics.to_prometheus()` or `metrics.to_json()`.
+        The instrumented methods shadow the class methods on this
+        instance only; other instances keep the plain lookups.
+        inputs:
+        `metrics`: GLEAM_metrics.Metrics, shared counters, e.g. of
+            several instances; a new one if None.
+        outputs:
+        GLEAM_metrics.Metrics, the counters.
+        """
+        from GLEAM_metrics import Metrics
+        self.disable_metrics()
+        metrics = Metrics(self.store) if metrics is None else metrics
+        metrics.attach(self)
+        return metrics
+
+    def disable_metrics(self):
+        """
+        Restores the plain (uninstrumented) lookups of this instance.
+        """
+        if self.metrics is not None:
+            self.metrics.detach(self)
+
+    @property
+    def resolver(self):
+        """
+        KeyResolver used by `resolve_key` and `normalize=True` batch
+        calls; assign a `GLEAM_keys.KeyResolver` to configure aliases.
+        """
+        if self._resolver is None:
+            return self.store.resolver()
+        return self._resolver
+
+    @resolver.setter
+    def resolver(self, value):
+        self._resolver = value
+
+    def _encoder(self, normalize):
+        """
+        Key encoder of batch calls: raw-key resolution if `normalize`.
+        """
+        return self.resolver.encode if normalize else None
+
+    def resolve_key(self, year, mode, engine, fuel):
+        """
+        Canonicalizes a raw key, e.g. ("2025", "long haul", "cidi",
+        "diesel") -> (2025, "Long_Haul", "CIDI", "Diesel").
+        outputs:
+        tuple, the canonical key, with None for unresolved parts.
+        """
+        resolve = self.resolver.resolve
+        return (
+            resolve("year", year), resolve("mode", mode),
+            resolve("engine", engine), resolve("fuel", fuel)
+        )
+
+    def query_many(
+        self, years, modes, engines, fuels, normalize=False, unit=None,
+        tons=None
+    ):
+        """
+        Retrieves the GHGs emissions and emission units of many keys.
+        inputs:
+        `years`, `modes`, `engines`, `fuels`: parallel sequences or
+            arrays of keys (scalars are broadcast), as in `query`.
+        `normalize`: bool, resolve raw keys through `resolver` (case
+            and punctuation folding, aliases) instead of exact matching.
+        `unit`: str, converts the emissions to this rate unit (see
+            `GLEAM_units.UNITS`, e.g. "g/km" or "g/tonne.km"); a mass
+            unit raises ValueError.
+        `tons`: float array, payloads in tons, needed by `unit` to
+            convert between per-distance and per-ton-distance rates.
+        outputs:
+        (np.ndarray, np.ndarray, np.ndarray): float64 GHGs emissions
+            (NaN if not found), int8 unit codes into `self.store.units`
+            (-1 if not found), and a boolean found-mask. With `unit`,
+            the unit codes index `GLEAM_units.UNITS` instead, and are -1
+            (with NaN emissions) where the conversion is not possible.
+        """
+        return self._convert(self.query_handles(self.store.locate(
+            years, modes, engines, fuels, self._encoder(normalize)
+        )), unit, tons)
+
+    def _convert(self, result, unit, tons):
+        """
+        Converts a `query_many`-style result to `unit`, if given.
+        """
+        if unit is None:
+            return result
+        import numpy as np
+        import GLEAM_units
+        _check_unit(unit, rate=True)
+        emission, codes, found = result
+        emission, valid = GLEAM_units.convert(
+            emission, self.store.unit_system[codes], unit, tons
+        )
+        codes = np.where(valid, GLEAM_units.code(unit), -1).astype(np.int8)
+        return emission, codes, found
+
+    def interpolate(
+        self, year, mode, engine, fuel, method="linear", bounds="error"
+    ):
+        """
+        Retrieves the GHGs emission and emission unit at any year within
+        the covered range, interpolated between the 5-year records.
+        inputs:
+        `year`: int or float, e.g. 2027 or 2027.5.
+        `mode`, `engine`, `fuel`: str, as in `query`.
+        `method`: str, "linear" (default) or "step".
+        `bounds`: str, "error" (default), "clamp" or "extrapolate" for
+            years outside the covered range.
+        outputs:
+        (float, str): GHGs Emission and Emission Unit,
+            or (None, None) if not found.
+        """
+        series = self.store.series_index.get((mode, engine, fuel))
+        if series is None:
+            return None, None
+        emission = self.store.interpolate_one(series, year, method, bounds)
+        if emission is None:
             return None, None
-        return emission, unit
+        return emission, self.store.units[self.store.series_units[series]]
+
+    def interpolate_many(
+        self, years, modes, engines, fuels, method="linear", bounds="error",
+        normalize=False, unit=None, tons=None
+    ):
+        """
+        Vectorized `interpolate`: resolves the (mode, engine, fuel)
+        series once per row, then interpolates with one searchsorted
+        over the year grid and one multiply-add.
+        inputs:
+        `years`: array of int or float years.
+        `modes`, `engines`, `fuels`: parallel sequences or arrays of
+            keys (scalars are broadcast).
+        `method`, `bounds`: see `interpolate`.
+        `normalize`, `unit`, `tons`: see `query_many`.
+        outputs:
+        (np.ndarray, np.ndarray, np.ndarray): as in `query_many`.
+        """
+        series = self.store.locate_series(
+            modes, engines, fuels, self._encoder(normalize)
+        )
+        return self._convert(
+            self.interpolate_series(series, years, method, bounds),
+            unit, tons
+        )
+
+    def interpolate_series(
+        self, series, years, method="linear", bounds="error"
+    ):
+        """
+        Vectorized interpolation of resolved series.
+        inputs:
+        `series`: int array of series codes, e.g. from
+            `store.locate_series` (-1 if not found).
+        `years`: float array, broadcast against `series`.
+        `method`, `bounds`: see `interpolate`.
+        outputs:
+        (np.ndarray, np.ndarray, np.ndarray): as in `query_many`.
+        """
+        return self.store.interpolate(series, years, method, bounds)
+
+    def emissions(
+        self, years, modes, engines, fuels, miles, tons=None,
+        interpolate=False, normalize=False, unit=None, **options
+    ):
+        """
+        Computes total GHGs emissions of many shipments, applying each
+        record's unit: g/mile rates are multiplied by miles, g/ton.mile
+        rates by miles times tons. Batches may mix both units.
+        inputs:
+        `years`, `modes`, `engines`, `fuels`: parallel sequences or
+            arrays of keys (scalars are broadcast).
+        `miles`: float array, shipment distances in miles.
+        `tons`: float array, shipment payloads in tons.
+        `interpolate`: bool, if True, rates are interpolated for
+            arbitrary years (see `interpolate_many`); `options` are
+            passed on as `method` and `bounds`.
+        `normalize`: bool, see `query_many`.
+        `unit`: str, mass unit of the totals, e.g. "kg" or "t" (grams if
+            None); a rate unit raises ValueError.
+        outputs:
+        np.ndarray, float64 total GHGs emissions in grams (or `unit`),
+            NaN where the key is not found or a needed payload is
+            missing.
+        """
+        if unit is not None:
+            _check_unit(unit, rate=False)
+        if interpolate:
+            emission, codes, _ = self.interpolate_many(
+                years, modes, engines, fuels, normalize=normalize, **options
+            )
+        else:
+            emission, codes, _ = self.query_many(
+                years, modes, engines, fuels, normalize=normalize
+            )
+        total = self.store.apply_activity(emission, codes, miles, tons)
+        if unit is not None:
+            import GLEAM_units
+            total = GLEAM_units.convert(total, GLEAM_units.CODES["g"], unit)[0]
+        return total
+
+    def shipment_emissions(
+        self, shipments, year="year", mode="mode", engine="engine",
+        fuel="fuel", miles="miles", tons="tons", interpolate=False,
+        normalize=False, unit=None, **options
+    ):
+        """
+        Computes total GHGs emissions of shipment records, see `emissions`.
+        inputs:
+        `shipments`: column mapping, e.g. a pandas DataFrame or a dict
+            of arrays.
+        `year`, `mode`, `engine`, `fuel`, `miles`, `tons`: str, column
+            names; the tons column may be absent if no record needs it.
+        `interpolate`, `normalize`, `unit`, `options`: see `emissions`.
+        outputs:
+        np.ndarray, float64 total GHGs emissions in grams (or `unit`).
+        """
+        return self.emissions(
+            shipments[year], shipments[mode], shipments[engine],
+            shipments[fuel], shipments[miles],
+            shipments[tons] if tons in shipments else None,
+            interpolate, normalize, unit, **options
+        )
+
+    def route_emissions(
+        self, offsets, years, modes, engines, fuels, miles, tons=None,
+        interpolate=False, normalize=False, unit=None, **options
+    ):
+        """
+        Computes the GHGs emissions of multimodal routes given in CSR
+        form: the legs of all routes in flat parallel arrays, and route
+        i made of legs offsets[i]:offsets[i + 1] (e.g. Short_Haul ->
+        Rail -> Marine -> Short_Haul). Leg totals are computed as in
+        `emissions`, and route totals by a segmented sum.
+        inputs:
+        `offsets`: int array, route start offsets into the leg arrays
+            plus the total number of legs (len = routes + 1),
+            e.g. `np.concatenate([[0], np.cumsum(legs_per_route)])`.
+        `years`, `modes`, `engines`, `fuels`, `miles`, `tons`: leg
+            arrays (scalars are broadcast against them), as in
+            `emissions`; per-route values can be expanded with
+            `np.repeat(values, np.diff(offsets))`.
+        `interpolate`, `normalize`, `unit`, `options`: see `emissions`.
+        outputs:
+        (np.ndarray, np.ndarray): float64 total grams (or `unit`) per
+            leg (NaN if the leg is not found or lacks a needed payload)
+            and per route (NaN if any of its legs is NaN, 0 for empty
+            routes).
+        """
+        leg = self.emissions(
+            years, modes, engines, fuels, miles, tons, interpolate,
+            normalize, unit, **options
+        )
+        from GLEAM_store import _segment_sum
+        return leg, _segment_sum(leg, offsets)
+
+    def _options(self, rows):
+        """
+        (key, GHG) pairs of record rows.
+        """
+        keys, values = self.store.keys, self.store._ghg_values
+        return [(keys[row], values[row]) for row in rows]
+
+    def options_between(self, year, unit, low=None, high=None, mode=None):
+        """
+        Lists the options of a year whose GHGs emission lies in a range.
+        inputs:
+        `year`: int, a record year, e.g. 2035.
+        `unit`: str, "g/mile" or "g/ton.mile".
+        `low`, `high`: float, inclusive bounds; None for unbounded.
+        `mode`: str, restricts the options to one transportation mode.
+        outputs:
+        list of ((year, mode, engine, fuel), GHG) by ascending GHG.
+        """
+        return self._options(
+            self.store.value_range(year, unit, low, high, mode)
+        )
+
+    def options_below(
+        self, year, unit, threshold, mode=None, inclusive=False
+    ):
+        """
+        Lists the options of a year emitting under a threshold, e.g.
+        `options_below(2035, "g/ton.mile", 10, mode="Marine")`.
+        inputs:
+        `threshold`: float, the GHGs emission threshold.
+        `inclusive`: bool, include options equal to the threshold.
+        Other inputs as in `options_between`.
+        outputs:
+        list of ((year, mode, engine, fuel), GHG) by ascending GHG.
+        """
+        return self._options(self.store.value_range(
+            year, unit, None, threshold, mode, inclusive
+        ))
+
+    def lowest_option(
+        self, year, mode, engine=None, exclude_fuels=(), exclude_engines=()
+    ):
+        """
+        Finds the lowest-GHG engine/fuel option of a mode in a year,
+        e.g. `lowest_option(2040, "Short_Haul", exclude_fuels=["hydrogen"])`.
+        inputs:
+        `year`: int, a record year.
+        `mode`: str, the transportation mode.
+        `engine`: str, restricts the options to one engine technology.
+        `exclude_fuels`: iterable of fuels or fuel groups (see
+            `FUEL_GROUPS`, e.g. "hydrogen") to leave out, or a single one.
+        `exclude_engines`: iterable of engine technologies to leave out,
+            or a single one.
+        outputs:
+        ((year, mode, engine, fuel), GHG), or None if no option is left.
+        """
+        rows = self.store.ranked(
+            year, mode, 1, engine, exclude_fuels, exclude_engines
+        )
+        return self._options(rows)[0] if rows else None
+
+    def top_options(
+        self, year, mode, k=3, engine=None, exclude_fuels=(),
+        exclude_engines=()
+    ):
+        """
+        Lists the `k` lowest-GHG engine/fuel options of a mode in a year.
+        inputs:
+        `k`: int, number of options (ValueError if negative).
+        Other inputs as in `lowest_option`.
+        outputs:
+        list of ((year, mode, engine, fuel), GHG) by ascending GHG.
+        """
+        return self._options(self.store.ranked(
+            year, mode, k, engine, exclude_fuels, exclude_engines
+        ))
+
+    def nearest_options(self, year, unit, target, k=1, mode=None):
+        """
+        Lists the `k` options of a year whose GHGs emission is closest
+        to a target, e.g. `nearest_options(2030, "g/mile", 500, k=3)`.
+        inputs:
+        `target`: float, the GHGs emission to approach.
+        `k`: int, number of options.
+        Other inputs as in `options_between`.
+        outputs:
+        list of ((year, mode, engine, fuel), GHG), nearest first.
+        """
+        return self._options(
+            self.store.value_nearest(year, unit, target, k, mode)
+        )
+
+
+def main(argv=None):
+    """
+    Command-line entry point: `python -m GLEAM <command> ...`.
+    inputs:
+    `argv`: list of str, the arguments, `sys.argv[1:]` if None.
+    outputs:
+    int, the exit status.
+    """
+    import argparse
+    import GLEAM_enrich
+    import GLEAM_server
+    parser = argparse.ArgumentParser(
+        prog="python -m GLEAM",
+        description="RECOIL GHG Life-cycle Emission Assessment Module"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    enrich = commands.add_parser(
+        "enrich", help="add emission columns to a CSV or Parquet ledger"
+    )
+    GLEAM_enrich.add_arguments(enrich)
+    enrich.set_defaults(run=GLEAM_enrich.run)
+    serve = commands.add_parser("serve", help="run the HTTP query service")
+    GLEAM_server.add_arguments(serve)
+    serve.set_defaults(run=GLEAM_server.run)
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
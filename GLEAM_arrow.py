@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+-------------------
+MIT License
+
+Copyright (c) 2024  Zeyu Liu
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+-------------------
+Description:
+    Apache Arrow and Parquet interop for GLEAM (requires pyarrow): the
+    emission table as an Arrow table with dictionary-encoded key
+    columns, batch query results as Arrow arrays wrapping the result
+    buffers (nulls where not found), Arrow key columns as query input,
+    and Parquet files of the table and of enriched ledgers.
+-------------------
+"""
+
+import numpy as np
+
+import GLEAM_units
+from GLEAM import GLEAM, EmissionStore
+from GLEAM_enrich import (
+    GHG_COLUMN, TOTAL_COLUMN, UNIT_COLUMN, _pyarrow, _to_float
+)
+
+# key columns of the exported table, in order
+KEY_COLUMNS = ("year", "mode", "engine", "fuel")
+# schema metadata entry holding the dataset description
+METADATA_KEY = b"gleam.metadata"
+
+
+class _Categorical():
+    """
+    Categorical view of an Arrow dictionary array, as accepted by
+    `EmissionStore.encode` and `KeyResolver.encode`: only the
+    categories are encoded.
+    """
+    ndim = 1
+
+    def __init__(self, array):
+        """
+        init
+        inputs:
+        `array`: pyarrow.DictionaryArray.
+        """
+        self.categories = array.dictionary.to_numpy(zero_copy_only=False)
+        self.codes = array.indices.fill_null(-1).to_numpy(
+            zero_copy_only=False
+        )
+
+    def __len__(self):
+        return len(self.codes)
+
+
+def _dictionary(pyarrow, codes, categories, valid=None):
+    """
+    Dictionary array of integer codes into `categories`; the codes
+    buffer is wrapped, not copied.
+    """
+    indices = pyarrow.array(
+        codes, mask=None if valid is None else ~valid
+    )
+    return pyarrow.DictionaryArray.from_arrays(
+        indices, pyarrow.array(categories)
+    )
+
+
+def to_table(gleam=None):
+    """
+    The emission table as an Arrow table: dictionary-encoded `year`,
+    `mode`, `engine`, `fuel` and `Unit` columns over the store codes,
+    and a float64 `GHG` column.
+    inputs:
+    `gleam`: GLEAM, the table to export (e.g. a Scenario), the shared
+        `GLEAM()` if None.
+    outputs:
+    pyarrow.Table, one row per record.
+    """
+    pyarrow = _pyarrow()
+    gleam = GLEAM() if gleam is None else gleam
+    store = gleam.store
+    # through `query_handles`, so a scenario exports its own values
+    ghg, unit_codes, _ = gleam.query_handles(
+        np.arange(len(store), dtype=np.int32)
+    )
+    columns = {
+        name: _dictionary(pyarrow, codes, categories)
+        for name, codes, categories in zip(KEY_COLUMNS, (
+            store.year_codes, store.mode_codes, store.engine_codes,
+            store.fuel_codes
+        ), (store.years, store.modes, store.engines, store.fuels))
+    }
+    columns[GHG_COLUMN] = pyarrow.array(ghg)
+    columns[UNIT_COLUMN] = _dictionary(pyarrow, unit_codes, store.units)
+    metadata = None
+    if store.metadata is not None:
+        metadata = {METADATA_KEY: store.metadata.encode("utf-8")}
+    return pyarrow.table(columns, metadata=metadata)
+
+
+def from_table(table):
+    """
+    Builds a store from a table in the `to_table` layout (e.g. read back
+    from Parquet); plain string or integer columns are dictionary
+    encoded first.
+    inputs:
+    `table`: pyarrow.Table.
+    outputs:
+    EmissionStore.
+    """
+    categories, codes = [], []
+    for name in KEY_COLUMNS + (UNIT_COLUMN,):
+        column = table.column(name).combine_chunks()
+        if not hasattr(column, "dictionary"):
+            column = column.dictionary_encode()
+        categories.append(column.dictionary.to_pylist())
+        codes.append(column.indices.to_numpy())
+    metadata = (table.schema.metadata or {}).get(METADATA_KEY)
+    return EmissionStore(
+        *categories, *codes,
+        table.column(GHG_COLUMN).to_numpy(),
+        metadata=None if metadata is None else metadata.decode("utf-8")
+    )
+
+
+def _column(values):
+    """
+    Key column for `EmissionStore.encode`: Arrow dictionary arrays as
+    categoricals (only the dictionary is encoded), other Arrow arrays
+    as numpy arrays; anything else unchanged.
+    """
+    pyarrow = _pyarrow()
+    if isinstance(values, pyarrow.ChunkedArray):
+        values = values.combine_chunks()
+    if isinstance(values, pyarrow.DictionaryArray):
+        return _Categorical(values)
+    if isinstance(values, pyarrow.Array):
+        return values.to_numpy(zero_copy_only=False)
+    return values
+
+
+def query_table(
+    gleam, years, modes, engines, fuels, interpolate=False, **options
+):
+    """
+    Batch query with Arrow results: a float64 `GHG` array wrapping the
+    result buffer and a dictionary-encoded `Unit` array over the unit
+    codes, both null where the key is not found or the conversion to
+    `unit` is not possible.
+    inputs:
+    `gleam`: GLEAM, the emission lookup.
+    `years`, `modes`, `engines`, `fuels`: key columns, as in
+        `GLEAM.query_many`, or Arrow arrays.
+    `interpolate`: bool, use `interpolate_many` for arbitrary years.
+    `options`: passed on to `query_many`/`interpolate_many`, e.g.
+        `unit="g/km"`, `tons=...`, `normalize=True`, `bounds="clamp"`.
+    outputs:
+    pyarrow.Table with `GHG` and `Unit` columns.
+    """
+    pyarrow = _pyarrow()
+    method = gleam.interpolate_many if interpolate else gleam.query_many
+    emission, unit, found = method(
+        _column(years), _column(modes), _column(engines), _column(fuels),
+        **options
+    )
+    # unit codes index GLEAM_units.UNITS once converted
+    units = (
+        gleam.store.units if options.get("unit") is None
+        else GLEAM_units.UNITS
+    )
+    emission, unit, found = (
+        np.atleast_1d(emission), np.atleast_1d(unit), np.atleast_1d(found)
+    )
+    # failed unit conversions (unit code -1) are null, like misses
+    valid = found & (unit >= 0)
+    return pyarrow.table({
+        GHG_COLUMN: pyarrow.array(emission, mask=~valid),
+        UNIT_COLUMN: _dictionary(pyarrow, unit, units, valid),
+    })
+
+
+def enrich_table(
+    table, year="year", mode="mode", engine="engine", fuel="fuel",
+    miles=None, tons=None, gleam=None, interpolate=False, normalize=False
+):
+    """
+    Adds GLEAM emission columns to an Arrow ledger, e.g. read with
+    `pyarrow.parquet.read_table`. Unlike `GLEAM_enrich.enrich`, rows
+    with unknown keys are kept, with null emissions.
+    inputs:
+    `table`: pyarrow.Table, the ledger.
+    `year`, `mode`, `engine`, `fuel`: str, key column names.
+    `miles`, `tons`: str, optional activity column names; if `miles` is
+        given, total grams are added as well.
+    `gleam`: GLEAM, the emission lookup, `GLEAM()` if None.
+    `interpolate`: bool, interpolate rates for arbitrary years within
+        the covered range; other years are null.
+    `normalize`: bool, resolve raw key spellings and aliases.
+    outputs:
+    pyarrow.Table, the ledger with `GHG`, `Unit` (and `GHG_total_g`)
+        columns appended.
+    """
+    pyarrow = _pyarrow()
+    gleam = GLEAM() if gleam is None else gleam
+    keys = [
+        _column(table.column(name)) for name in (year, mode, engine, fuel)
+    ]
+    if interpolate:
+        keys[0] = _to_float(table.column(year).to_numpy())
+        emission, unit, found = gleam.interpolate_many(
+            *keys, bounds="extrapolate", normalize=normalize
+        )
+        # years outside the covered range are null, not extrapolated
+        grid = gleam.store.year_grid
+        found &= (keys[0] >= grid[0]) & (keys[0] <= grid[-1])
+    else:
+        emission, unit, found = gleam.query_many(*keys, normalize=normalize)
+    table = table.append_column(
+        GHG_COLUMN, pyarrow.array(emission, mask=~found)
+    ).append_column(
+        UNIT_COLUMN, _dictionary(pyarrow, unit, gleam.store.units, found)
+    )
+    if miles is not None:
+        total = gleam.store.apply_activity(
+            emission, unit, _to_float(table.column(miles).to_numpy()),
+            None if tons is None else _to_float(table.column(tons).to_numpy())
+        )
+        table = table.append_column(
+            TOTAL_COLUMN,
+            pyarrow.array(total, mask=~found | np.isnan(total))
+        )
+    return table
+
+
+def write_parquet(path, table=None, gleam=None, **kwargs):
+    """
+    Writes the emission table (or any Arrow table, e.g. from
+    `enrich_table`) to a Parquet file.
+    inputs:
+    `path`: str, the Parquet file.
+    `table`: pyarrow.Table, `to_table(gleam)` if None.
+    `gleam`: GLEAM, the table to export if `table` is None.
+    `kwargs`: passed on to `pyarrow.parquet.write_table`, e.g.
+        `compression="zstd"`.
+    """
+    table = to_table(gleam) if table is None else table
+    _pyarrow().parquet.write_table(table, path, **kwargs)
+
+
+def read_parquet(path):
+    """
+    Reads a Parquet file written by `write_parquet` into a GLEAM
+    instance.
+    inputs:
+    `path`: str, the Parquet file.
+    outputs:
+    GLEAM.
+    """
+    return GLEAM(store=from_table(_pyarrow().parquet.read_table(path)))
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+-------------------
+MIT License
+
+Copyright (c) 2024  Zeyu Liu
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+-------------------
+Description:
+    asyncio facade for GLEAM with automatic micro-batching: concurrent
+    `await agleam.aquery(...)` calls are collected for a short window
+    (or up to a size cap) and resolved together with one vectorized
+    key lookup, then all their futures complete at once.
+-------------------
+"""
+
+import asyncio
+
+from GLEAM import GLEAM
+
+
+class AsyncGLEAM():
+    """
+    Micro-batching async lookups over a GLEAM instance (e.g. a
+    Scenario). Use one instance per event loop.
+    """
+    def __init__(self, gleam=None, window=0.0, max_batch=4096):
+        """
+        init
+        inputs:
+        `gleam`: GLEAM, the emission lookup, `GLEAM()` if None.
+        `window`: float, seconds to collect requests after the first
+            pending one; 0 resolves them at the end of the current
+            event-loop iteration, i.e. everything requested in the same
+            tick is batched without added delay.
+        `max_batch`: int, a batch is resolved as soon as it has this
+            many requests.
+        """
+        self.gleam = GLEAM() if gleam is None else gleam
+        self.window = window
+        self.max_batch = max_batch
+        # pending key columns and futures, in request order
+        self._years, self._modes, self._engines, self._fuels = (
+            [], [], [], []
+        )
+        self._futures = []
+        self._timer = None
+        self.batches = 0
+        self.requests = 0
+        self.largest_batch = 0
+
+    def aquery(self, year, mode, engine, fuel):
+        """
+        Retrieves the GHGs emission and emission unit, see
+        `GLEAM.query`, resolved in the next micro-batch.
+        outputs:
+        asyncio.Future of (float, str): GHGs Emission and Emission
+            Unit, or (None, None) if not found.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._years.append(year)
+        self._modes.append(mode)
+        self._engines.append(engine)
+        self._fuels.append(fuel)
+        self._futures.append(future)
+        if len(self._futures) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            if self.window > 0:
+                self._timer = loop.call_later(self.window, self.flush)
+            else:
+                self._timer = loop.call_soon(self.flush)
+        return future
+
+    def flush(self):
+        """
+        Resolves the pending requests now, with one batch lookup; if a
+        malformed key makes it fail, the requests are resolved one by
+        one, so that only the malformed ones fail. The lookup goes
+        through the store directly, so it is not recorded by
+        `GLEAM.enable_metrics`.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        futures = self._futures
+        if not futures:
+            return
+        columns = (self._years, self._modes, self._engines, self._fuels)
+        self._years, self._modes, self._engines, self._fuels = (
+            [], [], [], []
+        )
+        self._futures = []
+        self.batches += 1
+        self.requests += len(futures)
+        self.largest_batch = max(self.largest_batch, len(futures))
+        query_handle = self.gleam.query_handle
+        try:
+            rows = self.gleam.store.locate(*columns).tolist()
+        except Exception:
+            # a malformed key fails the whole batch lookup: resolve the
+            # requests one by one, so only the bad ones fail
+            handle = self.gleam.handle
+            for future, *key in zip(futures, *columns):
+                if future.done():
+                    continue
+                try:
+                    future.set_result(query_handle(handle(*key)))
+                except Exception as error:
+                    future.set_exception(error)
+            return
+        for future, row in zip(futures, rows):
+            # requests cancelled while pending are skipped
+            if not future.done():
+                future.set_result(query_handle(row))
+
+    def stats(self):
+        """
+        Batching statistics.
+        outputs:
+        dict: "batches", "requests", "mean_batch" and "largest_batch".
+        """
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "mean_batch": self.requests / max(self.batches, 1),
+            "largest_batch": self.largest_batch,
+        }
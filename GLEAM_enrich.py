@@ -0,0 +1,579 @@
+#!/usr/bin/env python3
+"""
+-------------------
+MIT License
+
+Copyright (c) 2024  Zeyu Liu
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+-------------------
+Description:
+    Streaming enrichment of shipment ledgers (CSV or Parquet) with GLEAM
+    emissions, in fixed-size chunks so memory stays bounded, optionally
+    split into partitions enriched by a process pool.
+-------------------
+"""
+
+import csv
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from GLEAM import GLEAM
+
+# columns added to the enriched output
+GHG_COLUMN = "GHG"
+UNIT_COLUMN = "Unit"
+TOTAL_COLUMN = "GHG_total_g"
+
+
+def _is_parquet(path):
+    """
+    Whether `path` names a Parquet file.
+    """
+    return os.path.splitext(path)[1].lower() in (".parquet", ".pq")
+
+
+def _pyarrow():
+    """
+    Imports pyarrow, which is only needed for Parquet files.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError(
+            "Parquet support requires pyarrow (pip install pyarrow)"
+        ) from error
+    return pyarrow
+
+
+def read_chunks(path, chunk_size, partition=None):
+    """
+    Reads a CSV or Parquet file in chunks.
+    inputs:
+    `path`: str, the input file.
+    `chunk_size`: int, rows per chunk.
+    `partition`: optional part of the file to read (see `partitions`):
+        a (start, end) byte range for CSV, whose lines starting in the
+        range are read, or a list of row groups for Parquet.
+    outputs:
+    generator of (list, list): column names and one 1-D array per
+        column (object arrays of str for CSV).
+    """
+    if _is_parquet(path):
+        pyarrow = _pyarrow()
+        file = pyarrow.parquet.ParquetFile(path)
+        if partition is not None and not partition:
+            return
+        for batch in file.iter_batches(
+            batch_size=chunk_size, row_groups=partition
+        ):
+            yield batch.schema.names, [
+                column.to_numpy(zero_copy_only=False)
+                for column in batch.columns
+            ]
+        return
+    with open(path, "rb") as file:
+        header = file.readline()
+        if not header:
+            return
+        names = next(csv.reader([header.decode("utf-8")]))
+        start, end = (len(header), None) if partition is None else partition
+        reader = csv.reader(
+            line.decode("utf-8") for line in _lines(file, start, end)
+        )
+        while True:
+            rows = [row for _, row in zip(range(chunk_size), reader)]
+            if not rows:
+                return
+            yield names, _transpose(rows, len(names))
+
+
+def _lines(file, start, end):
+    """
+    Yields the lines of a binary file that start in [start, end).
+    """
+    # skip the line that started before `start`
+    file.seek(start - 1)
+    file.readline()
+    position = file.tell()
+    while end is None or position < end:
+        line = file.readline()
+        if not line:
+            return
+        position += len(line)
+        yield line
+
+
+def partitions(path, count):
+    """
+    Splits a CSV or Parquet file into about `count` parts for
+    `read_chunks`. CSV files are split by byte ranges on line starts
+    (quoted fields must not contain line breaks), Parquet files by row
+    groups.
+    inputs:
+    `path`: str, the input file.
+    `count`: int, number of parts.
+    outputs:
+    list of partitions, in file order.
+    """
+    if _is_parquet(path):
+        groups = _pyarrow().parquet.ParquetFile(path).num_row_groups
+        bounds = np.linspace(0, groups, min(count, groups) + 1).astype(int)
+        return [
+            list(range(low, high)) for low, high in zip(bounds, bounds[1:])
+        ]
+    with open(path, "rb") as file:
+        start = len(file.readline())
+    size = os.path.getsize(path)
+    bounds = np.linspace(start, size, count + 1).astype(int).tolist()
+    return [
+        (low, high) for low, high in zip(bounds, bounds[1:]) if high > low
+    ]
+
+
+def _transpose(rows, width):
+    """
+    Turns CSV rows into one object array per column.
+    """
+    table = np.array(rows, dtype=object)
+    if table.ndim != 2 or table.shape[1] != width:
+        # ragged rows: pad or cut them to the header width
+        table = np.empty((len(rows), width), dtype=object)
+        table[:] = ""
+        for i, row in enumerate(rows):
+            row = row[:width]
+            table[i, :len(row)] = row
+    return [table[:, i] for i in range(width)]
+
+
+class _Writer():
+    """
+    Chunked CSV or Parquet writer, opened on the first chunk.
+    """
+    def __init__(self, path):
+        """
+        init
+        """
+        self.path = path
+        self.file = None
+        self.writer = None
+
+    def write(self, names, columns):
+        """
+        Appends a chunk.
+        inputs:
+        `names`: list of str, column names.
+        `columns`: list of 1-D arrays, one per column.
+        """
+        if _is_parquet(self.path):
+            pyarrow = _pyarrow()
+            table = pyarrow.table(dict(zip(names, columns)))
+            if self.writer is None:
+                self.writer = pyarrow.parquet.ParquetWriter(
+                    self.path, table.schema
+                )
+            self.writer.write_table(table)
+            return
+        if self.writer is None:
+            self.file = open(self.path, "w", newline="", encoding="utf-8")
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(names)
+        self.writer.writerows(zip(*[column.tolist() for column in columns]))
+
+    def close(self):
+        """
+        Closes the file, if any chunk was written.
+        """
+        if self.writer is not None and _is_parquet(self.path):
+            self.writer.close()
+        if self.file is not None:
+            self.file.close()
+
+
+def _write_empty(source, output, miles=None):
+    """
+    Writes an output without rows, for a `source` without data rows:
+    the enriched CSV header, or an empty Parquet table with the
+    enriched schema.
+    inputs:
+    `source`: str, the input file.
+    `output`: str, the output file.
+    `miles`: str, the distance column, if totals are added.
+    """
+    added = [GHG_COLUMN, UNIT_COLUMN] + ([TOTAL_COLUMN] if miles else [])
+    if _is_parquet(source):
+        fields = list(_pyarrow().parquet.read_schema(source))
+        names = [field.name for field in fields]
+    else:
+        with open(source, "r", newline="", encoding="utf-8") as file:
+            names = next(csv.reader(file), [])
+        fields = None
+    if not _is_parquet(output):
+        with open(output, "w", newline="", encoding="utf-8") as file:
+            csv.writer(file).writerow(names + added)
+        return
+    pyarrow = _pyarrow()
+    if fields is None:
+        # CSV columns are read as strings
+        fields = [pyarrow.field(name, pyarrow.string()) for name in names]
+    fields += [
+        pyarrow.field(name, pyarrow.string() if name == UNIT_COLUMN
+                      else pyarrow.float64())
+        for name in added
+    ]
+    pyarrow.parquet.write_table(pyarrow.schema(fields).empty_table(), output)
+
+
+def _to_float(values):
+    """
+    Converts a column to float64; unparsable values become NaN.
+    """
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        result = np.full(len(values), np.nan)
+        for i, value in enumerate(values.tolist()):
+            try:
+                result[i] = float(value)
+            except (TypeError, ValueError):
+                pass
+        return result
+
+
+def enrich_chunk(
+    gleam, names, columns, year, mode, engine, fuel,
+    miles=None, tons=None, interpolate=False, normalize=False
+):
+    """
+    Resolves the emissions of one chunk.
+    inputs:
+    `gleam`: GLEAM, the emission lookup.
+    `names`, `columns`: a chunk, as from `read_chunks`.
+    `year`, `mode`, `engine`, `fuel`: str, key column names.
+    `miles`, `tons`: str, optional activity column names; if `miles` is
+        given, total grams are added as well.
+    `interpolate`: bool, interpolate rates for arbitrary years within
+        the covered range; other years are rejected.
+    `normalize`: bool, resolve raw key spellings and aliases through
+        `gleam.resolver` (see `GLEAM.query_many`).
+    outputs:
+    ((list, list), (list, list)): the enriched chunk (resolved rows with
+        the added columns) and the rejected chunk (unresolved rows, as
+        read).
+    """
+    column = dict(zip(names, columns))
+    keys = (
+        _to_float(column[year]), column[mode], column[engine], column[fuel]
+    )
+    if interpolate:
+        emission, unit, found = gleam.interpolate_many(
+            *keys, bounds="extrapolate", normalize=normalize
+        )
+        # years outside the covered range are rejected, not extrapolated
+        grid = gleam.store.year_grid
+        found &= (keys[0] >= grid[0]) & (keys[0] <= grid[-1])
+    else:
+        emission, unit, found = gleam.query_many(*keys, normalize=normalize)
+    enriched = [values[found] for values in columns]
+    enriched_names = list(names) + [GHG_COLUMN, UNIT_COLUMN]
+    enriched += [
+        emission[found],
+        np.asarray(gleam.store.units, dtype=object)[unit[found]],
+    ]
+    if miles is not None:
+        total = gleam.store.apply_activity(
+            emission[found], unit[found], _to_float(column[miles][found]),
+            None if tons is None else _to_float(column[tons][found])
+        )
+        enriched_names.append(TOTAL_COLUMN)
+        enriched.append(total)
+    rejected = [values[~found] for values in columns]
+    return (enriched_names, enriched), (list(names), rejected)
+
+
+def peak_rss_mb(children=False):
+    """
+    Peak resident set size of this process (or, with `children`, of its
+    largest finished child process) in MB, or None if unknown.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(
+        resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    ).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def default_rejects_path(output):
+    """
+    Reject file next to `output`, e.g. out.csv -> out.rejects.csv.
+    """
+    root, extension = os.path.splitext(output)
+    return f"{root}.rejects{extension}"
+
+
+def _enrich_stream(gleam, chunks, output, rejects, spec):
+    """
+    Enriches `chunks` into an output and a reject file.
+    inputs:
+    `gleam`: GLEAM, the emission lookup.
+    `chunks`: iterable of chunks, as from `read_chunks`.
+    `output`, `rejects`: str, output and reject files.
+    `spec`: dict, key and activity columns, see `enrich_chunk`.
+    outputs:
+    dict: rows read, written and rejected.
+    """
+    stats = {"rows": 0, "written": 0, "rejected": 0}
+    writer, reject_writer = _Writer(output), _Writer(rejects)
+    try:
+        for names, columns in chunks:
+            (names_out, enriched), (_, rejected) = enrich_chunk(
+                gleam, names, columns, **spec
+            )
+            stats["rows"] += len(columns[0])
+            stats["written"] += len(enriched[0])
+            stats["rejected"] += len(rejected[0])
+            writer.write(names_out, enriched)
+            if len(rejected[0]):
+                reject_writer.write(names, rejected)
+    finally:
+        writer.close()
+        reject_writer.close()
+    return stats
+
+
+def enrich(
+    source, output, year, mode, engine, fuel, miles=None, tons=None,
+    rejects=None, chunk_size=100000, interpolate=False, gleam=None,
+    workers=1, partitioned=False, normalize=False
+):
+    """
+    Adds GLEAM emission columns to a CSV or Parquet ledger, chunk by
+    chunk. Rows with unknown keys are written to a reject file instead.
+    inputs:
+    `source`, `output`: str, input and output files; the format follows
+        the extension (.parquet/.pq for Parquet, CSV otherwise).
+    `year`, `mode`, `engine`, `fuel`: str, key column names.
+    `miles`, `tons`: str, optional activity column names.
+    `rejects`: str, reject file, `default_rejects_path(output)` if None.
+    `chunk_size`: int, rows per chunk.
+    `interpolate`: bool, interpolate rates for arbitrary years.
+    `gleam`: GLEAM, the emission lookup, `GLEAM()` if None (ignored by
+        worker processes, which load their own).
+    `workers`: int, number of worker processes; more than 1 splits the
+        input into partitions enriched in parallel.
+    `partitioned`: bool, with several workers, keep one output and one
+        reject file per partition (`<output>.part-NNNNN<ext>`) instead
+        of concatenating them in input order.
+    `normalize`: bool, resolve raw key spellings and aliases.
+    outputs:
+    dict: rows read, written and rejected, seconds and peak RSS in MB
+        (of this process, and of the largest worker if any).
+    """
+    rejects = default_rejects_path(output) if rejects is None else rejects
+    spec = {
+        "year": year, "mode": mode, "engine": engine, "fuel": fuel,
+        "miles": miles, "tons": tons, "interpolate": interpolate,
+        "normalize": normalize
+    }
+    start = time.perf_counter()
+    if workers > 1:
+        stats = _enrich_parallel(
+            source, output, rejects, spec, chunk_size, workers, partitioned
+        )
+    else:
+        gleam = GLEAM() if gleam is None else gleam
+        stats = _enrich_stream(
+            gleam, read_chunks(source, chunk_size), output, rejects, spec
+        )
+    if not stats["rows"]:
+        # no chunk was read, so no writer was opened
+        _write_empty(source, output, miles)
+    stats["seconds"] = time.perf_counter() - start
+    stats["peak_rss_mb"] = peak_rss_mb()
+    return stats
+
+
+# emission lookup of a worker process, loaded once by `_init_worker`
+_worker_gleam = None
+
+
+def _init_worker():
+    """
+    Loads the emission table once per worker process.
+    """
+    global _worker_gleam
+    _worker_gleam = GLEAM()
+
+
+def _enrich_partition(task):
+    """
+    Enriches one partition in a worker process.
+    """
+    source, partition, output, rejects, spec, chunk_size = task
+    return _enrich_stream(
+        _worker_gleam, read_chunks(source, chunk_size, partition),
+        output, rejects, spec
+    )
+
+
+def part_path(path, index):
+    """
+    File of partition `index`, e.g. out.csv -> out.part-00003.csv.
+    """
+    root, extension = os.path.splitext(path)
+    return f"{root}.part-{index:05d}{extension}"
+
+
+def _enrich_parallel(
+    source, output, rejects, spec, chunk_size, workers, partitioned
+):
+    """
+    Enriches the partitions of `source` in a process pool.
+    outputs:
+    dict: rows read, written and rejected, and the largest worker's
+        peak RSS in MB.
+    """
+    # a few partitions per worker balance uneven partitions
+    parts = partitions(source, workers * 4)
+    tasks = [
+        (
+            source, partition, part_path(output, index),
+            part_path(rejects, index), spec, chunk_size
+        )
+        for index, partition in enumerate(parts)
+    ]
+    stats = {"rows": 0, "written": 0, "rejected": 0}
+    with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+        for part in pool.map(_enrich_partition, tasks):
+            for key in stats:
+                stats[key] += part[key]
+    if not partitioned:
+        _concatenate([task[2] for task in tasks], output)
+        _concatenate([task[3] for task in tasks], rejects)
+    stats["worker_peak_rss_mb"] = peak_rss_mb(children=True)
+    return stats
+
+
+def _concatenate(parts, path):
+    """
+    Concatenates partition files in order into `path`, removing them.
+    Partitions without rows have no file and are skipped.
+    """
+    parts = [part for part in parts if os.path.exists(part)]
+    if not parts:
+        return
+    if _is_parquet(path):
+        parquet = _pyarrow().parquet
+        writer = None
+        for part in parts:
+            file = parquet.ParquetFile(part)
+            if writer is None:
+                schema = file.schema_arrow
+                writer = parquet.ParquetWriter(path, schema)
+            for group in range(file.num_row_groups):
+                writer.write_table(file.read_row_group(group).cast(schema))
+        writer.close()
+    else:
+        with open(path, "wb") as target:
+            for index, part in enumerate(parts):
+                with open(part, "rb") as file:
+                    header = file.readline()
+                    if index == 0:
+                        target.write(header)
+                    shutil.copyfileobj(file, target)
+    for part in parts:
+        os.remove(part)
+
+
+def format_stats(stats):
+    """
+    One-line summary of `enrich` statistics.
+    """
+    seconds = max(stats["seconds"], 1e-9)
+    line = (
+        f"{stats['rows']:,d} rows ({stats['written']:,d} written, "
+        f"{stats['rejected']:,d} rejected) in {seconds:.2f} s, "
+        f"{stats['rows'] / seconds:,.0f} rows/s"
+    )
+    if stats["peak_rss_mb"] is not None:
+        line += f", peak RSS {stats['peak_rss_mb']:,.1f} MB"
+    if stats.get("worker_peak_rss_mb") is not None:
+        line += f" (workers: {stats['worker_peak_rss_mb']:,.1f} MB each)"
+    return line
+
+
+def add_arguments(parser):
+    """
+    Adds the `enrich` command-line arguments to an argparse parser.
+    """
+    parser.add_argument("source", help="input ledger (.csv or .parquet)")
+    parser.add_argument("output", help="enriched output (.csv or .parquet)")
+    parser.add_argument("--year-col", default="year")
+    parser.add_argument("--mode-col", default="mode")
+    parser.add_argument("--engine-col", default="engine")
+    parser.add_argument("--fuel-col", default="fuel")
+    parser.add_argument(
+        "--miles-col", help="distance column; adds total grams"
+    )
+    parser.add_argument("--tons-col", help="payload column (ton-miles)")
+    parser.add_argument(
+        "--rejects", help="reject file (default: <output>.rejects.<ext>)"
+    )
+    parser.add_argument("--chunk-size", type=int, default=100000)
+    parser.add_argument(
+        "--interpolate", action="store_true",
+        help="interpolate rates for years between the 5-year records"
+    )
+    parser.add_argument(
+        "--normalize", action="store_true",
+        help="resolve key spellings and aliases, e.g. 'long haul', 'B20'"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="worker processes enriching partitions in parallel"
+    )
+    parser.add_argument(
+        "--partitioned", action="store_true",
+        help="with --workers, keep one output file per partition"
+    )
+
+
+def run(args):
+    """
+    Runs the `enrich` command from parsed arguments.
+    """
+    stats = enrich(
+        args.source, args.output, args.year_col, args.mode_col,
+        args.engine_col, args.fuel_col, args.miles_col, args.tons_col,
+        args.rejects, args.chunk_size, args.interpolate,
+        workers=args.workers, partitioned=args.partitioned,
+        normalize=args.normalize
+    )
+    print(format_stats(stats), file=sys.stderr)
+    return 0
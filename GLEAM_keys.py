@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+-------------------
+MIT License
+
+Copyright (c) 2024  Zeyu Liu
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+-------------------
+Description:
+    Key normalization for GLEAM: resolves raw mode, engine and fuel
+    strings from upstream systems ("long haul", "HFO 2.7%", "B20") to
+    the canonical GLEAM keys, through case/punctuation folding and a
+    configurable alias table, with a bounded memo per column.
+-------------------
+"""
+
+import re
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+# raw -> canonical aliases by column; matched after folding
+DEFAULT_ALIASES = {
+    "mode": {
+        "drayage": "Short_Haul",
+        "railroad": "Rail",
+        "ship": "Marine",
+        "vessel": "Marine",
+    },
+    "engine": {
+        "battery electric": "Electric",
+        "locomotive": "Diesel-Electric",
+    },
+    "fuel": {
+        "B20": "Biodiesel-20",
+        "hydrogen": "Gaseous-Hydrogen",
+        "RD": "Renewable-Diesel",
+        "RD II": "Renewable-Diesel-II",
+        "electric": "Electricity",
+    },
+}
+
+_COLUMNS = ("year", "mode", "engine", "fuel")
+_NOT_FOLDED = re.compile(r"[^0-9a-z.]+")
+
+
+def fold(value):
+    """
+    Case and punctuation folding: lower case, keeping only letters,
+    digits and dots, e.g. "HFO 2.7%" and "HFO-2.7" -> "hfo2.7".
+    """
+    return _NOT_FOLDED.sub("", str(value).lower())
+
+
+def _resolver(column, exact, folded):
+    """
+    Unmemoized raw value -> code function of one column.
+    inputs:
+    `column`: str, the column name.
+    `exact`: dict, canonical key -> code.
+    `folded`: dict, folded key or alias -> code (-1 if ambiguous).
+    """
+    def resolve(raw):
+        code = exact.get(raw)
+        if code is not None:
+            return code
+        if column == "year":
+            # numeric strings and integral floats, e.g. "2025.0"
+            try:
+                year = float(raw)
+            except (TypeError, ValueError):
+                return -1
+            return exact.get(int(year), -1) if year.is_integer() else -1
+        return folded.get(fold(raw), -1)
+    return resolve
+
+
+class KeyResolver():
+    """
+    Resolves raw key values to category codes of an EmissionStore.
+    A value resolves if it is a canonical key, or if its folded form
+    matches a folded canonical key or alias. Results are memoized per
+    column in a bounded LRU, so a ledger that repeats a few hundred
+    distinct raw strings costs about one cache hit per row.
+    Safe for concurrent readers: the memos are thread-safe LRUs, and
+    `add_alias` builds new tables and swaps them in, so lookups never
+    take a lock (the `unresolved` counters are approximate then).
+    """
+    def __init__(self, store, aliases=DEFAULT_ALIASES, cache_size=4096):
+        """
+        init
+        inputs:
+        `store`: EmissionStore, whose category tables are the targets.
+        `aliases`: dict, column -> {raw: canonical} aliases; aliases to
+            keys that are not in the store are ignored.
+        `cache_size`: int, LRU size per column.
+        """
+        self.store = store
+        self.cache_size = cache_size
+        self.aliases = {
+            column: dict(aliases.get(column, {})) for column in _COLUMNS
+        }
+        self.unresolved = dict.fromkeys(_COLUMNS, 0)
+        # serializes writers (`add_alias`); readers never take it
+        self._lock = threading.Lock()
+        self._build()
+
+    def _build(self):
+        """
+        Builds the folded lookup tables and fresh memos, then swaps them
+        in at once, so concurrent lookups see either the old or the new
+        memos.
+        """
+        memos = {}
+        tables = {
+            "year": self.store.years, "mode": self.store.modes,
+            "engine": self.store.engines, "fuel": self.store.fuels,
+        }
+        for column, table in tables.items():
+            exact = {value: code for code, value in enumerate(table)}
+            folded = {}
+            for value, code in exact.items():
+                # folding collisions are ambiguous, not resolved
+                key = fold(value)
+                folded[key] = code if folded.get(key, code) == code else -1
+            for raw, canonical in self.aliases[column].items():
+                if canonical in exact:
+                    folded[fold(raw)] = exact[canonical]
+            memos[column] = lru_cache(maxsize=self.cache_size)(
+                _resolver(column, exact, folded)
+            )
+        self._memo = memos
+
+    def add_alias(self, column, raw, canonical):
+        """
+        Adds an alias and resets the memos.
+        inputs:
+        `column`: str, "mode", "engine" or "fuel".
+        `raw`: str, the raw value.
+        `canonical`: str, the GLEAM key it stands for.
+        """
+        with self._lock:
+            aliases = {
+                name: dict(table) for name, table in self.aliases.items()
+            }
+            aliases[column][raw] = canonical
+            self.aliases = aliases
+            self._build()
+
+    def encode(self, name, values):
+        """
+        Resolves raw values to category codes; same contract as
+        `EmissionStore.encode`, so it can be passed as its `encode`.
+        inputs:
+        `name`: str, "year", "mode", "engine" or "fuel".
+        `values`: scalar, sequence, array or categorical of raw values.
+        outputs:
+        np.ndarray of int32 codes, -1 where unresolved.
+        """
+        memo = self._memo[name]
+        # categorical columns (pandas Categorical, or a Series of one):
+        # resolve the few categories, then gather by category code
+        categorical = getattr(values, "cat", values)
+        if np.ndim(values) == 0:
+            codes = np.asarray(memo(values), dtype=np.int32)
+        elif hasattr(categorical, "categories") and hasattr(
+            categorical, "codes"
+        ):
+            codes = np.fromiter(
+                map(memo, np.asarray(categorical.categories).tolist()),
+                dtype=np.int32, count=len(categorical.categories)
+            )
+            codes = np.append(codes, -1)[np.asarray(categorical.codes)]
+        else:
+            if isinstance(values, np.ndarray):
+                values = values.tolist()
+            codes = np.fromiter(
+                map(memo, values), dtype=np.int32, count=len(values)
+            )
+        self.unresolved[name] += int(np.count_nonzero(codes < 0))
+        return codes
+
+    def resolve(self, name, value):
+        """
+        Canonical key of one raw value.
+        outputs:
+        The canonical key, or None if unresolved.
+        """
+        code = self._memo[name](value)
+        if code < 0:
+            self.unresolved[name] += 1
+            return None
+        return self._table(name)[code]
+
+    def _table(self, name):
+        """
+        Category table of a column.
+        """
+        return {
+            "year": self.store.years, "mode": self.store.modes,
+            "engine": self.store.engines, "fuel": self.store.fuels,
+        }[name]
+
+    def stats(self):
+        """
+        Memo and resolution statistics per column.
+        outputs:
+        dict, column -> {"hits", "misses", "size", "unresolved"}: memo
+            hits and misses, memo entries, and unresolved values seen.
+        """
+        stats = {}
+        for column, memo in self._memo.items():
+            info = memo.cache_info()
+            stats[column] = {
+                "hits": info.hits, "misses": info.misses,
+                "size": info.currsize, "unresolved": self.unresolved[column],
+            }
+        return stats
+
+    def clear(self):
+        """
+        Clears the memos and statistics.
+        """
+        for memo in self._memo.values():
+            memo.cache_clear()
+        self.unresolved = dict.fromkeys(_COLUMNS, 0)
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+-------------------
+MIT License
+
+Copyright (c) 2024  Zeyu Liu
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+-------------------
+Description:
+    Optional lookup instrumentation for GLEAM: per-key hit counts, a
+    miss table by the key level that failed (year, mode, engine, fuel),
+    and log2-bucketed latency histograms per operation, exported as
+    Prometheus text or JSON. Enabled per instance with
+    `GLEAM.enable_metrics()`, which shadows the instance's lookup
+    methods with instrumented ones; disabled instances run the plain
+    class methods, so the overhead is zero.
+-------------------
+"""
+
+import json
+from collections import Counter
+from time import perf_counter_ns
+
+import numpy as np
+
+LEVELS = ("year", "mode", "engine", "fuel")
+# instrumented methods; `query_handles` and `interpolate_series` count
+# batch hits
+OPERATIONS = ("query", "query_many", "interpolate", "interpolate_many")
+# latency buckets: bucket b counts calls of [2^(b-1), 2^b) nanoseconds
+_BUCKETS = 48
+# miss key that collects the misses beyond `max_miss_keys` of a level
+OTHER_KEY = ("other",) * len(LEVELS)
+
+
+class Metrics():
+    """
+    Lookup counters and latency histograms of one or more GLEAM
+    instances (on the same store). Counters are plain dicts and lists
+    updated without locks: increments from concurrent threads may
+    rarely be lost, lookups are never affected.
+    """
+    def __init__(self, store, max_miss_keys=1000):
+        """
+        init
+        inputs:
+        `store`: EmissionStore, the records whose keys are counted.
+        `max_miss_keys`: int, distinct missing keys counted per level;
+            the misses of further keys are counted under `OTHER_KEY`,
+            so free-form misspellings cannot grow the table (and the
+            Prometheus label set) without bound.
+        """
+        self.store = store
+        self.max_miss_keys = max_miss_keys
+        # the instrumented methods hold these counters: `reset` clears
+        # them in place
+        self.hits = Counter()
+        self.misses = Counter()
+        # level -> distinct keys in `misses`
+        self._miss_keys = Counter()
+        # (year,), (year, mode) and (year, mode, engine) prefixes, to
+        # find the level at which a missing key fails
+        self._prefixes = [
+            {key[:length] for key in store.keys} for length in (1, 2, 3)
+        ]
+        # (mode,), (mode, engine) and (mode, engine, fuel) of the
+        # interpolation series
+        self._series_prefixes = [
+            {series[:length] for series in store.series}
+            for length in (1, 2, 3)
+        ]
+        self.reset()
+
+    def reset(self):
+        """
+        Clears all counters and histograms.
+        """
+        self.hits.clear()
+        self.row_hits = np.zeros(len(self.store), dtype=np.int64)
+        self.misses.clear()
+        self._miss_keys.clear()
+        self.latency = {
+            operation: [0] * _BUCKETS for operation in OPERATIONS
+        }
+        self.latency_sum = dict.fromkeys(OPERATIONS, 0)
+        self.rows = dict.fromkeys(OPERATIONS, 0)
+
+    def miss_level(self, key):
+        """
+        The first level of a missing key that has no record, e.g.
+        "fuel" for (2025, "Long_Haul", "CIDI", "Coal").
+        """
+        for length, prefixes in enumerate(self._prefixes, 1):
+            if key[:length] not in prefixes:
+                return LEVELS[length - 1]
+        return "fuel"
+
+    def interpolation_miss_level(self, key):
+        """
+        The failed level of an interpolation miss: the first of mode,
+        engine and fuel without a series, or "year" if the series
+        exists but does not cover the year.
+        """
+        for length, prefixes in enumerate(self._series_prefixes, 1):
+            if key[1:1 + length] not in prefixes:
+                return LEVELS[length]
+        return "year"
+
+    def count_miss(self, level, key, count=1):
+        """
+        Records `count` misses of `key`, failed at `level`.
+        """
+        entry = (level, key)
+        if entry not in self.misses:
+            if self._miss_keys[level] >= self.max_miss_keys:
+                entry = (level, OTHER_KEY)
+            else:
+                self._miss_keys[level] += 1
+        self.misses[entry] += count
+
+    def observe(self, operation, nanoseconds, rows=1):
+        """
+        Records one call of `operation`.
+        """
+        self.latency[operation][
+            min(nanoseconds.bit_length(), _BUCKETS - 1)
+        ] += 1
+        self.latency_sum[operation] += nanoseconds
+        self.rows[operation] += rows
+
+    def _record_misses(self, columns, found, resolve=None, level=None):
+        """
+        Records the misses of a batch from its key columns; `resolve`
+        canonicalizes the raw keys of normalized batches first, and
+        `level` classifies a missing key (`miss_level` if None).
+        """
+        level = self.miss_level if level is None else level
+        missing = np.flatnonzero(~np.asarray(found))
+        if not len(missing):
+            return
+        columns = np.broadcast_arrays(
+            *(np.asarray(column, dtype=object) for column in columns)
+        )
+        # classify each distinct missing key once
+        keys = Counter(zip(*(
+            column.ravel()[missing].tolist() for column in columns
+        )))
+        for key, count in keys.items():
+            if resolve is not None:
+                key = resolve(*key)
+            self.count_miss(level(key), key, count)
+
+    def attach(self, gleam):
+        """
+        Instruments a GLEAM instance: its `query`, `query_handles`,
+        `query_many`, `interpolate`, `interpolate_series` and
+        `interpolate_many` are shadowed by recording wrappers of the
+        class methods.
+        """
+        query = gleam.query
+        interpolate = gleam.interpolate
+        query_handles = gleam.query_handles
+        query_many = gleam.query_many
+        interpolate_series = gleam.interpolate_series
+        interpolate_many = gleam.interpolate_many
+        hits, count_miss, observe = self.hits, self.count_miss, self.observe
+        miss_level = self.miss_level
+        interpolation_miss_level = self.interpolation_miss_level
+        series_keys = self.store.series
+
+        def resolve_series(year, mode, engine, fuel):
+            # normalized interpolations resolve all but the year
+            return (year,) + gleam.resolve_key(year, mode, engine, fuel)[1:]
+
+        def instrumented_query(year, mode, engine, fuel):
+            start = perf_counter_ns()
+            result = query(year, mode, engine, fuel)
+            observe("query", perf_counter_ns() - start)
+            key = (year, mode, engine, fuel)
+            if result[0] is None:
+                count_miss(miss_level(key), key)
+            else:
+                hits[key] += 1
+            return result
+
+        def instrumented_interpolate(year, mode, engine, fuel, *args, **kw):
+            start = perf_counter_ns()
+            result = interpolate(year, mode, engine, fuel, *args, **kw)
+            observe("interpolate", perf_counter_ns() - start)
+            key = (year, mode, engine, fuel)
+            if result[0] is None:
+                count_miss(interpolation_miss_level(key), key)
+            else:
+                hits[key] += 1
+            return result
+
+        def instrumented_query_handles(handles):
+            result = query_handles(handles)
+            handles = np.asarray(handles).ravel()
+            self.row_hits += np.bincount(
+                handles[handles >= 0], minlength=len(self.row_hits)
+            )
+            return result
+
+        def instrumented_query_many(years, modes, engines, fuels,
+                                    normalize=False, *args, **kw):
+            start = perf_counter_ns()
+            result = query_many(
+                years, modes, engines, fuels, normalize, *args, **kw
+            )
+            observe(
+                "query_many", perf_counter_ns() - start, result[2].size
+            )
+            self._record_misses(
+                (years, modes, engines, fuels), result[2],
+                gleam.resolve_key if normalize else None
+            )
+            return result
+
+        def instrumented_interpolate_series(series, years, *args, **kw):
+            result = interpolate_series(series, years, *args, **kw)
+            # hits by distinct (series, year) pair
+            series, years = np.broadcast_arrays(
+                np.asarray(series), np.asarray(years, dtype=np.float64)
+            )
+            found = result[2]
+            pairs, counts = np.unique(
+                np.stack([series[found], years[found]]), axis=1,
+                return_counts=True
+            )
+            for (code, year), count in zip(pairs.T.tolist(),
+                                           counts.tolist()):
+                year = int(year) if year.is_integer() else year
+                hits[(year, *series_keys[int(code)])] += count
+            return result
+
+        def instrumented_interpolate_many(years, modes, engines, fuels,
+                                          method="linear", bounds="error",
+                                          normalize=False, *args, **kw):
+            start = perf_counter_ns()
+            result = interpolate_many(
+                years, modes, engines, fuels, method, bounds, normalize,
+                *args, **kw
+            )
+            observe(
+                "interpolate_many", perf_counter_ns() - start,
+                result[2].size
+            )
+            self._record_misses(
+                (years, modes, engines, fuels), result[2],
+                resolve_series if normalize else None,
+                interpolation_miss_level
+            )
+            return result
+
+        gleam.query = instrumented_query
+        gleam.interpolate = instrumented_interpolate
+        gleam.query_handles = instrumented_query_handles
+        gleam.query_many = instrumented_query_many
+        gleam.interpolate_series = instrumented_interpolate_series
+        gleam.interpolate_many = instrumented_interpolate_many
+        gleam.metrics = self
+
+    @staticmethod
+    def detach(gleam):
+        """
+        Removes the instrumentation of a GLEAM instance.
+        """
+        for name in (
+            "query", "interpolate", "query_handles", "query_many",
+            "interpolate_series", "interpolate_many"
+        ):
+            # delattr, not __dict__.pop: keeps the instance attribute
+            # layout the interpreter's fast attribute lookups rely on
+            try:
+                delattr(gleam, name)
+            except AttributeError:
+                pass
+        gleam.metrics = None
+
+    def hit_counts(self):
+        """
+        Hit counts per key, of scalar and batch lookups.
+        outputs:
+        dict, key -> count, most hit first.
+        """
+        counts = Counter(self.hits)
+        keys = self.store.keys
+        for row in np.flatnonzero(self.row_hits).tolist():
+            counts[keys[row]] += int(self.row_hits[row])
+        return dict(counts.most_common())
+
+    def miss_counts(self):
+        """
+        Miss counts by failed level.
+        outputs:
+        dict, level -> {key: count}, most missed first.
+        """
+        table = {level: Counter() for level in LEVELS}
+        for (level, key), count in self.misses.items():
+            table[level][key] += count
+        return {
+            level: dict(counts.most_common())
+            for level, counts in table.items()
+        }
+
+    def to_dict(self):
+        """
+        All metrics as JSON-serializable data.
+        """
+        return {
+            "hits": [
+                {"key": list(key), "count": count}
+                for key, count in self.hit_counts().items()
+            ],
+            "misses": {
+                level: [
+                    {"key": list(key), "count": count}
+                    for key, count in counts.items()
+                ]
+                for level, counts in self.miss_counts().items()
+            },
+            "latency": {
+                operation: {
+                    "calls": sum(self.latency[operation]),
+                    "rows": self.rows[operation],
+                    "sum_seconds": self.latency_sum[operation] / 1e9,
+                    # bucket upper bounds in seconds -> calls
+                    "buckets": {
+                        f"{2 ** bucket / 1e9:g}": count
+                        for bucket, count in enumerate(
+                            self.latency[operation]
+                        ) if count
+                    },
+                }
+                for operation in OPERATIONS
+            },
+        }
+
+    def to_json(self, **kwargs):
+        """
+        All metrics as a JSON string (`kwargs` go to `json.dumps`).
+        """
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_prometheus(self):
+        """
+        All metrics in the Prometheus text exposition format.
+        """
+        lines = [
+            "# HELP gleam_lookup_hits_total Lookups that found a record.",
+            "# TYPE gleam_lookup_hits_total counter",
+        ]
+        for key, count in self.hit_counts().items():
+            lines.append(
+                f"gleam_lookup_hits_total{{{_labels(key)}}} {count}"
+            )
+        lines += [
+            "# HELP gleam_lookup_misses_total Lookups without a record, "
+            "by the first key level that failed.",
+            "# TYPE gleam_lookup_misses_total counter",
+        ]
+        for (level, key), count in self.misses.items():
+            lines.append(
+                f'gleam_lookup_misses_total{{level="{level}",'
+                f"{_labels(key)}}} {count}"
+            )
+        lines += [
+            "# HELP gleam_latency_seconds Lookup call latency.",
+            "# TYPE gleam_latency_seconds histogram",
+        ]
+        for operation in OPERATIONS:
+            cumulative = 0
+            for bucket, count in enumerate(self.latency[operation]):
+                # every bucket, so the series set is stable over scrapes
+                cumulative += count
+                lines.append(
+                    f'gleam_latency_seconds_bucket{{op="{operation}",'
+                    f'le="{2 ** bucket / 1e9:g}"}} {cumulative}'
+                )
+            lines += [
+                f'gleam_latency_seconds_bucket{{op="{operation}",'
+                f'le="+Inf"}} {cumulative}',
+                f'gleam_latency_seconds_sum{{op="{operation}"}} '
+                f"{self.latency_sum[operation] / 1e9:g}",
+                f'gleam_latency_seconds_count{{op="{operation}"}} '
+                f"{cumulative}",
+            ]
+        lines += [
+            "# HELP gleam_rows_total Keys looked up, by operation.",
+            "# TYPE gleam_rows_total counter",
+        ]
+        for operation in OPERATIONS:
+            lines.append(
+                f'gleam_rows_total{{op="{operation}"}} '
+                f"{self.rows[operation]}"
+            )
+        return "\n".join(lines) + "\n"
+
+
+def _labels(key):
+    """
+    Prometheus labels of a key.
+    """
+    return ",".join(
+        f'{level}="{_escape(value)}"' for level, value in zip(LEVELS, key)
+    )
+
+
+def _escape(value):
+    """
+    Escapes a Prometheus label value.
+    """
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace(
+        "\n", "\\n"
+    )
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+-------------------
+MIT License
+
+Copyright (c) 2024  Zeyu Liu
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+-------------------
+Description:
+    pandas DataFrame accessor for GLEAM (requires pandas). Importing
+    this module registers `df.gleam`:
+        import GLEAM_pandas
+        df = df.gleam.enrich(year="yr", mode="m", engine="e", fuel="f")
+    adds GHG and Unit columns to the whole frame at once, instead of a
+    `GLEAM.query` per row through `df.apply(..., axis=1)`.
+-------------------
+"""
+
+import numpy as np
+import pandas as pd
+
+import GLEAM_units
+from GLEAM import GLEAM
+from GLEAM_enrich import GHG_COLUMN, TOTAL_COLUMN, UNIT_COLUMN
+
+
+def _is_mass(unit):
+    """
+    Whether `unit` is a mass unit (of totals, not rates).
+    """
+    return GLEAM_units.DIMENSIONS[GLEAM_units.code(unit)] == GLEAM_units.MASS
+
+
+def _categorical(column):
+    """
+    A key column as a pandas Categorical: categorical columns as they
+    are, others factorized once, so only the distinct keys are encoded.
+    """
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.array
+    return pd.Categorical(column)
+
+
+@pd.api.extensions.register_dataframe_accessor("gleam")
+class GLEAMAccessor():
+    """
+    `df.gleam`: vectorized GLEAM lookups over the columns of a
+    DataFrame.
+    """
+    def __init__(self, frame):
+        """
+        init
+        inputs:
+        `frame`: pd.DataFrame, the accessed frame.
+        """
+        self._frame = frame
+
+    def enrich(
+        self, year="year", mode="mode", engine="engine", fuel="fuel",
+        miles=None, tons=None, interpolate=False, unit=None,
+        normalize=False, gleam=None, **options
+    ):
+        """
+        Adds GLEAM emission columns. The mode, engine and fuel columns
+        are turned into categoricals, whose few categories are encoded
+        to store codes; the rows are then resolved with one indexed
+        gather over the category codes.
+        inputs:
+        `year`, `mode`, `engine`, `fuel`: str, key column names.
+        `miles`: str, optional distance column; adds total grams as
+            `GHG_total_g`, or totals in `unit` if it is a mass unit, as
+            `GHG_total_<unit>` (e.g. `GHG_total_kg`).
+        `tons`: str, optional payload column, for ton-mile records and
+            conversions between per-mile and per-ton-mile rates.
+        `interpolate`: bool, interpolate rates for arbitrary years (see
+            `GLEAM.interpolate_many`; `bounds=` goes in `options`).
+        `unit`: str, a rate unit (e.g. "g/km") converts `GHG`, a mass
+            unit (e.g. "kg") the totals, which needs `miles`; see
+            `GLEAM_units`.
+        `normalize`: bool, resolve raw key spellings and aliases.
+        `gleam`: GLEAM, the emission lookup, `GLEAM()` if None.
+        outputs:
+        pd.DataFrame, a copy of the frame with a float64 `GHG` column
+            (NaN where not found), a categorical `Unit` column and,
+            with `miles`, the totals column.
+        """
+        mass = unit is not None and _is_mass(unit)
+        if mass and miles is None:
+            raise ValueError(
+                f"unit {unit!r} is a mass unit of totals, which need miles"
+            )
+        frame = self._frame
+        gleam = GLEAM() if gleam is None else gleam
+        store = gleam.store
+        years = frame[year].to_numpy()
+        keys = [_categorical(frame[name]) for name in (mode, engine, fuel)]
+        payload = None if tons is None else frame[tons].to_numpy(
+            dtype=np.float64, na_value=np.nan
+        )
+        # rates in their record units; converted below, so that totals
+        # need no second lookup
+        if interpolate:
+            emission, codes, found = gleam.interpolate_many(
+                years, *keys, normalize=normalize, **options
+            )
+        else:
+            emission, codes, found = gleam.query_many(
+                years, *keys, normalize=normalize
+            )
+        columns = {}
+        total_column = TOTAL_COLUMN
+        if miles is not None:
+            total = store.apply_activity(
+                emission, codes,
+                frame[miles].to_numpy(dtype=np.float64, na_value=np.nan),
+                payload
+            )
+            if mass:
+                # a mass unit applies to the totals, not the rates
+                total = GLEAM_units.convert(
+                    total, GLEAM_units.CODES["g"], unit
+                )[0]
+                total_column = f"GHG_total_{unit}"
+            columns[total_column] = total
+        units = store.units
+        if unit is not None and not mass:
+            emission, valid = GLEAM_units.convert(
+                emission, store.unit_system[codes], unit, payload
+            )
+            codes = np.where(valid, GLEAM_units.code(unit), -1)
+            units = GLEAM_units.UNITS
+        columns[GHG_COLUMN] = emission
+        columns[UNIT_COLUMN] = pd.Categorical.from_codes(codes, units)
+        # GHG and Unit first, as in `GLEAM_enrich`
+        return frame.assign(**{
+            name: columns[name] for name in (
+                GHG_COLUMN, UNIT_COLUMN, total_column
+            ) if name in columns
+        })
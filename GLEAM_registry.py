@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+-------------------
+MIT License
+
+Copyright (c) 2024  Zeyu Liu
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+-------------------
+Description:
+    Registry of GREET releases held side by side, for audits and
+    restatements:
+        registry = Registry({"2023rev1": "GLEAM_data.json",
+                             "2024": "GLEAM_2024.json"})
+        registry.query(2030, "Long_Haul", "CIDI", "Diesel", version="2024")
+    Each release is loaded on first use from its own file, optionally
+    through the binary store cache (see `GLEAM.load_store`). Stores
+    intern their mode, engine, fuel and unit strings, so releases share
+    one copy of each string.
+-------------------
+"""
+
+import os
+import threading
+
+from GLEAM import DATA_FILE, GLEAM
+
+# release of the GREET extract shipped with GLEAM
+DEFAULT_VERSION = "2023rev1"
+
+
+class Registry():
+    """
+    Versioned GLEAM datasets. Each release has its own load lock:
+    loading one release does not block queries against the others, and
+    queries against a loaded release take no lock.
+    """
+    def __init__(self, releases=None, default=None, cache_dir=None,
+                 use_cache=False):
+        """
+        init
+        inputs:
+        `releases`: dict, version -> JSON file path (or GLEAM instance,
+            e.g. a Scenario), `{DEFAULT_VERSION: DATA_FILE}` if None.
+        `default`: str, the version queried when `version` is None, the
+            first registered one if None.
+        `cache_dir`, `use_cache`: see `GLEAM.from_file`.
+        """
+        self.cache_dir = cache_dir
+        self.use_cache = use_cache
+        self.default = default
+        # version -> source, load lock and loaded GLEAM; the registry
+        # lock only guards registration, never a load
+        self._sources = {}
+        self._locks = {}
+        self._loaded = {}
+        self._lock = threading.Lock()
+        if releases is None:
+            releases = {DEFAULT_VERSION: DATA_FILE}
+        for version, source in releases.items():
+            self.register(version, source)
+
+    def register(self, version, source):
+        """
+        Adds a release; nothing is loaded until it is queried.
+        Releases are immutable: a version can be registered only once.
+        inputs:
+        `version`: str, the release name, e.g. "2024".
+        `source`: str, the JSON file of the release (GLEAM layout), or
+            an already built GLEAM instance.
+        """
+        with self._lock:
+            if version in self._sources:
+                raise ValueError(f"GLEAM release {version!r} already exists")
+            if isinstance(source, GLEAM):
+                self._loaded[version] = source
+            self._locks[version] = threading.Lock()
+            self._sources[version] = source
+            if self.default is None:
+                self.default = version
+
+    def versions(self):
+        """
+        outputs:
+        list of str, the registered versions, in registration order.
+        """
+        return list(self._sources)
+
+    def is_loaded(self, version):
+        """
+        Whether a release is already loaded.
+        """
+        return version in self._loaded
+
+    def get(self, version=None):
+        """
+        The GLEAM instance of a release, loaded on first use.
+        inputs:
+        `version`: str, the release, `default` if None.
+        outputs:
+        GLEAM.
+        """
+        version = self.default if version is None else version
+        gleam = self._loaded.get(version)
+        if gleam is not None:
+            return gleam
+        lock = self._locks.get(version)
+        if lock is None:
+            raise ValueError(f"unknown GLEAM release {version!r}")
+        # double-checked: concurrent first queries load the release once,
+        # and only queries of this release wait for it
+        with lock:
+            gleam = self._loaded.get(version)
+            if gleam is None:
+                gleam = self._load(self._sources[version])
+                self._loaded[version] = gleam
+        return gleam
+
+    def _load(self, path):
+        """
+        Loads a release file.
+        """
+        if (
+            os.path.abspath(path) == DATA_FILE and not self.use_cache
+        ):
+            # the packaged extract: share the process-wide store
+            return GLEAM()
+        return GLEAM.from_file(path, self.cache_dir, self.use_cache)
+
+    def query(self, year, mode, engine, fuel, version=None):
+        """
+        `GLEAM.query` against a release.
+        inputs:
+        `version`: str, the release, `default` if None.
+        outputs:
+        (float, str): GHGs Emission and Emission Unit,
+            or (None, None) if not found.
+        """
+        # loaded releases skip `get`
+        gleam = self._loaded.get(self.default if version is None else version)
+        if gleam is None:
+            gleam = self.get(version)
+        return gleam.query(year, mode, engine, fuel)
+
+    def query_many(self, years, modes, engines, fuels, version=None,
+                   **options):
+        """
+        `GLEAM.query_many` against a release; `options` (`normalize`,
+        `unit`, `tons`) are passed on.
+        """
+        return self.get(version).query_many(
+            years, modes, engines, fuels, **options
+        )
+
+    def interpolate(self, year, mode, engine, fuel, version=None,
+                    **options):
+        """
+        `GLEAM.interpolate` against a release.
+        """
+        return self.get(version).interpolate(
+            year, mode, engine, fuel, **options
+        )
+
+    def interpolate_many(self, years, modes, engines, fuels, version=None,
+                         **options):
+        """
+        `GLEAM.interpolate_many` against a release.
+        """
+        return self.get(version).interpolate_many(
+            years, modes, engines, fuels, **options
+        )
+
+    def emissions(self, years, modes, engines, fuels, miles, tons=None,
+                  version=None, **options):
+        """
+        `GLEAM.emissions` against a release.
+        """
+        return self.get(version).emissions(
+            years, modes, engines, fuels, miles, tons, **options
+        )
+
+    def compare(self, year, mode, engine, fuel, versions=None):
+        """
+        One key across releases, e.g. to audit a restatement.
+        inputs:
+        `versions`: list of str, all registered versions if None.
+        outputs:
+        dict, version -> (float, str) as in `query`.
+        """
+        versions = self.versions() if versions is None else versions
+        return {
+            version: self.query(year, mode, engine, fuel, version)
+            for version in versions
+        }
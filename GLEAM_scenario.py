@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+-------------------
+MIT License
+
+Copyright (c) 2024  Zeyu Liu
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+-------------------
+Description:
+    Copy-on-write what-if scenarios over the GLEAM table, e.g.
+    "Electricity 30% cleaner from 2035":
+        Scenario(name="clean-grid").scale(0.7, fuel="Electricity", since=2035)
+    A scenario stores only its overridden records, as a sparse delta over
+    the shared base table; everything else resolves through the base.
+-------------------
+"""
+
+import sys
+
+import numpy as np
+
+from GLEAM import GLEAM, EmissionStore
+
+
+class Scenario(GLEAM):
+    """
+    GLEAM lookup with a sparse delta of overridden records over a base
+    (a GLEAM instance or another Scenario). Point queries check the
+    delta dict, then the base; batch queries resolve through the base
+    and patch the overridden rows in one masked pass. Interpolation and
+    the option queries run on a private store with the delta applied,
+    built on first use. Edit a scenario before deriving others from it,
+    and from one thread at a time; queries may run concurrently.
+    """
+    def __init__(self, base=None, name=None):
+        """
+        init
+        inputs:
+        `base`: GLEAM, the table this scenario overrides, the shared
+            `GLEAM()` if None.
+        `name`: str, a label for the scenario.
+        """
+        self.base = GLEAM() if base is None else base
+        self.name = name
+        # (delta, base, GLEAM) of the last materialization
+        self._materialized = None
+        super().__init__(store=self.base.store)
+        self._update({})
+
+    def _update(self, overrides):
+        """
+        Swaps in a new overrides dict after an edit, with its row-sorted
+        delta arrays. Edits build a new dict instead of changing the
+        current one, and the delta is one (rows, GHG, unit codes) tuple,
+        so concurrent queries see either the old or the new delta.
+        inputs:
+        `overrides`: dict, key -> (GHG, unit) of the overridden records.
+        """
+        index = self.store.index
+        rows = sorted(index[key] for key in overrides)
+        keys = self.store.keys
+        delta = (
+            np.array(rows, dtype=np.int64),
+            np.array(
+                [overrides[keys[row]][0] for row in rows], dtype=np.float64
+            ),
+            np.array(
+                [self.store.units.index(overrides[keys[row]][1])
+                 for row in rows], dtype=np.int8
+            ),
+        )
+        self._by_row = {
+            index[key]: record for key, record in overrides.items()
+        }
+        # key -> (GHG, unit) of the overridden records
+        self.overrides = overrides
+        self._delta = delta
+
+    def override(self, year, mode, engine, fuel, ghg, unit=None):
+        """
+        Replaces the record of one key, e.g. a custom LH2 pathway.
+        inputs:
+        `year`, `mode`, `engine`, `fuel`: a key of the base table.
+        `ghg`: float, the GHGs emission.
+        `unit`: str, the emission unit, unchanged if None.
+        outputs:
+        Scenario, this scenario (for chaining).
+        """
+        key = (year, mode, engine, fuel)
+        if key not in self.store.index:
+            raise KeyError(f"{key} is not a record of the base table")
+        unit = self.query(*key)[1] if unit is None else unit
+        if unit not in self.store.units:
+            raise ValueError(f"unknown unit {unit!r}")
+        overrides = dict(self.overrides)
+        overrides[self.store.keys[self.store.index[key]]] = (
+            float(ghg), self.store.units[self.store.units.index(unit)]
+        )
+        self._update(overrides)
+        return self
+
+    def select(
+        self, year=None, mode=None, engine=None, fuel=None, since=None,
+        until=None
+    ):
+        """
+        Lists the keys of the base table matching a filter.
+        inputs:
+        `year`, `mode`, `engine`, `fuel`: exact key parts; None matches
+            any.
+        `since`, `until`: int, inclusive year bounds.
+        outputs:
+        list of (year, mode, engine, fuel) keys.
+        """
+        return [
+            key for key in self.store.keys
+            if (year is None or key[0] == year)
+            and (mode is None or key[1] == mode)
+            and (engine is None or key[2] == engine)
+            and (fuel is None or key[3] == fuel)
+            and (since is None or key[0] >= since)
+            and (until is None or key[0] <= until)
+        ]
+
+    def scale(
+        self, factor, year=None, mode=None, engine=None, fuel=None,
+        since=None, until=None
+    ):
+        """
+        Scales the current GHGs emission of the matching records, e.g.
+        `scale(0.7, fuel="Electricity", since=2035)`.
+        inputs:
+        `factor`: float, the multiplier.
+        Other inputs as in `select`.
+        outputs:
+        Scenario, this scenario (for chaining).
+        """
+        overrides = dict(self.overrides)
+        for key in self.select(year, mode, engine, fuel, since, until):
+            ghg, unit = self.query(*key)
+            overrides[key] = (ghg * factor, unit)
+        self._update(overrides)
+        return self
+
+    def revert(self, year=None, mode=None, engine=None, fuel=None):
+        """
+        Drops the overrides of the matching keys (all if no filter).
+        outputs:
+        Scenario, this scenario (for chaining).
+        """
+        overrides = dict(self.overrides)
+        for key in self.select(year, mode, engine, fuel):
+            overrides.pop(key, None)
+        self._update(overrides)
+        return self
+
+    def __len__(self):
+        return len(self.overrides)
+
+    def nbytes(self):
+        """
+        Approximate memory of the delta in bytes; the keys and the base
+        table are shared, not counted.
+        """
+        records = sum(
+            sys.getsizeof(record) + sys.getsizeof(record[0])
+            for record in self.overrides.values()
+        )
+        return (
+            sys.getsizeof(self.overrides) + sys.getsizeof(self._by_row)
+            + records + sum(array.nbytes for array in self._delta)
+        )
+
+    def materialize(self):
+        """
+        A GLEAM instance on a private store with the delta applied.
+        Built on first use after an edit; used by interpolation and the
+        option queries, whose indexes are precomputed per store.
+        """
+        # the cached instance is keyed to the delta (and base) it was
+        # built from, so one built from a delta that an edit replaced
+        # meanwhile is never returned
+        delta = self._delta
+        base = self.base.materialize() if isinstance(
+            self.base, Scenario
+        ) else self.base
+        materialized = self._materialized
+        if (
+            materialized is None or materialized[0] is not delta
+            or materialized[1] is not base
+        ):
+            store = base.store
+            rows, delta_ghg, delta_units = delta
+            ghg = store.ghg.copy()
+            unit_codes = store.unit_codes.copy()
+            ghg[rows] = delta_ghg
+            unit_codes[rows] = delta_units
+            materialized = (delta, base, GLEAM(store=EmissionStore(
+                store.years, store.modes, store.engines, store.fuels,
+                store.units, store.year_codes, store.mode_codes,
+                store.engine_codes, store.fuel_codes, unit_codes, ghg,
+                store.metadata
+            )))
+            self._materialized = materialized
+        return materialized[2]
+
+    @property
+    def data(self):
+        """
+        The nested data of the scenario (materialized).
+        """
+        return self.materialize().data
+
+    @data.setter
+    def data(self, value):
+        if value is not None:
+            raise AttributeError("edit a Scenario with override or scale")
+
+    def query(self, year, mode, engine, fuel):
+        """
+        Retrieves the GHGs emission and emission unit, see
+        `GLEAM.query`, from the delta, then the base.
+        """
+        key = (year, mode, engine, fuel)
+        record = self.overrides.get(key)
+        if record is None:
+            return self.base.query(year, mode, engine, fuel)
+        return record
+
+    def query_handle(self, handle):
+        """
+        Retrieves the GHGs emission and emission unit of a handle.
+        """
+        record = self._by_row.get(handle)
+        if record is None:
+            return self.base.query_handle(handle)
+        return record
+
+    def query_handles(self, handles):
+        """
+        Vectorized `query_handle`: the base values, with the overridden
+        rows replaced in one masked pass.
+        """
+        handles = np.asarray(handles)
+        emission, unit, found = self.base.query_handles(handles)
+        rows, delta_ghg, delta_units = self._delta
+        if len(rows):
+            position = np.minimum(
+                np.searchsorted(rows, handles), len(rows) - 1
+            )
+            hit = found & (rows[position] == handles)
+            emission = np.where(hit, delta_ghg[position], emission)
+            unit = np.where(hit, delta_units[position], unit)
+        return emission, unit.astype(np.int8), found
+
+    def interpolate(self, *args, **kwargs):
+        """
+        See `GLEAM.interpolate`; runs on the materialized scenario.
+        """
+        return self.materialize().interpolate(*args, **kwargs)
+
+    def interpolate_series(self, *args, **kwargs):
+        """
+        See `GLEAM.interpolate_series`; runs on the materialized
+        scenario, whose series codes are those of the base.
+        """
+        return self.materialize().interpolate_series(*args, **kwargs)
+
+    def options_between(self, *args, **kwargs):
+        """
+        See `GLEAM.options_between`; runs on the materialized scenario.
+        """
+        return self.materialize().options_between(*args, **kwargs)
+
+    def options_below(self, *args, **kwargs):
+        """
+        See `GLEAM.options_below`; runs on the materialized scenario.
+        """
+        return self.materialize().options_below(*args, **kwargs)
+
+    def nearest_options(self, *args, **kwargs):
+        """
+        See `GLEAM.nearest_options`; runs on the materialized scenario.
+        """
+        return self.materialize().nearest_options(*args, **kwargs)
+
+    def lowest_option(self, *args, **kwargs):
+        """
+        See `GLEAM.lowest_option`; runs on the materialized scenario.
+        """
+        return self.materialize().lowest_option(*args, **kwargs)
+
+    def top_options(self, *args, **kwargs):
+        """
+        See `GLEAM.top_options`; runs on the materialized scenario.
+        """
+        return self.materialize().top_options(*args, **kwargs)
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+-------------------
+MIT License
+
+Copyright (c) 2024  Zeyu Liu
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+-------------------
+Description:
+    asyncio HTTP query service for GLEAM (standard library only).
+    Endpoints:
+    GET  /query?year=2025&mode=Long_Haul&engine=CIDI&fuel=Diesel
+         -> {"GHG": 1489.0, "Unit": "g/mile"}, or 404 if not found.
+    POST /batch with {"keys": [[year, mode, engine, fuel], ...]}
+         -> {"results": [{"GHG": ..., "Unit": ...} or null, ...]}
+    GET  /health -> {"status": "ok", "records": ...}
+-------------------
+"""
+
+import asyncio
+import json
+import sys
+from functools import lru_cache
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from GLEAM import GLEAM
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 413: "Payload Too Large",
+}
+
+
+def _response(status, body, keep_alive=True):
+    """
+    Serializes a complete HTTP/1.1 JSON response.
+    inputs:
+    `status`: int, the status code.
+    `body`: bytes, the JSON body.
+    `keep_alive`: bool, keep the connection open.
+    outputs:
+    bytes.
+    """
+    return (
+        f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    ).encode("latin-1") + body
+
+
+def _error(status, message):
+    """
+    JSON error body.
+    """
+    return json.dumps({"error": message}).encode("utf-8")
+
+
+def _year(value):
+    """
+    Year of a request key, the same for `GET /query` and `POST /batch`:
+    numeric strings and integral floats (e.g. "2025", "2025.0" or
+    2025.0) are the int year; unparsable or fractional ones never
+    match; other values are kept.
+    """
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            return None
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else None
+    return value
+
+
+class GLEAMServer():
+    """
+    HTTP query service over a GLEAM instance.
+    The JSON of every record and the full HTTP response of every valid
+    single-key query are serialized once at start-up, so hot requests
+    skip JSON encoding; parsed request targets are memoized in an LRU.
+    """
+    def __init__(self, gleam=None, cache_size=65536, max_body=64 * 2 ** 20):
+        """
+        init
+        inputs:
+        `gleam`: GLEAM, the emission lookup, `GLEAM()` if None.
+        `cache_size`: int, LRU size of request target -> response.
+        `max_body`: int, largest accepted request body in bytes.
+        """
+        self.gleam = GLEAM() if gleam is None else gleam
+        self.max_body = max_body
+        store = self.gleam.store
+        # serialized record JSON, by row; the extra last entry is the
+        # fragment of a missing key (row -1)
+        fragments = [
+            json.dumps({"GHG": ghg, "Unit": unit}).encode("utf-8")
+            for ghg, unit in zip(store._ghg_values, store._unit_values)
+        ]
+        self._fragments = np.array(fragments + [b"null"], dtype=object)
+        # complete single-key responses
+        self._hits = {
+            key: _response(200, fragments[row])
+            for key, row in store.index.items()
+        }
+        self._miss = _response(404, _error(404, "not found"))
+        self._query = lru_cache(maxsize=cache_size)(self._query_response)
+        self._health = _response(200, json.dumps({
+            "status": "ok", "records": len(store),
+            "metadata": store.metadata
+        }).encode("utf-8"))
+
+    def _query_response(self, target):
+        """
+        Response to `GET /query?...` (memoized per request target).
+        inputs:
+        `target`: str, the request target.
+        outputs:
+        bytes, the HTTP response.
+        """
+        parameters = parse_qs(urlsplit(target).query)
+        try:
+            year, mode, engine, fuel = (
+                parameters[name][0]
+                for name in ("year", "mode", "engine", "fuel")
+            )
+        except KeyError:
+            return _response(400, _error(
+                400, "year, mode, engine and fuel are required"
+            ))
+        return self._hits.get((_year(year), mode, engine, fuel), self._miss)
+
+    def batch(self, body):
+        """
+        Response body to `POST /batch`.
+        inputs:
+        `body`: bytes, JSON {"keys": [[year, mode, engine, fuel], ...]}.
+        outputs:
+        (int, bytes): status and JSON body.
+        """
+        try:
+            keys = json.loads(body)["keys"]
+            # zip would silently cut longer keys
+            if not isinstance(keys, list) or not all(
+                isinstance(key, list) and len(key) == 4 for key in keys
+            ):
+                raise ValueError("malformed keys")
+            years, modes, engines, fuels = list(zip(*keys)) or [()] * 4
+            rows = self.gleam.store.locate(
+                np.asarray([_year(year) for year in years], dtype=object),
+                modes, engines, fuels
+            )
+        except (ValueError, KeyError, TypeError):
+            return 400, _error(
+                400, 'expected {"keys": [[year, mode, engine, fuel], ...]}'
+            )
+        return 200, b"".join((
+            b'{"results":[',
+            b",".join(self._fragments[rows].tolist()),
+            b"]}"
+        ))
+
+    def respond(self, method, target, body):
+        """
+        Routes one request.
+        outputs:
+        bytes, the HTTP response (keep-alive).
+        """
+        path = target.split("?", 1)[0]
+        if path == "/query":
+            if method != "GET":
+                return _response(405, _error(405, "use GET"))
+            return self._query(target)
+        if path == "/batch":
+            if method != "POST":
+                return _response(405, _error(405, "use POST"))
+            return _response(*self.batch(body))
+        if path == "/health":
+            return self._health
+        return _response(404, _error(404, f"unknown path {path}"))
+
+    async def handle(self, reader, writer):
+        """
+        Serves the requests of one (keep-alive) connection.
+        """
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ")
+                except ValueError:
+                    writer.write(_response(
+                        400, _error(400, "malformed request"), False
+                    ))
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    writer.write(_response(
+                        400, _error(400, "invalid Content-Length"), False
+                    ))
+                    return
+                if length > self.max_body:
+                    writer.write(_response(
+                        413, _error(413, "request body too large"), False
+                    ))
+                    return
+                body = await reader.readexactly(length) if length else b""
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" and (
+                    version == "HTTP/1.1" or connection == "keep-alive"
+                )
+                response = self.respond(method, target, body)
+                if not keep_alive:
+                    response = response.replace(
+                        b"Connection: keep-alive", b"Connection: close", 1
+                    )
+                writer.write(response)
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                ConnectionError, ValueError):
+            return
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8080):
+        """
+        Starts listening.
+        outputs:
+        asyncio.Server.
+        """
+        return await asyncio.start_server(
+            self.handle, host, port, limit=2 ** 20
+        )
+
+    async def serve_forever(self, host="127.0.0.1", port=8080):
+        """
+        Starts listening and serves until cancelled.
+        """
+        server = await self.start(host, port)
+        address = ", ".join(
+            f"{sock.getsockname()[0]}:{sock.getsockname()[1]}"
+            for sock in server.sockets
+        )
+        print(f"GLEAM service listening on {address}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+
+def add_arguments(parser):
+    """
+    Adds the `serve` command-line arguments to an argparse parser.
+    """
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--cache-size", type=int, default=65536,
+        help="LRU size of memoized query responses"
+    )
+
+
+def run(args):
+    """
+    Runs the `serve` command from parsed arguments.
+    """
+    server = GLEAMServer(cache_size=args.cache_size)
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
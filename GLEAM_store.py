@@ -0,0 +1,861 @@
+#!/usr/bin/env python3
+"""
+-------------------
+MIT License
+
+Copyright (c) 2024  Zeyu Liu
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+-------------------
+Description:
+    Columnar storage of the GLEAM emission records: the integer-coded
+    `EmissionStore`, its binary cache file, and loading of GREET
+    extracts in the GLEAM JSON layout. Imported on first use by
+    `GLEAM`, so that `import GLEAM` does not load numpy.
+-------------------
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from bisect import bisect_left, bisect_right
+from itertools import repeat
+from types import MappingProxyType
+
+import numpy as np
+
+import GLEAM_units
+from GLEAM import _LAZY_LOCK, DATA_FILE, FUEL_GROUPS
+from GLEAM_keys import KeyResolver
+
+# binary store cache layout: magic, header length, JSON header, columns
+_CACHE_MAGIC = b"GLEAMST1"
+_CACHE_ALIGN = 64
+_CACHE_COLUMNS = (
+    "year_codes", "mode_codes", "engine_codes", "fuel_codes",
+    "unit_codes", "ghg"
+)
+# (values, rows) of a value group that does not exist
+_EMPTY_GROUP = ((), ())
+# (rows, masks) of a rank group that does not exist
+_EMPTY_RANKS = ((), MappingProxyType({None: 0}))
+
+
+class EmissionStore():
+    """
+    Columnar GLEAM emission records.
+    Year, mode, engine, fuel and unit are stored as integer codes into
+    small category tables, and GHG values as a float64 array. A
+    precomputed (year, mode, engine, fuel) -> row map resolves a key
+    with a single hash lookup.
+    """
+    def __init__(
+        self, years, modes, engines, fuels, units,
+        year_codes, mode_codes, engine_codes, fuel_codes, unit_codes,
+        ghg, metadata=None
+    ):
+        """
+        init
+        inputs:
+        `years`, `modes`, `engines`, `fuels`, `units`: sequences, the
+            category tables.
+        `year_codes`, `mode_codes`, `engine_codes`, `fuel_codes`,
+            `unit_codes`: int arrays, one code per record.
+        `ghg`: float array, the GHG value of each record.
+        `metadata`: str, dataset description.
+        """
+        # category tables
+        self.years = tuple(int(year) for year in years)
+        # interned, so that keys built from them (and from literals in
+        # caller code) compare by identity in the key index
+        self.modes = tuple(sys.intern(mode) for mode in modes)
+        self.engines = tuple(sys.intern(engine) for engine in engines)
+        self.fuels = tuple(sys.intern(fuel) for fuel in fuels)
+        self.units = tuple(sys.intern(unit) for unit in units)
+        self.metadata = metadata
+        # record columns
+        self.year_codes = np.asarray(year_codes, dtype=np.int16)
+        self.mode_codes = np.asarray(mode_codes, dtype=np.int16)
+        self.engine_codes = np.asarray(engine_codes, dtype=np.int16)
+        self.fuel_codes = np.asarray(fuel_codes, dtype=np.int16)
+        self.unit_codes = np.asarray(unit_codes, dtype=np.int8)
+        self.ghg = np.asarray(ghg, dtype=np.float64)
+        # key -> row index
+        index = {
+            (
+                self.years[y], self.modes[m], self.engines[e], self.fuels[f]
+            ): row
+            for row, (y, m, e, f) in enumerate(zip(
+                self.year_codes.tolist(), self.mode_codes.tolist(),
+                self.engine_codes.tolist(), self.fuel_codes.tolist()
+            ))
+        }
+        self.index = MappingProxyType(index)
+        # row -> key
+        self.keys = tuple(index)
+        # GLEAM_units code of each unit, plus -1 for row -1
+        self.unit_system = np.append(GLEAM_units.codes(self.units), -1)
+        # activity each unit is per: 0 distance, 1 ton-distance, -1 other
+        self.unit_activity = np.array(
+            [_unit_activity(unit) for unit in self.units] + [-1],
+            dtype=np.int8
+        )
+        # Python-level values for the scalar `query` path, so a hit
+        # does not pay for creating numpy scalars
+        self._ghg_values = tuple(self.ghg.tolist())
+        self._unit_values = tuple(
+            self.units[code] for code in self.unit_codes.tolist()
+        )
+        # (GHG, unit) result of each row, and the flat key -> result map;
+        # a miss is a failed `get`, not a raised KeyError
+        self.records = tuple(zip(self._ghg_values, self._unit_values))
+        lookup = {key: self.records[row] for key, row in index.items()}
+        # read-only view; `query` calls the bound `get` of the private
+        # dict, which skips the view's indirection
+        self.lookup = MappingProxyType(lookup)
+        self._lookup_get = lookup.get
+        # per-column value -> code maps, plus sorted category arrays for
+        # encoding numpy columns without a Python loop
+        self._categories = {}
+        for name, table in (
+            ("year", self.years), ("mode", self.modes),
+            ("engine", self.engines), ("fuel", self.fuels)
+        ):
+            values = np.asarray(table)
+            order = np.argsort(values, kind="stable")
+            self._categories[name] = (
+                {value: code for code, value in enumerate(table)},
+                values[order], order
+            )
+        # integer columns (years): (lowest value, value - lowest -> code)
+        # table, so integer arrays encode with one gather
+        self._int_codes = {}
+        if len(self.years):
+            low = min(self.years)
+            codes = np.full(max(self.years) - low + 1, -1, dtype=np.int32)
+            codes[np.asarray(self.years) - low] = np.arange(len(self.years))
+            self._int_codes["year"] = (low, codes)
+        # dense (year, mode, engine, fuel) code -> row table; -1 if absent
+        self._shape = (
+            len(self.years), len(self.modes),
+            len(self.engines), len(self.fuels)
+        )
+        self._dense = np.full(int(np.prod(self._shape)), -1, dtype=np.int32)
+        self._dense[np.ravel_multi_index(
+            (self.year_codes, self.mode_codes,
+             self.engine_codes, self.fuel_codes), self._shape
+        )] = np.arange(len(self.ghg), dtype=np.int32)
+        self._build_series()
+        self._build_values()
+        self._build_ranks()
+        self._resolver = None
+        self._freeze_arrays()
+
+    def _freeze_arrays(self):
+        """
+        Replaces every array attribute by a read-only view, so that the
+        store is immutable after load and safe to share between threads
+        (arrays passed in by the caller stay writable).
+        """
+        for name, value in vars(self).items():
+            if isinstance(value, np.ndarray):
+                value = value.view()
+                value.flags.writeable = False
+                setattr(self, name, value)
+
+    def _build_series(self):
+        """
+        Precomputes the (mode, engine, fuel) series over the sorted
+        year grid: knot values, per-segment slopes and units.
+        """
+        self.year_grid = np.sort(np.asarray(self.years, dtype=np.float64))
+        position = np.searchsorted(
+            self.year_grid, np.asarray(self.years, dtype=np.float64)
+        )
+        series_index = {}
+        series_codes = np.fromiter(
+            (
+                series_index.setdefault(key, len(series_index))
+                for key in zip(
+                    self.mode_codes.tolist(), self.engine_codes.tolist(),
+                    self.fuel_codes.tolist()
+                )
+            ), dtype=np.int32, count=len(self.ghg)
+        )
+        self.series = tuple(
+            (self.modes[m], self.engines[e], self.fuels[f])
+            for m, e, f in series_index
+        )
+        self.series_index = MappingProxyType(
+            {key: code for code, key in enumerate(self.series)}
+        )
+        # knot values, NaN where a series has no record for a year
+        self.series_ghg = np.full(
+            (len(self.series), len(self.year_grid)), np.nan
+        )
+        self.series_ghg[series_codes, position[self.year_codes]] = self.ghg
+        # slope of the segment starting at each knot; the last column is
+        # zero so that the end knot is reproduced exactly
+        self.series_slope = np.zeros_like(self.series_ghg)
+        if len(self.year_grid) > 1:
+            self.series_slope[:, :-1] = (
+                np.diff(self.series_ghg, axis=1) / np.diff(self.year_grid)
+            )
+        self.series_units = np.full(len(self.series), -1, dtype=np.int8)
+        self.series_units[series_codes] = self.unit_codes
+        # Python-level copies for the scalar `interpolate_one` path
+        self._grid_values = self.year_grid.tolist()
+        self._series_values = tuple(map(tuple, self.series_ghg.tolist()))
+        self._slope_values = tuple(map(tuple, self.series_slope.tolist()))
+        # dense (mode, engine, fuel) code -> series table; -1 if absent
+        self._series_dense = np.full(
+            int(np.prod(self._shape[1:])), -1, dtype=np.int32
+        )
+        self._series_dense[np.ravel_multi_index(
+            (self.mode_codes, self.engine_codes, self.fuel_codes),
+            self._shape[1:]
+        )] = series_codes
+
+    def _build_values(self):
+        """
+        Builds the sorted value index: the GHG values of every
+        (year, unit) and (year, unit, mode) group in ascending order,
+        with the rows they belong to.
+        """
+        value_groups = {}
+        for row in np.argsort(self.ghg, kind="stable").tolist():
+            value = self._ghg_values[row]
+            if value != value:
+                continue
+            year, mode = self.keys[row][:2]
+            unit = self._unit_values[row]
+            for group in ((year, unit), (year, unit, mode)):
+                values, rows = value_groups.setdefault(group, ([], []))
+                values.append(value)
+                rows.append(row)
+        self.value_groups = MappingProxyType({
+            group: (tuple(values), tuple(rows))
+            for group, (values, rows) in value_groups.items()
+        })
+
+    def _build_ranks(self):
+        """
+        Builds the option rankings of every (year, mode) and
+        (year, mode, engine) group: its rows by ascending GHG value, and
+        per fuel, engine and fuel group a bitmask of their ranks (bit i
+        set if rank i has it), so exclusions are resolved by masking.
+        """
+        rank_groups = {}
+        for row in np.argsort(self.ghg, kind="stable").tolist():
+            if self._ghg_values[row] != self._ghg_values[row]:
+                continue
+            year, mode, engine, fuel = self.keys[row]
+            for group in ((year, mode), (year, mode, engine)):
+                rows, masks = rank_groups.setdefault(group, ([], {}))
+                bit = 1 << len(rows)
+                rows.append(row)
+                for name in (("fuel", fuel), ("engine", engine)):
+                    masks[name] = masks.get(name, 0) | bit
+        for rows, masks in rank_groups.values():
+            masks[None] = (1 << len(rows)) - 1
+            for name, fuels in FUEL_GROUPS.items():
+                masks[("fuel", name)] = 0
+                for fuel in fuels:
+                    masks[("fuel", name)] |= masks.get(("fuel", fuel), 0)
+        self.rank_groups = MappingProxyType({
+            group: (tuple(rows), MappingProxyType(masks))
+            for group, (rows, masks) in rank_groups.items()
+        })
+
+    @classmethod
+    def from_nested(cls, data):
+        """
+        Builds a store from the nested GLEAM data layout.
+        inputs:
+        `data`: dict, year -> mode -> engine -> fuel -> {"GHG", "Unit"},
+            with an optional "metadata" entry.
+        outputs:
+        EmissionStore.
+        """
+        tables = {"year": {}, "mode": {}, "engine": {}, "fuel": {}}
+        units = {}
+        columns = {name: [] for name in tables}
+        unit_codes, ghg = [], []
+        for year, modes in data.items():
+            if year == "metadata":
+                continue
+            for mode, engines in modes.items():
+                for engine, fuels in engines.items():
+                    for fuel, record in fuels.items():
+                        key = {
+                            "year": int(year), "mode": mode,
+                            "engine": engine, "fuel": fuel
+                        }
+                        for name, value in key.items():
+                            table = tables[name]
+                            columns[name].append(
+                                table.setdefault(value, len(table))
+                            )
+                        unit_codes.append(
+                            units.setdefault(record["Unit"], len(units))
+                        )
+                        ghg.append(record["GHG"])
+        return cls(
+            tables["year"], tables["mode"], tables["engine"],
+            tables["fuel"], units,
+            columns["year"], columns["mode"], columns["engine"],
+            columns["fuel"], unit_codes, ghg,
+            metadata=data.get("metadata")
+        )
+
+    def __len__(self):
+        return len(self.ghg)
+
+    def to_nested(self):
+        """
+        Rebuilds the nested GLEAM data layout.
+        outputs:
+        dict, year -> mode -> engine -> fuel -> {"GHG", "Unit"}.
+        """
+        data = {"metadata": self.metadata}
+        for (year, mode, engine, fuel), row in self.index.items():
+            data.setdefault(year, {}).setdefault(mode, {}).setdefault(
+                engine, {}
+            )[fuel] = {
+                "GHG": self._ghg_values[row], "Unit": self._unit_values[row]
+            }
+        return data
+
+    def save(self, path):
+        """
+        Writes the store to a fixed-layout binary file that `load` can
+        memory-map. The file is replaced atomically.
+        inputs:
+        `path`: str, the output file.
+        """
+        columns = [getattr(self, name) for name in _CACHE_COLUMNS]
+        header = {
+            "metadata": self.metadata,
+            "years": self.years, "modes": self.modes,
+            "engines": self.engines, "fuels": self.fuels,
+            "units": self.units, "length": len(self),
+            "dtypes": [column.dtype.str for column in columns],
+        }
+        header = json.dumps(header).encode("utf-8")
+        # columns start at aligned offsets after the header
+        offset = _aligned(len(_CACHE_MAGIC) + 8 + len(header))
+        directory = os.path.dirname(os.path.abspath(path))
+        handle, temp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                file.write(_CACHE_MAGIC)
+                file.write(len(header).to_bytes(8, "little"))
+                file.write(header)
+                for column in columns:
+                    file.write(b"\0" * (offset - file.tell()))
+                    file.write(np.ascontiguousarray(column).tobytes())
+                    offset = _aligned(file.tell())
+            # mkstemp creates the file 0600; a shared cache directory
+            # must stay readable by other users
+            os.chmod(temp, 0o644)
+            os.replace(temp, path)
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """
+        Memory-maps a store written by `save`.
+        inputs:
+        `path`: str, the binary store file.
+        outputs:
+        EmissionStore, with read-only columns backed by the file.
+        """
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        if bytes(buffer[:len(_CACHE_MAGIC)]) != _CACHE_MAGIC:
+            raise ValueError(f"{path} is not a GLEAM store file")
+        start = len(_CACHE_MAGIC) + 8
+        size = int.from_bytes(bytes(buffer[len(_CACHE_MAGIC):start]), "little")
+        header = json.loads(bytes(buffer[start:start + size]))
+        offset = _aligned(start + size)
+        columns = []
+        for dtype in header["dtypes"]:
+            column = np.frombuffer(
+                buffer, dtype=dtype, count=header["length"], offset=offset
+            )
+            columns.append(column)
+            offset = _aligned(offset + column.nbytes)
+        return cls(
+            header["years"], header["modes"], header["engines"],
+            header["fuels"], header["units"], *columns,
+            metadata=header["metadata"]
+        )
+
+    def encode(self, name, values):
+        """
+        Encodes a column of keys to category codes.
+        inputs:
+        `name`: str, "year", "mode", "engine" or "fuel".
+        `values`: scalar, sequence, array or categorical of keys.
+        outputs:
+        np.ndarray of int32 codes, -1 where the key is unknown.
+        """
+        index, table, order = self._categories[name]
+        if np.ndim(values) == 0:
+            return np.asarray(index.get(values, -1), dtype=np.int32)
+        # categorical columns (pandas Categorical, or a Series of one):
+        # encode the few categories, then gather by category code
+        categorical = getattr(values, "cat", values)
+        if hasattr(categorical, "categories") and hasattr(
+            categorical, "codes"
+        ):
+            codes = np.append(
+                self.encode(name, np.asarray(categorical.categories)), -1
+            )
+            return codes[np.asarray(categorical.codes)]
+        if (
+            isinstance(values, np.ndarray) and values.dtype.kind in "iu"
+            and name in self._int_codes
+        ):
+            low, codes = self._int_codes[name]
+            offset = values.astype(np.int64, copy=False) - low
+            return np.where(
+                (offset >= 0) & (offset < len(codes)),
+                codes.take(offset, mode="clip"), -1
+            ).astype(np.int32, copy=False)
+        if isinstance(values, np.ndarray) and values.dtype.kind == "S":
+            values = values.astype(str)
+        if isinstance(values, np.ndarray) and (
+            values.dtype.kind == table.dtype.kind == "U"
+            or (values.dtype.kind in "iuf" and table.dtype.kind in "iu")
+        ):
+            # binary search in the (small) sorted category table
+            position = np.searchsorted(table, values)
+            position = np.minimum(position, len(table) - 1)
+            return np.where(
+                table[position] == values, order[position], -1
+            ).astype(np.int32)
+        # generic keys (lists, object arrays): one dict lookup per value
+        if isinstance(values, np.ndarray):
+            values = values.tolist()
+        return np.fromiter(
+            map(index.get, values, repeat(-1)),
+            dtype=np.int32, count=len(values)
+        )
+
+    def locate(self, years, modes, engines, fuels, encode=None):
+        """
+        Resolves parallel key columns to record rows.
+        inputs:
+        `years`, `modes`, `engines`, `fuels`: scalars, sequences or
+            arrays of keys (scalars are broadcast).
+        `encode`: callable(name, values) -> codes, `self.encode` if None
+            (e.g. `KeyResolver.encode` for raw keys).
+        outputs:
+        np.ndarray of int32 rows, -1 where the key is not found.
+        """
+        encode = self.encode if encode is None else encode
+        return _gather(self._dense, self._shape, (
+            encode("year", years), encode("mode", modes),
+            encode("engine", engines), encode("fuel", fuels)
+        ))
+
+    def locate_series(self, modes, engines, fuels, encode=None):
+        """
+        Resolves parallel (mode, engine, fuel) columns to series codes.
+        outputs:
+        np.ndarray of int32 series codes into `series`, -1 if not found.
+        """
+        encode = self.encode if encode is None else encode
+        return _gather(self._series_dense, self._shape[1:], (
+            encode("mode", modes), encode("engine", engines),
+            encode("fuel", fuels)
+        ))
+
+    def resolver(self):
+        """
+        The default KeyResolver of this store, created on first use and
+        shared by the GLEAM instances on this store.
+        """
+        if self._resolver is None:
+            with _LAZY_LOCK:
+                if self._resolver is None:
+                    self._resolver = KeyResolver(self)
+        return self._resolver
+
+    def value_group(self, year, unit, mode=None):
+        """
+        Sorted GHG values of one (year, unit) or (year, unit, mode)
+        group.
+        outputs:
+        (tuple, tuple): ascending GHG values and their rows, empty if
+            the group does not exist.
+        """
+        group = (year, unit) if mode is None else (year, unit, mode)
+        return self.value_groups.get(group, _EMPTY_GROUP)
+
+    def value_range(
+        self, year, unit, low=None, high=None, mode=None,
+        high_inclusive=True
+    ):
+        """
+        Rows of a group whose GHG value lies in [low, high] (or
+        [low, high) without `high_inclusive`), by binary search.
+        inputs:
+        `year`, `unit`, `mode`: the group, see `value_group`.
+        `low`, `high`: float, bounds; None for unbounded.
+        `high_inclusive`: bool, include values equal to `high`.
+        outputs:
+        list of rows, by ascending GHG value.
+        """
+        values, rows = self.value_group(year, unit, mode)
+        start = 0 if low is None else bisect_left(values, low)
+        if high is None:
+            stop = len(values)
+        elif high_inclusive:
+            stop = bisect_right(values, high)
+        else:
+            stop = bisect_left(values, high)
+        return list(rows[start:stop])
+
+    def value_nearest(self, year, unit, target, k=1, mode=None):
+        """
+        Rows of the `k` GHG values of a group closest to `target`,
+        expanding both ways from its binary-search position.
+        outputs:
+        list of rows, nearest first (the lower value first on ties).
+        """
+        values, rows = self.value_group(year, unit, mode)
+        right = bisect_left(values, target)
+        left = right - 1
+        nearest = []
+        while len(nearest) < k and (left >= 0 or right < len(values)):
+            if right == len(values) or (
+                left >= 0 and target - values[left] <= values[right] - target
+            ):
+                nearest.append(rows[left])
+                left -= 1
+            else:
+                nearest.append(rows[right])
+                right += 1
+        return nearest
+
+    def ranked(
+        self, year, mode, k=1, engine=None, exclude_fuels=(),
+        exclude_engines=()
+    ):
+        """
+        Rows of the `k` lowest-GHG options of a (year, mode) or
+        (year, mode, engine) group, skipping excluded fuels and engines.
+        Without exclusions this is a slice of the precomputed ranking;
+        with exclusions, the allowed ranks are a bitmask and each option
+        is its lowest set bit, so the cost is O(k + exclusions).
+        inputs:
+        `year`, `mode`, `engine`: the group.
+        `k`: int, number of options.
+        `exclude_fuels`: iterable of fuel names or `FUEL_GROUPS` names,
+            or a single name.
+        `exclude_engines`: iterable of engine names, or a single name.
+        outputs:
+        list of rows, by ascending GHG value.
+        """
+        if k < 0:
+            raise ValueError(f"k must be non-negative, got {k}")
+        # a single name, not its characters
+        if isinstance(exclude_fuels, str):
+            exclude_fuels = (exclude_fuels,)
+        if isinstance(exclude_engines, str):
+            exclude_engines = (exclude_engines,)
+        group = (year, mode) if engine is None else (year, mode, engine)
+        rows, masks = self.rank_groups.get(group, _EMPTY_RANKS)
+        if not exclude_fuels and not exclude_engines:
+            return list(rows[:k])
+        allowed = masks[None]
+        for fuel in exclude_fuels:
+            allowed &= ~masks.get(("fuel", fuel), 0)
+        for name in exclude_engines:
+            allowed &= ~masks.get(("engine", name), 0)
+        options = []
+        while allowed and len(options) < k:
+            lowest = allowed & -allowed
+            options.append(rows[lowest.bit_length() - 1])
+            allowed ^= lowest
+        return options
+
+    def apply_activity(self, emission, unit, miles, tons=None):
+        """
+        Converts emission rates to total emissions: rates per mile are
+        multiplied by miles, rates per ton-mile by miles times tons.
+        inputs:
+        `emission`: float array, emission rates.
+        `unit`: int array, unit codes of the rates (-1 if not found).
+        `miles`: float array, shipment distances in miles.
+        `tons`: float array, shipment payloads in tons; only used by
+            per-ton-mile rates (NaN results there if None).
+        outputs:
+        np.ndarray, float64 total emissions in grams (NaN if the rate,
+            its unit or a needed payload is missing).
+        """
+        activity = self.unit_activity[unit]
+        payload = np.where(
+            activity == 1, np.nan if tons is None else tons,
+            np.where(activity == 0, 1.0, np.nan)
+        )
+        return emission * np.asarray(miles, dtype=np.float64) * payload
+
+    def interpolate_one(self, series, year, method="linear", bounds="error"):
+        """
+        Scalar `interpolate` for one series code and one year.
+        outputs:
+        float, or None if not found.
+        """
+        if method not in ("linear", "step"):
+            raise ValueError(f"unknown interpolation method {method!r}")
+        grid = self._grid_values
+        if not grid[0] <= year <= grid[-1]:
+            if bounds == "error":
+                raise ValueError(
+                    f"year {year} outside the covered range "
+                    f"{grid[0]:g}-{grid[-1]:g}"
+                )
+            elif bounds == "clamp":
+                year = min(max(year, grid[0]), grid[-1])
+            elif bounds != "extrapolate":
+                raise ValueError(f"unknown bounds behavior {bounds!r}")
+        elif bounds not in ("error", "clamp", "extrapolate"):
+            raise ValueError(f"unknown bounds behavior {bounds!r}")
+        knot = min(max(bisect_right(grid, year) - 1, 0), len(grid) - 1)
+        if method == "linear" and year > grid[-1]:
+            knot = max(len(grid) - 2, 0)
+        emission = self._series_values[series][knot]
+        offset = year - grid[knot]
+        if method == "linear" and offset != 0:
+            emission += self._slope_values[series][knot] * offset
+        if emission != emission:
+            return None
+        return emission
+
+    def interpolate(self, series, years, method="linear", bounds="error"):
+        """
+        Interpolates series values at arbitrary (int or float) years.
+        inputs:
+        `series`: int array, series codes from `locate_series`.
+        `years`: float array, the years (broadcast against `series`).
+        `method`: str, "linear" or "step" (value of the last knot at or
+            before the year).
+        `bounds`: str, years outside the covered range either raise
+            ("error"), are clamped to the range ("clamp"), or are
+            extrapolated from the end segments ("extrapolate"; "step"
+            holds the end values).
+        outputs:
+        (np.ndarray, np.ndarray, np.ndarray): float64 GHGs emissions
+            (NaN if not found), int8 unit codes (-1 if not found) and a
+            boolean found-mask. A value is not found if the series is
+            unknown or lacks a knot it needs.
+        """
+        if method not in ("linear", "step"):
+            raise ValueError(f"unknown interpolation method {method!r}")
+        series, years = np.broadcast_arrays(
+            np.asarray(series), np.asarray(years, dtype=np.float64)
+        )
+        grid = self.year_grid
+        if bounds == "error":
+            outside = (years < grid[0]) | (years > grid[-1])
+            if outside.any():
+                raise ValueError(
+                    f"{int(outside.sum())} year(s) outside the covered "
+                    f"range {grid[0]:g}-{grid[-1]:g}"
+                )
+        elif bounds == "clamp":
+            years = np.clip(years, grid[0], grid[-1])
+        elif bounds != "extrapolate":
+            raise ValueError(f"unknown bounds behavior {bounds!r}")
+        knot = np.clip(
+            np.searchsorted(grid, years, side="right") - 1, 0, len(grid) - 1
+        )
+        known = series >= 0
+        series = np.where(known, series, 0)
+        emission = self.series_ghg[series, knot]
+        if method == "linear":
+            if bounds == "extrapolate":
+                # beyond the end, continue along the last segment
+                knot = np.where(
+                    years > grid[-1], max(len(grid) - 2, 0), knot
+                )
+                emission = self.series_ghg[series, knot]
+            offset = years - grid[knot]
+            # skip the slope on knots, where it may be NaN (missing next
+            # knot) but is not needed
+            emission = emission + np.where(
+                offset != 0, self.series_slope[series, knot] * offset, 0.0
+            )
+        found = known & ~np.isnan(emission)
+        emission = np.where(found, emission, np.nan)
+        unit = np.where(found, self.series_units[series], -1).astype(np.int8)
+        return emission, unit, found
+
+    @property
+    def nbytes(self):
+        """
+        Bytes held by the record columns.
+        """
+        return sum(column.nbytes for column in (
+            self.year_codes, self.mode_codes, self.engine_codes,
+            self.fuel_codes, self.unit_codes, self.ghg
+        ))
+
+
+def _unit_activity(unit):
+    """
+    Activity an emission unit is per: 0 for distance ("g/mile"), 1 for
+    ton-distance ("g/ton.mile"), -1 otherwise.
+    """
+    return {"mile": 0, "ton.mile": 1}.get(unit.split("/", 1)[-1], -1)
+
+
+def _gather(table, shape, codes):
+    """
+    Looks up a dense table indexed by several code columns.
+    inputs:
+    `table`: np.ndarray, the flattened dense table.
+    `shape`: tuple, the table shape.
+    `codes`: list of int arrays, one code column per dimension.
+    outputs:
+    np.ndarray, the table entries, -1 where any code is -1.
+    """
+    codes = np.broadcast_arrays(*codes)
+    valid = np.logical_and.reduce([code >= 0 for code in codes])
+    flat = np.zeros(valid.shape, dtype=np.int64)
+    for code, size in zip(codes, shape):
+        flat *= size
+        flat += code
+    return np.where(valid, table[np.where(valid, flat, 0)], -1)
+
+
+def _segment_sum(values, offsets):
+    """
+    Sums of consecutive segments of an array, one `np.add.reduceat`
+    over the non-empty segments.
+    inputs:
+    `values`: np.ndarray, the flat values.
+    `offsets`: int array, segment i is values[offsets[i]:offsets[i + 1]];
+        the last offset must be len(values).
+    outputs:
+    np.ndarray, float64 segment sums (0 for empty segments).
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    lengths = np.diff(offsets)
+    if len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != len(values) \
+            or (lengths < 0).any():
+        raise ValueError(
+            "offsets must rise from 0 to the number of legs"
+        )
+    sums = np.zeros(len(lengths))
+    nonempty = lengths > 0
+    if nonempty.any():
+        # empty segments start where the next one does, so dropping them
+        # leaves every reduceat segment ending at the next start
+        sums[nonempty] = np.add.reduceat(values, offsets[:-1][nonempty])
+    return sums
+
+
+def _aligned(offset):
+    """
+    Rounds `offset` up to the binary store column alignment.
+    """
+    return -(-offset // _CACHE_ALIGN) * _CACHE_ALIGN
+
+
+def load_json(path=DATA_FILE):
+    """
+    Reads a GREET extract in the GLEAM JSON layout.
+    inputs:
+    `path`: str, the JSON file, `GLEAM_data.json` by default.
+    outputs:
+    dict, year -> mode -> engine -> fuel -> {"GHG", "Unit"}, with int
+        years as in `GLEAM.data`.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        return _int_years(json.load(file))
+
+
+def _int_years(raw):
+    """
+    Converts the string year keys of the JSON layout to int.
+    """
+    return {
+        key if key == "metadata" else int(key): value
+        for key, value in raw.items()
+    }
+
+
+def default_cache_dir():
+    """
+    Directory of the binary store cache: `$GLEAM_CACHE_DIR`, or
+    `gleam` under `$XDG_CACHE_HOME` (`~/.cache` by default).
+    """
+    if os.environ.get("GLEAM_CACHE_DIR"):
+        return os.environ["GLEAM_CACHE_DIR"]
+    return os.path.join(
+        os.environ.get("XDG_CACHE_HOME")
+        or os.path.join(os.path.expanduser("~"), ".cache"),
+        "gleam"
+    )
+
+
+def load_store(path=DATA_FILE, cache_dir=None, use_cache=False):
+    """
+    Loads a GREET extract in the GLEAM JSON layout as an EmissionStore.
+    With `use_cache`, the JSON is compiled once into a binary store
+    cached under the SHA-256 of the source file, and later loads
+    memory-map the cache instead of parsing the JSON. The derived
+    tables are rebuilt on every load either way, so the cache only pays
+    off for extracts much larger than `GLEAM_data.json`.
+    inputs:
+    `path`: str, the JSON file, `GLEAM_data.json` by default.
+    `cache_dir`: str, the cache directory, `default_cache_dir()` if None.
+    `use_cache`: bool, if True, go through the binary store cache.
+    outputs:
+    EmissionStore.
+    """
+    with open(path, "rb") as file:
+        source = file.read()
+    if use_cache:
+        cache_dir = default_cache_dir() if cache_dir is None else cache_dir
+        digest = hashlib.sha256(source).hexdigest()
+        cache = os.path.join(cache_dir, f"GLEAM-{digest}.store")
+        if os.path.exists(cache):
+            try:
+                return EmissionStore.load(cache)
+            except (OSError, ValueError, KeyError, TypeError):
+                # damaged (e.g. truncated) cache file: rebuild and
+                # rewrite it below
+                pass
+    store = EmissionStore.from_nested(_int_years(json.loads(source)))
+    if use_cache:
+        # the cache is an optimization only; skip it if unwritable
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            store.save(cache)
+        except OSError:
+            pass
+    return store
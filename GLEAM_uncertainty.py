@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+-------------------
+MIT License
+
+Copyright (c) 2024  Zeyu Liu
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+-------------------
+Description:
+    Monte Carlo uncertainty propagation for GLEAM emission factors.
+    Each record gets a relative distribution around its point value
+    (triangular, lognormal or normal), per record or per fuel pathway.
+    N samples of all factors are drawn as one (N x records) matrix,
+    in blocks with independent, reproducible random streams, and pushed
+    through shipment and route totals to percentile summaries.
+-------------------
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from GLEAM import GLEAM
+
+DISTRIBUTIONS = ("fixed", "triangular", "lognormal", "normal")
+
+
+class Uncertainty():
+    """
+    Relative uncertainty of every record of an EmissionStore: a
+    distribution of multipliers around 1, with a relative spread
+    (half-width of the triangular, sigma of the normal, and
+    log(1 + spread) as log-sigma of the lognormal, whose median is 1).
+    Records of a shared pathway take the same draw in every sample.
+    """
+    def __init__(self, store, kind="lognormal", spread=0.1):
+        """
+        init
+        inputs:
+        `store`: EmissionStore, the records.
+        `kind`: str, default distribution, one of `DISTRIBUTIONS`.
+        `spread`: float, default relative spread.
+        """
+        self.store = store
+        self.kinds = np.full(len(store), _kind(kind), dtype=np.int8)
+        self.spreads = np.full(len(store), float(spread))
+        # draw group of every record; records of a group share draws
+        self.groups = np.arange(len(store))
+
+    def __getstate__(self):
+        # drawing needs the distributions only, not the store
+        state = dict(self.__dict__)
+        state["store"] = None
+        return state
+
+    def set(
+        self, kind, spread, year=None, mode=None, engine=None, fuel=None,
+        shared=False
+    ):
+        """
+        Sets the distribution of the matching records.
+        inputs:
+        `kind`: str, one of `DISTRIBUTIONS`.
+        `spread`: float, relative spread.
+        `year`, `mode`, `engine`, `fuel`: key filter; None matches any.
+        `shared`: bool, the matching records share one draw per sample
+            (a fully correlated pathway), instead of independent draws.
+        outputs:
+        Uncertainty, this object (for chaining).
+        """
+        rows = np.array([
+            row for row, key in enumerate(self.store.keys)
+            if (year is None or key[0] == year)
+            and (mode is None or key[1] == mode)
+            and (engine is None or key[2] == engine)
+            and (fuel is None or key[3] == fuel)
+        ], dtype=np.int64)
+        self.kinds[rows] = _kind(kind)
+        self.spreads[rows] = float(spread)
+        group = self.groups.max() + 1
+        self.groups[rows] = group if shared else group + np.arange(len(rows))
+        return self
+
+    def pathway(self, fuel, kind, spread, shared=True):
+        """
+        Sets the distribution of a fuel pathway across years and modes,
+        e.g. `pathway("Electricity", "lognormal", 0.3)`.
+        """
+        return self.set(kind, spread, fuel=fuel, shared=shared)
+
+    def draw(self, samples, seed=0, block_size=1024):
+        """
+        Draws multiplier samples of all records.
+        Sample blocks use independent streams spawned from `seed`, so
+        the matrix is reproducible and can be drawn block by block.
+        inputs:
+        `samples`: int, number of samples N.
+        `seed`: int, the root seed.
+        `block_size`: int, samples per random stream.
+        outputs:
+        np.ndarray, float64 (N x records) multipliers.
+        """
+        groups, first, inverse = np.unique(
+            self.groups, return_index=True, return_inverse=True
+        )
+        kinds, spreads = self.kinds[first], self.spreads[first]
+        streams = np.random.SeedSequence(seed).spawn(
+            -(-samples // block_size)
+        )
+        draws = np.ones((samples, len(groups)))
+        for block, stream in enumerate(streams):
+            rng = np.random.default_rng(stream)
+            start = block * block_size
+            size = min(block_size, samples - start)
+            for code, kind in enumerate(DISTRIBUTIONS):
+                columns = np.flatnonzero((kinds == code) & (spreads > 0))
+                if kind == "fixed" or not len(columns):
+                    continue
+                spread = spreads[columns]
+                shape = (size, len(columns))
+                if kind == "triangular":
+                    values = rng.triangular(
+                        1 - spread, 1.0, 1 + spread, shape
+                    )
+                elif kind == "lognormal":
+                    values = rng.lognormal(0.0, np.log1p(spread), shape)
+                else:
+                    values = rng.normal(1.0, spread, shape)
+                draws[start:start + size, columns] = values
+        return draws[:, inverse]
+
+
+def _kind(kind):
+    """
+    Code of a distribution name.
+    """
+    if kind not in DISTRIBUTIONS:
+        raise ValueError(
+            f"unknown distribution {kind!r}, expected one of {DISTRIBUTIONS}"
+        )
+    return DISTRIBUTIONS.index(kind)
+
+
+class MonteCarlo():
+    """
+    Propagates sampled emission factors through shipment and route
+    totals. Shipments are linear in the factors, so
+    - the portfolio total of sample s is factors[s] @ activity per record
+      (one matrix-vector product);
+    - the percentiles of a single-leg shipment are its activity times the
+      per-record percentiles of the factors;
+    - multi-leg routes are summed per sample over chunks of legs, in
+      bounded memory, optionally in a process pool.
+    """
+    def __init__(
+        self, gleam=None, uncertainty=None, samples=10000, seed=0,
+        block_size=1024
+    ):
+        """
+        init
+        inputs:
+        `gleam`: GLEAM, the point values (e.g. a Scenario), `GLEAM()`
+            if None.
+        `uncertainty`: Uncertainty, lognormal with 10% spread if None.
+        `samples`: int, number of samples N.
+        `seed`: int, the root seed; see `Uncertainty.draw`.
+        `block_size`: int, samples per random stream.
+        """
+        self.gleam = GLEAM() if gleam is None else gleam
+        store = self.gleam.store
+        self.uncertainty = Uncertainty(store) if uncertainty is None \
+            else uncertainty
+        self.samples = samples
+        self.seed = seed
+        self.block_size = block_size
+        # point values of all records, through the lookup (scenarios)
+        self.values = self.gleam.query_handles(np.arange(len(store)))[0]
+        self._factors = None
+        self._by_record = None
+        # percentile list -> per-record percentile tables
+        self._tables = {}
+
+    def __getstate__(self):
+        # workers redraw the (reproducible) factor matrix and only need
+        # the point values, not the lookup
+        state = dict(self.__dict__)
+        state.update(_factors=None, _by_record=None, _tables={}, gleam=None)
+        return state
+
+    def factors(self):
+        """
+        The sampled emission factors, drawn on first use.
+        outputs:
+        np.ndarray, float64 (N x records).
+        """
+        if self._factors is None:
+            self._factors = self.values * self.uncertainty.draw(
+                self.samples, self.seed, self.block_size
+            )
+        return self._factors
+
+    def legs(self, years, modes, engines, fuels, miles, tons=None):
+        """
+        Record rows and activities (miles, or ton-miles for per-ton-mile
+        rates) of shipment legs; arguments as in `GLEAM.emissions`.
+        outputs:
+        (np.ndarray, np.ndarray): int64 rows (-1 if not found) and
+            float64 activities (NaN if not found or lacking a payload).
+        """
+        store = self.gleam.store
+        rows = store.locate(years, modes, engines, fuels).astype(np.int64)
+        unit = np.where(rows >= 0, store.unit_codes[rows], -1)
+        activity = store.apply_activity(1.0, unit, miles, tons)
+        return rows, np.broadcast_to(activity, rows.shape)
+
+    def total(
+        self, years, modes, engines, fuels, miles, tons=None,
+        percentiles=(5, 50, 95)
+    ):
+        """
+        Percentiles of the total emissions of many shipments (or route
+        legs). Legs that are not found are left out.
+        inputs:
+        `years`, `modes`, `engines`, `fuels`, `miles`, `tons`: as in
+            `GLEAM.emissions`.
+        `percentiles`: sequence of float, in [0, 100].
+        outputs:
+        np.ndarray, float64 total grams at each percentile.
+        """
+        rows, activity = self.legs(years, modes, engines, fuels, miles, tons)
+        valid = (rows >= 0) & ~np.isnan(activity)
+        weights = np.bincount(
+            rows[valid], activity[valid], minlength=len(self.values)
+        )
+        return np.percentile(self.factors() @ weights, percentiles)
+
+    def summaries(
+        self, years, modes, engines, fuels, miles, tons=None, offsets=None,
+        percentiles=(5, 50, 95), memory=64 * 2 ** 20, workers=1
+    ):
+        """
+        Streams per-shipment (or, with `offsets`, per-route) percentile
+        summaries, chunk by chunk in input order.
+        inputs:
+        `years`, `modes`, `engines`, `fuels`, `miles`, `tons`: leg
+            arrays, as in `GLEAM.emissions`.
+        `offsets`: int array, routes in CSR form (see
+            `GLEAM.route_emissions`); every leg is a shipment if None.
+        `percentiles`: sequence of float, in [0, 100].
+        `memory`: int, bytes of samples per chunk of route legs.
+        `workers`: int, worker processes for the multi-leg routes.
+        outputs:
+        generator of (int, np.ndarray): the first shipment or route of a
+            chunk and its float64 (count x percentiles) summaries (NaN if
+            a leg is not found).
+        """
+        rows, activity = self.legs(years, modes, engines, fuels, miles, tons)
+        if offsets is None:
+            offsets = np.arange(len(rows) + 1)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        percentiles = np.asarray(percentiles, dtype=np.float64)
+        chunks = _chunks(offsets, max(memory // (8 * self.samples), 1))
+        tasks = (
+            (
+                rows[offsets[start]:offsets[stop]],
+                activity[offsets[start]:offsets[stop]],
+                offsets[start:stop + 1] - offsets[start], percentiles
+            )
+            for start, stop in chunks
+        )
+        if workers > 1 and (np.diff(offsets) > 1).any():
+            with ProcessPoolExecutor(
+                workers, initializer=_init_worker, initargs=(self,)
+            ) as pool:
+                for (start, _), summary in zip(
+                    chunks, pool.map(_summarize_task, tasks)
+                ):
+                    yield start, summary
+        else:
+            for (start, _), task in zip(chunks, tasks):
+                yield start, self.summarize(*task)
+
+    def summarize(self, rows, activity, offsets, percentiles):
+        """
+        Percentile summaries of one chunk of shipments or routes.
+        inputs:
+        `rows`, `activity`: leg arrays, from `legs`.
+        `offsets`: int array, routes of the chunk in CSR form.
+        `percentiles`: np.ndarray, in [0, 100].
+        outputs:
+        np.ndarray, float64 (routes x percentiles).
+        """
+        table, flipped = self._percentile_tables(percentiles)
+        lengths = np.diff(offsets)
+        summary = np.full((len(lengths), len(percentiles)), np.nan)
+        summary[lengths == 0] = 0.0
+        # single legs: scaled per-record percentiles (reversed order of
+        # percentiles for negative activities)
+        single = np.flatnonzero(lengths == 1)
+        leg = offsets[single]
+        found = rows[leg] >= 0
+        scale = activity[leg][found, None]
+        summary[single[found]] = np.where(
+            scale >= 0, table[rows[leg][found]], flipped[rows[leg][found]]
+        ) * scale
+        # multi-leg routes: per-sample sums over their legs
+        multi = np.flatnonzero(lengths > 1)
+        if len(multi):
+            counts = lengths[multi]
+            first = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            legs = np.arange(counts.sum()) + np.repeat(
+                offsets[multi] - first, counts
+            )
+            leg_rows = rows[legs]
+            # (legs x N) samples, gathered from the record-major factors
+            values = self._record_factors()[np.maximum(leg_rows, 0)]
+            values *= np.where(leg_rows >= 0, activity[legs], np.nan)[:, None]
+            totals = np.add.reduceat(values, first, axis=0)
+            summary[multi] = np.percentile(totals, percentiles, axis=1).T
+        return summary
+
+    def _record_factors(self):
+        """
+        The factor samples in record-major (records x N) layout, so that
+        the samples of a leg are contiguous.
+        """
+        if self._by_record is None:
+            self._by_record = np.ascontiguousarray(self.factors().T)
+        return self._by_record
+
+    def _percentile_tables(self, percentiles):
+        """
+        Per-record factor percentiles at `percentiles` and at
+        100 - `percentiles`, memoized per percentile list.
+        """
+        key = tuple(percentiles.tolist())
+        if key not in self._tables:
+            factors = self._record_factors()
+            self._tables[key] = (
+                np.percentile(factors, percentiles, axis=1).T,
+                np.percentile(factors, 100 - percentiles, axis=1).T,
+            )
+        return self._tables[key]
+
+
+def _chunks(offsets, legs):
+    """
+    Splits routes in CSR form into consecutive chunks of about `legs`
+    legs (at least one route each).
+    outputs:
+    list of (start, stop) route ranges.
+    """
+    routes = len(offsets) - 1
+    bounds = np.searchsorted(
+        offsets, np.arange(legs, offsets[-1], legs), side="right"
+    ) - 1
+    bounds = np.unique(np.concatenate([[0], bounds.clip(1, routes), [routes]]))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+# Monte Carlo propagation of a worker process, set by `_init_worker`
+_worker_monte_carlo = None
+
+
+def _init_worker(monte_carlo):
+    """
+    Redraws the factor samples once per worker process.
+    """
+    global _worker_monte_carlo
+    _worker_monte_carlo = monte_carlo
+    monte_carlo._record_factors()
+
+
+def _summarize_task(task):
+    """
+    Summarizes one chunk in a worker process.
+    """
+    return _worker_monte_carlo.summarize(*task)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+-------------------
+MIT License
+
+Copyright (c) 2024  Zeyu Liu
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+-------------------
+Description:
+    Unit system for GLEAM outputs: small integer unit codes and a
+    precomputed conversion-factor matrix, e.g. g/mile -> g/km,
+    g/ton.mile -> g/tonne.km, or g -> t. "ton" is the US short ton of
+    GREET and "tonne" the metric ton. Conversions between per-distance
+    and per-ton-distance rates need a payload; without one they are
+    masked (NaN), never raised per row.
+-------------------
+"""
+
+import numpy as np
+
+MILE_KM = 1.609344
+SHORT_TON_TONNE = 0.90718474
+
+# what a unit is per
+MASS, DISTANCE, TON_DISTANCE = 0, 1, 2
+
+# name: (grams, dimension, activity in km or tonne.km)
+_DEFINITIONS = {
+    "g/mile": (1.0, DISTANCE, MILE_KM),
+    "g/ton.mile": (1.0, TON_DISTANCE, SHORT_TON_TONNE * MILE_KM),
+    "g/km": (1.0, DISTANCE, 1.0),
+    "kg/km": (1e3, DISTANCE, 1.0),
+    "kg/mile": (1e3, DISTANCE, MILE_KM),
+    "g/tonne.km": (1.0, TON_DISTANCE, 1.0),
+    "kg/tonne.km": (1e3, TON_DISTANCE, 1.0),
+    "kg/ton.mile": (1e3, TON_DISTANCE, SHORT_TON_TONNE * MILE_KM),
+    "g": (1.0, MASS, 1.0),
+    "kg": (1e3, MASS, 1.0),
+    "t": (1e6, MASS, 1.0),
+    "lb": (453.59237, MASS, 1.0),
+}
+# unit names, in code order; the GLEAM data units come first
+UNITS = tuple(_DEFINITIONS)
+ALIASES = {
+    "g/ton-mile": "g/ton.mile", "g/tonne-km": "g/tonne.km",
+    "g/tkm": "g/tonne.km", "g/t.km": "g/tonne.km",
+    "kg/tonne-km": "kg/tonne.km", "kg/tkm": "kg/tonne.km",
+    "kg/t.km": "kg/tonne.km", "tonne": "t", "tonnes": "t",
+}
+CODES = {name: code for code, name in enumerate(UNITS)}
+CODES.update({alias: CODES[name] for alias, name in ALIASES.items()})
+
+_GRAMS = np.array([_DEFINITIONS[name][0] for name in UNITS])
+DIMENSIONS = np.array(
+    [_DEFINITIONS[name][1] for name in UNITS], dtype=np.int8
+)
+_ACTIVITY = np.array([_DEFINITIONS[name][2] for name in UNITS])
+# FACTORS[i, j]: multiplier from unit i to unit j (before any payload
+# adjustment); NaN between mass and rate units
+_BASE = _GRAMS / _ACTIVITY
+_RATES = DIMENSIONS != MASS
+FACTORS = np.where(
+    (DIMENSIONS[:, None] == DIMENSIONS[None, :])
+    | (_RATES[:, None] & _RATES[None, :]),
+    _BASE[:, None] / _BASE[None, :], np.nan
+)
+# PAYLOAD[i, j]: power of the payload (in tonnes) applied from unit i to
+# unit j: +1 per-ton-distance -> per-distance, -1 the other way
+PAYLOAD = np.where(
+    DIMENSIONS[:, None] == DIMENSIONS[None, :], 0,
+    np.where(
+        _RATES[:, None] & _RATES[None, :],
+        np.where(DIMENSIONS[:, None] == TON_DISTANCE, 1, -1), 0
+    )
+).astype(np.int8)
+
+
+def code(unit):
+    """
+    Code of a unit name (or alias).
+    inputs:
+    `unit`: str or int, a unit name, alias or code.
+    outputs:
+    int, the unit code.
+    """
+    if isinstance(unit, (int, np.integer)):
+        if not 0 <= unit < len(UNITS):
+            raise ValueError(f"unknown unit code {unit}")
+        return int(unit)
+    try:
+        return CODES[unit]
+    except KeyError:
+        raise ValueError(
+            f"unknown unit {unit!r}, expected one of {UNITS}"
+        ) from None
+
+
+def codes(units, default=-1):
+    """
+    Codes of unit names, `default` for unknown names.
+    outputs:
+    np.ndarray of int8 codes.
+    """
+    return np.array(
+        [CODES.get(unit, default) for unit in units], dtype=np.int8
+    )
+
+
+def convert(values, from_codes, to_unit, tons=None):
+    """
+    Converts values between units, vectorized.
+    inputs:
+    `values`: float array, the values.
+    `from_codes`: int array, their unit codes (-1 for unknown),
+        broadcast against `values`.
+    `to_unit`: str or int, the target unit.
+    `tons`: float array, payloads in (short) tons, needed to convert
+        between per-distance and per-ton-distance rates.
+    outputs:
+    (np.ndarray, np.ndarray): float64 converted values (NaN where the
+        conversion is not possible) and a boolean valid-mask.
+    """
+    target = code(to_unit)
+    from_codes = np.asarray(from_codes)
+    known = from_codes >= 0
+    index = np.where(known, from_codes, 0)
+    factor = np.where(known, FACTORS[index, target], np.nan)
+    power = PAYLOAD[index, target]
+    if (power != 0).any():
+        payload = np.nan if tons is None else (
+            np.asarray(tons, dtype=np.float64) * SHORT_TON_TONNE
+        )
+        # no payload, no per-ton rate
+        payload = np.where(payload > 0, payload, np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            factor = factor * np.where(
+                power == 0, 1.0, np.where(power > 0, payload, 1 / payload)
+            )
+    converted = np.asarray(values, dtype=np.float64) * factor
+    return converted, ~np.isnan(converted)
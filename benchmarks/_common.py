@@ -0,0 +1,36 @@
+"""
+Shared helpers for the GLEAM benchmark scripts.
+Importing this module puts the repository root on `sys.path`, so the
+scripts can be run directly, e.g. `python benchmarks/bench_construction.py`.
+"""
+import os
+import sys
+import timeit
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+def best_of(func, number=1, repeat=5):
+    """
+    Times `func` and returns the best time per call.
+    inputs:
+    `func`: callable, the function to time (no arguments).
+    `number`: int, calls per timing run.
+    `repeat`: int, number of timing runs.
+    outputs:
+    float, best seconds per call.
+    """
+    times = timeit.repeat(func, number=number, repeat=repeat)
+    return min(times) / number
+
+
+def report(label, seconds, rows=None):
+    """
+    Prints one benchmark line, with throughput if `rows` is given.
+    """
+    line = f"{label:<40s} {seconds * 1e6:14.3f} us"
+    if rows:
+        line += f" {rows / seconds:16,.0f} rows/s"
+    print(line)
@@ -0,0 +1,62 @@
+"""
+Synthetic shipment ledgers for the GLEAM benchmarks.
+"""
+import numpy as np
+
+import _common  # noqa: F401
+
+from GLEAM import GLEAM
+
+
+def synthetic_keys(rows, miss_rate=0.05, seed=0):
+    """
+    Draws random (year, mode, engine, fuel) columns from the GLEAM keys,
+    with a share of rows replaced by an unknown fuel.
+    inputs:
+    `rows`: int, number of rows.
+    `miss_rate`: float, share of rows that do not match any record.
+    `seed`: int, random seed.
+    outputs:
+    (np.ndarray, np.ndarray, np.ndarray, np.ndarray): int64 years and
+        object arrays of modes, engines and fuels.
+    """
+    rng = np.random.default_rng(seed)
+    keys = list(GLEAM().store.index)
+    pick = rng.integers(0, len(keys), rows)
+    years = np.array([key[0] for key in keys], dtype=np.int64)[pick]
+    columns = [
+        np.array([key[level] for key in keys], dtype=object)[pick]
+        for level in (1, 2, 3)
+    ]
+    miss = rng.random(rows) < miss_rate
+    columns[2][miss] = "Unknown-Fuel"
+    return (years, *columns)
+
+
+def write_csv_ledger(path, rows, chunk_size=1000000, seed=0):
+    """
+    Writes a synthetic shipment ledger CSV with id, year, mode, engine,
+    fuel, miles and tons columns, chunk by chunk.
+    inputs:
+    `path`: str, the output file.
+    `rows`: int, number of rows.
+    `chunk_size`: int, rows generated at a time.
+    `seed`: int, random seed.
+    """
+    rng = np.random.default_rng(seed)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("id,year,mode,engine,fuel,miles,tons\n")
+        for start in range(0, rows, chunk_size):
+            size = min(chunk_size, rows - start)
+            years, modes, engines, fuels = synthetic_keys(
+                size, seed=int(rng.integers(2 ** 31))
+            )
+            miles = rng.uniform(10, 3000, size).round(1)
+            tons = rng.uniform(1, 40, size).round(2)
+            file.writelines(
+                f"{start + i},{year},{mode},{engine},{fuel},{mile},{ton}\n"
+                for i, (year, mode, engine, fuel, mile, ton) in enumerate(zip(
+                    years.tolist(), modes.tolist(), engines.tolist(),
+                    fuels.tolist(), miles.tolist(), tons.tolist()
+                ))
+            )
@@ -0,0 +1,132 @@
+"""
+Benchmark: Arrow/Parquet export and round trips (requires pyarrow).
+- export: `GLEAM_arrow.to_table` vs. walking the nested `GLEAM.data`
+  into rows and building an Arrow table from them;
+- round trip: Parquet file -> GLEAM (`write_parquet`/`read_parquet`)
+  vs. JSON file -> GLEAM (`json.dump` of the nested data, `from_file`
+  without the cache);
+- batch results: `query_table` (Arrow arrays over the result buffers)
+  vs. `query_many` results converted element by element.
+Usage: python benchmarks/bench_arrow.py [rows ...]
+"""
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pyarrow
+
+import _common  # noqa: F401
+from _common import best_of, report
+from _ledger import synthetic_keys
+
+import GLEAM_arrow
+from GLEAM import GLEAM
+
+
+def nested_rows(data):
+    """
+    The emission table as an Arrow table, built row by row from the
+    nested data.
+    """
+    rows = []
+    for year, modes in data.items():
+        if year == "metadata":
+            continue
+        for mode, engines in modes.items():
+            for engine, fuels in engines.items():
+                for fuel, record in fuels.items():
+                    rows.append({
+                        "year": year, "mode": mode, "engine": engine,
+                        "fuel": fuel, "GHG": record["GHG"],
+                        "Unit": record["Unit"],
+                    })
+    return pyarrow.Table.from_pylist(rows)
+
+
+def json_round_trip(gleam, path):
+    """
+    Writes the nested data as JSON and loads it back.
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(gleam.store.to_nested(), file)
+    return GLEAM.from_file(path, use_cache=False)
+
+
+def parquet_round_trip(gleam, path):
+    """
+    Writes the table as Parquet and loads it back.
+    """
+    GLEAM_arrow.write_parquet(path, gleam=gleam)
+    return GLEAM_arrow.read_parquet(path)
+
+
+def per_element(gleam, keys):
+    """
+    `query_many` results converted to Arrow through Python objects.
+    """
+    emission, unit, found = gleam.query_many(*keys)
+    units = gleam.store.units
+    return pyarrow.table({
+        "GHG": pyarrow.array(
+            [value if hit else None
+             for value, hit in zip(emission.tolist(), found.tolist())]
+        ),
+        "Unit": pyarrow.array(
+            [units[code] if code >= 0 else None for code in unit.tolist()]
+        ),
+    })
+
+
+def main(sizes):
+    gleam = GLEAM()
+    report("export: nested walk + from_pylist", best_of(
+        lambda: nested_rows(gleam.data), 100
+    ), len(gleam.store))
+    report("export: to_table", best_of(
+        lambda: GLEAM_arrow.to_table(gleam), 100
+    ), len(gleam.store))
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "table.json")
+        parquet_path = os.path.join(directory, "table.parquet")
+        report("round trip: JSON", best_of(
+            lambda: json_round_trip(gleam, json_path), 20
+        ), len(gleam.store))
+        report("round trip: Parquet", best_of(
+            lambda: parquet_round_trip(gleam, parquet_path), 20
+        ), len(gleam.store))
+        assert parquet_round_trip(gleam, parquet_path).store.lookup == (
+            json_round_trip(gleam, json_path).store.lookup
+        )
+        print(f"file size: JSON {os.path.getsize(json_path):,d} B, "
+              f"Parquet {os.path.getsize(parquet_path):,d} B")
+    for rows in sizes:
+        keys = synthetic_keys(rows)
+        print(f"{rows:,d} rows")
+        report("query_many + per-element conversion", best_of(
+            lambda: per_element(gleam, keys), 1, 3
+        ), rows)
+        report("query_table", best_of(
+            lambda: GLEAM_arrow.query_table(gleam, *keys), 1, 3
+        ), rows)
+        categorical = [
+            pyarrow.array(column).dictionary_encode() for column in keys[1:]
+        ]
+        report("query_table (dictionary key columns)", best_of(
+            lambda: GLEAM_arrow.query_table(gleam, keys[0], *categorical),
+            1, 3
+        ), rows)
+        reference = per_element(gleam, keys)
+        result = GLEAM_arrow.query_table(gleam, keys[0], *categorical)
+        assert result.column("GHG").equals(reference.column("GHG"))
+        assert result.column("Unit").cast(pyarrow.string()).equals(
+            reference.column("Unit")
+        )
+    np.testing.assert_equal(
+        GLEAM_arrow.to_table(gleam).column("GHG").to_numpy(), gleam.store.ghg
+    )
+
+
+if __name__ == "__main__":
+    main([int(float(arg)) for arg in sys.argv[1:]] or [1000000])
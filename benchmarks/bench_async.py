@@ -0,0 +1,110 @@
+"""
+Benchmark: asyncio lookups under a burst of concurrent requests.
+N coroutines (100k by default) each await one lookup, all started at
+once with `asyncio.gather`:
+- sync: `GLEAM.query` called directly inside each coroutine;
+- executor: each query sent to the default thread pool with
+  `run_in_executor`, the usual way to call blocking code from asyncio;
+- AsyncGLEAM: `await aquery(...)`, micro-batched with several windows
+  and batch caps.
+The report lists throughput, p50/p99 latency from request to result and
+the mean batch size. Every result is checked against `GLEAM.query`.
+Usage: python benchmarks/bench_async.py [--requests N]
+    [--windows 0 0.001 ...] [--batches 256 4096 ...]
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+import _common  # noqa: F401
+from _ledger import synthetic_keys
+
+from GLEAM import GLEAM
+from GLEAM_async import AsyncGLEAM
+
+
+async def drive(keys, lookup):
+    """
+    Runs one coroutine per key, all at once.
+    inputs:
+    `keys`: list of (year, mode, engine, fuel).
+    `lookup`: async callable(key) -> result.
+    outputs:
+    (float, np.ndarray, list): wall-clock seconds, per-request
+        latencies in seconds and the results.
+    """
+    latencies = np.empty(len(keys))
+
+    async def request(number, key):
+        start = time.perf_counter()
+        result = await lookup(key)
+        latencies[number] = time.perf_counter() - start
+        return result
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        request(number, key) for number, key in enumerate(keys)
+    ))
+    return time.perf_counter() - start, latencies, results
+
+
+def run(label, keys, expected, lookup, agleam=None):
+    """
+    Drives one lookup flavour and prints its line.
+    """
+    seconds, latencies, results = asyncio.run(drive(keys, lookup))
+    wrong = sum(result != reference
+                for result, reference in zip(results, expected))
+    batch = f"{agleam.stats()['mean_batch']:10,.0f}" if agleam else (
+        f"{'-':>10s}"
+    )
+    print(f"{label:<32s} {len(keys) / seconds:14,.0f} "
+          f"{np.percentile(latencies, 50) * 1e3:9.2f} "
+          f"{np.percentile(latencies, 99) * 1e3:9.2f} {batch} {wrong:6d}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=100000)
+    parser.add_argument(
+        "--windows", type=float, nargs="+", default=[0, 0.001, 0.005]
+    )
+    parser.add_argument(
+        "--batches", type=int, nargs="+", default=[256, 4096, 65536]
+    )
+    args = parser.parse_args(argv)
+    gleam = GLEAM()
+    keys = list(zip(*(
+        column.tolist() for column in synthetic_keys(args.requests)
+    )))
+    expected = [gleam.query(*key) for key in keys]
+    print(f"{args.requests:,d} concurrent requests")
+    print(f"{'':<32s} {'[requests/s]':>14s} {'p50 [ms]':>9s} "
+          f"{'p99 [ms]':>9s} {'batch':>10s} {'wrong':>6s}")
+
+    async def sync(key):
+        return gleam.query(*key)
+
+    async def executor(key):
+        return await asyncio.get_running_loop().run_in_executor(
+            None, gleam.query, *key
+        )
+
+    run("sync query", keys, expected, sync)
+    run("run_in_executor", keys, expected, executor)
+    for window in args.windows:
+        for max_batch in args.batches:
+            # one AsyncGLEAM per event loop
+            agleam = AsyncGLEAM(gleam, window=window, max_batch=max_batch)
+
+            async def batched(key, agleam=agleam):
+                return await agleam.aquery(*key)
+
+            run(f"aquery window={window * 1e3:g}ms cap={max_batch}",
+                keys, expected, batched, agleam)
+
+
+if __name__ == "__main__":
+    main()
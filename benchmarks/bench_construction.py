@@ -0,0 +1,23 @@
+"""
+Benchmark: cost of creating a `GLEAM()` instance.
+Compares the shared read-only table (default) with the opt-out private
+mutable copy, which rebuilds the full nested dict on every call.
+"""
+import _common  # noqa: F401
+from _common import best_of, report
+
+from GLEAM import GLEAM
+
+
+def main():
+    # make sure the shared table is already built
+    GLEAM()
+    private = best_of(lambda: GLEAM(mutable=True), number=200)
+    shared = best_of(lambda: GLEAM(), number=200000)
+    report("GLEAM(mutable=True)  [build dict]", private)
+    report("GLEAM()              [shared table]", shared)
+    print(f"speed-up: {private / shared:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
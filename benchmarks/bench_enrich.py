@@ -0,0 +1,40 @@
+"""
+Benchmark: streaming enrichment of synthetic CSV ledgers of several
+sizes with `python -m GLEAM enrich`. Each size runs in a fresh process,
+so the reported peak RSS shows that memory stays bounded as the input
+grows.
+Usage: python benchmarks/bench_enrich.py [rows ...]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+import _common  # noqa: F401
+from _common import REPO_ROOT
+from _ledger import write_csv_ledger
+
+
+def main(sizes):
+    with tempfile.TemporaryDirectory(prefix="gleam-bench-") as directory:
+        for rows in sizes:
+            source = os.path.join(directory, f"ledger-{rows}.csv")
+            output = os.path.join(directory, f"enriched-{rows}.csv")
+            write_csv_ledger(source, rows)
+            result = subprocess.run(
+                [
+                    sys.executable, "-m", "GLEAM", "enrich", source, output,
+                    "--miles-col", "miles", "--tons-col", "tons"
+                ],
+                cwd=REPO_ROOT, check=True, capture_output=True, text=True
+            )
+            size = os.path.getsize(source) / 2 ** 20
+            print(f"rows={rows:,d} ({size:,.0f} MB): "
+                  f"{result.stderr.strip()}")
+
+
+if __name__ == "__main__":
+    main(
+        [int(float(arg)) for arg in sys.argv[1:]]
+        or [10 ** 5, 10 ** 6, 5 * 10 ** 6]
+    )
@@ -0,0 +1,53 @@
+"""
+Micro-benchmark: `query` hit and miss latency.
+Compares the original nested-dict implementation (two five-level
+traversals, KeyError on misses), a key -> row index, the flat key ->
+result map behind `query` (with interned and with freshly built key
+strings), and reusing a precompiled handle.
+"""
+import _common  # noqa: F401
+from _common import best_of, report
+from bench_store import nested_query
+
+from GLEAM import GLEAM
+
+
+def row_query(store, year, mode, engine, fuel):
+    """
+    Key -> row index lookup followed by two column reads.
+    """
+    row = store.index.get((year, mode, engine, fuel))
+    if row is None:
+        return None, None
+    return store._ghg_values[row], store._unit_values[row]
+
+
+def main():
+    gleam = GLEAM()
+    data, store = GLEAM(mutable=True).data, gleam.store
+    hit = (2040, "Marine", "MeOH", "Biomass")
+    # equal strings that are not the interned objects, as when keys are
+    # parsed from a file
+    fresh = tuple("".join(list(part)) if isinstance(part, str) else part
+                  for part in hit)
+    miss = (2040, "Marine", "MeOH", "Coal")
+    handle = gleam.handle(*hit)
+    number = 500000
+    for label, key in (("hit", hit), ("miss", miss)):
+        report(f"nested dict + KeyError ({label})",
+               best_of(lambda: nested_query(data, *key), number))
+        report(f"key -> row index ({label})",
+               best_of(lambda: row_query(store, *key), number))
+        report(f"GLEAM.query ({label})",
+               best_of(lambda: gleam.query(*key), number))
+    report("GLEAM.query (hit, non-interned strings)",
+           best_of(lambda: gleam.query(*fresh), number))
+    report("GLEAM.query_handle (hit)",
+           best_of(lambda: gleam.query_handle(handle), number))
+    records = store.records
+    report("store.records[handle] (hit)",
+           best_of(lambda: records[handle], number))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark: year interpolation over millions of (key, year) pairs.
+Times the full `interpolate_many` call (key encoding included) and the
+interpolation step alone on pre-resolved series codes (one searchsorted
+plus one multiply-add), against a loop over scalar `interpolate`.
+Usage: python benchmarks/bench_interpolate.py [rows ...]
+"""
+import sys
+import time
+
+import numpy as np
+
+import _common  # noqa: F401
+from _ledger import synthetic_keys
+
+from GLEAM import GLEAM
+
+
+def main(sizes):
+    gleam = GLEAM()
+    store = gleam.store
+    for rows in sizes:
+        _, modes, engines, fuels = synthetic_keys(rows)
+        # monthly years over the covered range
+        years = 2025 + np.random.default_rng(1).integers(0, 301, rows) / 12
+        sample = min(rows, 100000)
+        start = time.perf_counter()
+        for year, mode, engine, fuel in zip(
+            years[:sample].tolist(), modes[:sample].tolist(),
+            engines[:sample].tolist(), fuels[:sample].tolist()
+        ):
+            gleam.interpolate(year, mode, engine, fuel)
+        loop = (time.perf_counter() - start) * rows / sample
+        start = time.perf_counter()
+        gleam.interpolate_many(years, modes, engines, fuels)
+        full = time.perf_counter() - start
+        series = store.locate_series(modes, engines, fuels)
+        timings = {}
+        for method in ("linear", "step"):
+            start = time.perf_counter()
+            store.interpolate(series, years, method)
+            timings[method] = time.perf_counter() - start
+        print(f"rows={rows:,d}")
+        print(f"  loop over interpolate (est. from {sample:,d} rows): "
+              f"{loop:8.3f} s")
+        print(f"  interpolate_many:                  {full:8.3f} s "
+              f"{rows / full:14,.0f} rows/s")
+        for method, seconds in timings.items():
+            print(f"  store.interpolate ({method:<6s}):        "
+                  f"{seconds:8.3f} s {rows / seconds:14,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main([int(float(arg)) for arg in sys.argv[1:]] or [10 ** 6, 10 ** 7])
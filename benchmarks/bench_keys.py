@@ -0,0 +1,75 @@
+"""
+Benchmark: raw key normalization (`normalize=True`).
+Builds ledgers whose mode, engine and fuel columns are drawn from a few
+hundred raw spellings of the GLEAM keys (case, separators, aliases),
+and compares `query_many` on canonical keys, `query_many` with a warm
+resolver memo, and an unmemoized resolve per row. Prints the resolver
+statistics at the end.
+Usage: python benchmarks/bench_keys.py [rows ...]
+"""
+import sys
+
+import numpy as np
+
+import _common  # noqa: F401
+from _common import best_of, report
+from _ledger import synthetic_keys
+
+from GLEAM import GLEAM
+from GLEAM_keys import KeyResolver
+
+
+def spellings(value, rng):
+    """
+    A few raw spellings of one canonical key string.
+    """
+    words = value.replace("_", " ").replace("-", " ")
+    return [
+        value, value.lower(), value.upper(), words, words.lower(),
+        words.title().replace(" ", ""), rng.choice(["", " "]) + value,
+    ]
+
+
+def messy(column, rng):
+    """
+    Replaces each value of an object column with a random spelling.
+    """
+    variants = {value: spellings(value, rng) for value in set(column)}
+    choice = rng.integers(0, 7, len(column))
+    return np.array(
+        [variants[value][i] for value, i in zip(column.tolist(), choice)],
+        dtype=object
+    )
+
+
+def main(sizes):
+    gleam = GLEAM()
+    rng = np.random.default_rng(0)
+    for rows in sizes:
+        years, modes, engines, fuels = synthetic_keys(rows)
+        raw = (
+            years, messy(modes, rng), messy(engines, rng), messy(fuels, rng)
+        )
+        print(f"{rows:,d} rows")
+        report("query_many (canonical keys)", best_of(
+            lambda: gleam.query_many(years, modes, engines, fuels), 1, 3
+        ), rows)
+        gleam.resolver = KeyResolver(gleam.store)
+        report("query_many(normalize=True), cold memo", best_of(
+            lambda: gleam.query_many(*raw, normalize=True), 1, 1
+        ), rows)
+        report("query_many(normalize=True), warm memo", best_of(
+            lambda: gleam.query_many(*raw, normalize=True), 1, 3
+        ), rows)
+        gleam.resolver = KeyResolver(gleam.store, cache_size=0)
+        report("query_many(normalize=True), no memo", best_of(
+            lambda: gleam.query_many(*raw, normalize=True), 1, 1
+        ), rows)
+        gleam.resolver = KeyResolver(gleam.store)
+        gleam.query_many(*raw, normalize=True)
+        for column, stats in gleam.resolver.stats().items():
+            print(f"  {column:<8s} {stats}")
+
+
+if __name__ == "__main__":
+    main([int(float(arg)) for arg in sys.argv[1:]] or [100000, 1000000])
@@ -0,0 +1,50 @@
+"""
+Benchmark: overhead of the lookup metrics layer.
+Times `query` (hit and miss) and `query_many` on a plain instance, with
+metrics enabled, and again after `disable_metrics()`; the disabled
+timings should match the plain ones, since the instrumented methods
+only shadow the class methods while enabled.
+Usage: python benchmarks/bench_metrics.py [rows ...]
+"""
+import sys
+
+import _common  # noqa: F401
+from _common import best_of, report
+from _ledger import synthetic_keys
+
+from GLEAM import GLEAM
+
+HIT = (2040, "Marine", "MeOH", "Biomass")
+MISS = (2040, "Marine", "MeOH", "Coal")
+
+
+def timings(gleam, keys, label):
+    """
+    Reports scalar and batch lookup times of `gleam`.
+    """
+    report(f"{label}: query hit", best_of(
+        lambda: gleam.query(*HIT), 100000
+    ))
+    report(f"{label}: query miss", best_of(
+        lambda: gleam.query(*MISS), 100000
+    ))
+    for columns in keys:
+        report(f"{label}: query_many", best_of(
+            lambda: gleam.query_many(*columns), 1, 3
+        ), len(columns[0]))
+
+
+def main(sizes):
+    keys = [synthetic_keys(rows) for rows in sizes]
+    gleam = GLEAM()
+    timings(gleam, keys, "plain")
+    metrics = gleam.enable_metrics()
+    timings(gleam, keys, "enabled")
+    gleam.disable_metrics()
+    timings(gleam, keys, "disabled")
+    print(f"recorded {sum(metrics.hit_counts().values()):,d} hits, "
+          f"{sum(metrics.misses.values()):,d} misses")
+
+
+if __name__ == "__main__":
+    main([int(float(arg)) for arg in sys.argv[1:]] or [10000, 1000000])
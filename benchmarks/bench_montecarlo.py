@@ -0,0 +1,75 @@
+"""
+Benchmark: Monte Carlo uncertainty propagation.
+Draws 10k samples of all emission factors (lognormal 10%, electricity
+as a shared 30% pathway) and times, over 1M synthetic shipments, the
+portfolio total percentiles and the streamed per-shipment percentile
+summaries; then per-route summaries of multi-leg routes (the chunked,
+sampled path) with 1 and several worker processes.
+Usage: python benchmarks/bench_montecarlo.py [--samples 10000]
+    [--shipments 1000000] [--routes 20000] [--workers 1 4]
+"""
+import argparse
+import time
+
+import numpy as np
+
+import _common  # noqa: F401
+from _common import report
+from _ledger import synthetic_keys
+from bench_routes import synthetic_routes
+
+from GLEAM import GLEAM
+from GLEAM_uncertainty import MonteCarlo, Uncertainty
+from GLEAM_enrich import peak_rss_mb
+
+
+def timed(func):
+    """
+    Runs `func` once and returns (seconds, result).
+    """
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def drain(summaries):
+    """
+    Consumes streamed summaries, keeping only a count.
+    """
+    return sum(len(summary) for _, summary in summaries)
+
+
+def main(args):
+    gleam = GLEAM()
+    uncertainty = Uncertainty(gleam.store).pathway(
+        "Electricity", "lognormal", 0.3
+    )
+    monte_carlo = MonteCarlo(gleam, uncertainty, samples=args.samples)
+    seconds, _ = timed(monte_carlo.factors)
+    report(f"draw {args.samples:,d} x {len(gleam.store)} factors", seconds)
+    rows = args.shipments
+    years, modes, engines, fuels = synthetic_keys(rows)
+    rng = np.random.default_rng(1)
+    miles, tons = rng.uniform(10, 3000, rows), rng.uniform(1, 40, rows)
+    keys = (years, modes, engines, fuels, miles, tons)
+    seconds, total = timed(lambda: monte_carlo.total(*keys))
+    report(f"portfolio total, {rows:,d} shipments", seconds, rows)
+    print(f"  P5/P50/P95 total: {total / 1e12} Mt")
+    seconds, count = timed(lambda: drain(monte_carlo.summaries(*keys)))
+    report("per-shipment percentile summaries", seconds, count)
+    offsets, columns = synthetic_routes(args.routes)
+    for workers in args.workers:
+        seconds, count = timed(lambda: drain(monte_carlo.summaries(
+            **columns, offsets=offsets, workers=workers
+        )))
+        report(f"per-route summaries, {workers} worker(s)", seconds, count)
+    print(f"peak RSS {peak_rss_mb():.0f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--samples", type=int, default=10000)
+    parser.add_argument("--shipments", type=int, default=1000000)
+    parser.add_argument("--routes", type=int, default=20000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    main(parser.parse_args())
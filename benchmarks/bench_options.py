@@ -0,0 +1,60 @@
+"""
+Micro-benchmark: lowest-GHG option and top-k lookups.
+Compares the precomputed rankings behind `lowest_option` and
+`top_options` (with and without exclusion sets) with scanning the
+nested `GLEAM.data` tree on every call, as an optimization loop would.
+"""
+import heapq
+
+import _common  # noqa: F401
+from _common import best_of, report
+
+from GLEAM import FUEL_GROUPS, GLEAM
+
+
+def scan(data, year, mode, k, exclude_fuels=()):
+    """
+    The `k` lowest-GHG options of a mode, by scanning the tree.
+    """
+    excluded = set(exclude_fuels)
+    for name in exclude_fuels:
+        excluded.update(FUEL_GROUPS.get(name, ()))
+    return heapq.nsmallest(k, (
+        ((year, mode, engine, fuel), record["GHG"])
+        for engine, fuels in data[year][mode].items()
+        for fuel, record in fuels.items() if fuel not in excluded
+    ), key=lambda option: option[1])
+
+
+def main():
+    gleam = GLEAM()
+    data = gleam.data
+    number = 100000
+    args = (2040, "Marine")
+    exclude = ("hydrogen", "RNG", "Biomass")
+    report("scan, argmin", best_of(
+        lambda: scan(data, *args, 1), number
+    ))
+    report("lowest_option", best_of(
+        lambda: gleam.lowest_option(*args), number
+    ))
+    report("scan, argmin with exclusions", best_of(
+        lambda: scan(data, *args, 1, exclude), number
+    ))
+    report("lowest_option with exclusions", best_of(
+        lambda: gleam.lowest_option(*args, exclude_fuels=exclude), number
+    ))
+    report("scan, top 3 with exclusions", best_of(
+        lambda: scan(data, *args, 3, exclude), number
+    ))
+    report("top_options(k=3) with exclusions", best_of(
+        lambda: gleam.top_options(*args, 3, exclude_fuels=exclude), number
+    ))
+    store = gleam.store
+    report("store.ranked (rows only, exclusions)", best_of(
+        lambda: store.ranked(*args, 3, None, exclude), number
+    ))
+
+
+if __name__ == "__main__":
+    main()
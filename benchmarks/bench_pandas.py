@@ -0,0 +1,86 @@
+"""
+Benchmark: DataFrame enrichment through the `df.gleam` accessor
+(requires pandas).
+Compares `df.gleam.enrich(...)` with the common
+`df.apply(lambda row: gleam.query(...), axis=1)` on a synthetic ledger
+(5M rows by default), with object and categorical key columns. `apply`
+is timed on a sample of `--apply-rows` rows; its throughput does not
+depend on the frame size.
+Usage: python benchmarks/bench_pandas.py [--rows N] [--apply-rows N]
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+import _common  # noqa: F401
+from _common import best_of, report
+from _ledger import synthetic_keys
+
+import GLEAM_pandas  # noqa: F401
+from GLEAM import GLEAM
+
+
+def ledger(rows):
+    """
+    A synthetic ledger frame with year, mode, engine, fuel, miles and
+    tons columns.
+    """
+    years, modes, engines, fuels = synthetic_keys(rows)
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "year": years, "mode": modes, "engine": engines, "fuel": fuels,
+        "miles": rng.uniform(10, 3000, rows), "tons": rng.uniform(1, 40, rows),
+    })
+
+
+def apply(gleam, frame):
+    """
+    GHG and unit columns through one `query` per row.
+    """
+    results = frame.apply(
+        lambda row: gleam.query(
+            row["year"], row["mode"], row["engine"], row["fuel"]
+        ), axis=1
+    )
+    return frame.assign(
+        GHG=results.map(lambda result: result[0]),
+        Unit=results.map(lambda result: result[1]),
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5000000)
+    parser.add_argument("--apply-rows", type=int, default=100000)
+    args = parser.parse_args(argv)
+    gleam = GLEAM()
+    frame = ledger(args.rows)
+    sample = frame.iloc[:args.apply_rows]
+    seconds = best_of(lambda: apply(gleam, sample), 1, 1)
+    report(f"df.apply + query ({len(sample):,d} rows)", seconds, len(sample))
+    apply_rate = len(sample) / seconds
+    categorical = frame.astype(
+        {"mode": "category", "engine": "category", "fuel": "category"}
+    )
+    for label, data in (("object", frame), ("categorical", categorical)):
+        seconds = best_of(lambda: data.gleam.enrich(gleam=gleam), 1, 3)
+        report(f"df.gleam.enrich ({label} keys)", seconds, len(data))
+        print(f"  {len(data) / seconds / apply_rate:,.0f}x apply")
+    seconds = best_of(lambda: frame.gleam.enrich(
+        miles="miles", tons="tons", unit="kg", gleam=gleam
+    ), 1, 3)
+    report("df.gleam.enrich (+ totals in kg)", seconds, len(frame))
+    expected = apply(gleam, sample)
+    enriched = sample.gleam.enrich(gleam=gleam)
+    assert np.allclose(
+        enriched["GHG"], expected["GHG"].astype(float), equal_nan=True
+    )
+    assert (
+        enriched["Unit"].astype(object).fillna("").tolist()
+        == expected["Unit"].fillna("").tolist()
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: scaling of `python -m GLEAM enrich --workers N` on a
+synthetic CSV ledger (50M rows by default, about 2.4 GB).
+Reports wall-clock time, throughput, speed-up and parallel efficiency
+per worker count, to show where scaling stops.
+Usage: python benchmarks/bench_parallel.py [--rows N] [--workers 1 2 ...]
+    [--ledger PATH]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import _common  # noqa: F401
+from _common import REPO_ROOT
+from _ledger import write_csv_ledger
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=float, default=50e6)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16]
+    )
+    parser.add_argument(
+        "--ledger", help="reuse (or create) this ledger file"
+    )
+    args = parser.parse_args()
+    rows = int(args.rows)
+    with tempfile.TemporaryDirectory(prefix="gleam-bench-") as directory:
+        source = args.ledger or os.path.join(directory, "ledger.csv")
+        if not os.path.exists(source):
+            start = time.perf_counter()
+            write_csv_ledger(source, rows)
+            print(f"generated {rows:,d} rows in "
+                  f"{time.perf_counter() - start:.1f} s")
+        output = os.path.join(directory, "enriched.csv")
+        print(f"ledger: {os.path.getsize(source) / 2 ** 30:.2f} GB, "
+              f"{os.cpu_count()} CPUs")
+        print(f"{'workers':>7s} {'seconds':>9s} {'rows/s':>14s} "
+              f"{'speed-up':>9s} {'efficiency':>10s}")
+        baseline = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            subprocess.run(
+                [
+                    sys.executable, "-m", "GLEAM", "enrich", source, output,
+                    "--miles-col", "miles", "--tons-col", "tons",
+                    "--workers", str(workers)
+                ],
+                cwd=REPO_ROOT, check=True, capture_output=True
+            )
+            seconds = time.perf_counter() - start
+            # relative to the first (smallest) worker count
+            baseline = baseline or seconds
+            speedup = baseline / seconds
+            efficiency = speedup * args.workers[0] / workers
+            print(f"{workers:7d} {seconds:9.2f} {rows / seconds:14,.0f} "
+                  f"{speedup:9.2f} {efficiency:10.0%}")
+
+
+if __name__ == "__main__":
+    main()
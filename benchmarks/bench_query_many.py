@@ -0,0 +1,56 @@
+"""
+Benchmark: vectorized `GLEAM.query_many` vs. a Python loop over
+`GLEAM.query`, at 1e6 and 1e7 rows.
+Usage: python benchmarks/bench_query_many.py [rows ...]
+"""
+import sys
+import time
+
+import numpy as np
+
+import _common  # noqa: F401
+from _ledger import synthetic_keys
+
+from GLEAM import GLEAM
+
+
+def loop_query(gleam, years, modes, engines, fuels):
+    """
+    The per-row baseline: one `query` call per shipment.
+    """
+    query = gleam.query
+    return [
+        query(year, mode, engine, fuel)
+        for year, mode, engine, fuel in zip(
+            years.tolist(), modes.tolist(), engines.tolist(), fuels.tolist()
+        )
+    ]
+
+
+def main(sizes):
+    gleam = GLEAM()
+    for rows in sizes:
+        years, modes, engines, fuels = synthetic_keys(rows)
+        start = time.perf_counter()
+        loop_query(gleam, years, modes, engines, fuels)
+        loop = time.perf_counter() - start
+        start = time.perf_counter()
+        emission, unit, found = gleam.query_many(years, modes, engines, fuels)
+        batch = time.perf_counter() - start
+        # fixed-width string columns take the binary-search encoding path
+        columns = [column.astype(str) for column in (modes, engines, fuels)]
+        start = time.perf_counter()
+        gleam.query_many(years, *columns)
+        batch_str = time.perf_counter() - start
+        print(f"rows={rows:,d} found={int(found.sum()):,d} "
+              f"nan={int(np.isnan(emission).sum()):,d}")
+        print(f"  loop over query:          {loop:8.3f} s "
+              f"{rows / loop:14,.0f} rows/s")
+        print(f"  query_many (object cols): {batch:8.3f} s "
+              f"{rows / batch:14,.0f} rows/s  ({loop / batch:.1f}x)")
+        print(f"  query_many (str cols):    {batch_str:8.3f} s "
+              f"{rows / batch_str:14,.0f} rows/s  ({loop / batch_str:.1f}x)")
+
+
+if __name__ == "__main__":
+    main([int(float(arg)) for arg in sys.argv[1:]] or [10 ** 6, 10 ** 7])
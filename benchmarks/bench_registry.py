@@ -0,0 +1,165 @@
+"""
+Benchmark: several GREET releases side by side in a `GLEAM_registry`.
+Synthetic releases (copies of GLEAM_data.json with scaled GHG values)
+are written to a temporary directory, then:
+- first load of each release, parsing the JSON and from a warm cache;
+- `query` through the registry vs. `GLEAM.query` on a loaded release;
+- shared strings: distinct mode/engine/fuel string objects across all
+  loaded releases vs. the number of category entries;
+- stalls: a reader thread queries a loaded release while the main
+  thread loads the others (without the cache); its latency percentiles
+  during the loads are compared with an idle run.
+Usage: python benchmarks/bench_registry.py [--releases N] [--seconds S]
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+import _common  # noqa: F401
+from _common import best_of, report
+
+from GLEAM import DATA_FILE, load_json
+from GLEAM_registry import DEFAULT_VERSION, Registry
+
+KEY = (2030, "Long_Haul", "CIDI", "Diesel")
+
+
+def write_releases(directory, count):
+    """
+    Writes `count` releases with GHG values scaled by 1%, 2%, ...
+    outputs:
+    dict, version -> path.
+    """
+    data = load_json()
+    releases = {}
+    for number in range(1, count + 1):
+        scaled = {"metadata": f"synthetic release {number}"}
+        for year, modes in data.items():
+            if year == "metadata":
+                continue
+            scaled[str(year)] = {
+                mode: {
+                    engine: {
+                        fuel: {
+                            "GHG": record["GHG"] * (1 + number / 100),
+                            "Unit": record["Unit"],
+                        } for fuel, record in fuels.items()
+                    } for engine, fuels in engines.items()
+                } for mode, engines in modes.items()
+            }
+        path = os.path.join(directory, f"release-{number}.json")
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(scaled, file)
+        releases[f"r{number}"] = path
+    return releases
+
+
+def first_loads(releases, cache_dir, use_cache):
+    """
+    Seconds to load every release once, in a fresh registry.
+    """
+    registry = Registry(releases, cache_dir=cache_dir, use_cache=use_cache)
+    start = time.perf_counter()
+    for version in registry.versions():
+        registry.get(version)
+    return (time.perf_counter() - start) / len(releases)
+
+
+def reader(registry, version, stop, latencies):
+    """
+    Queries `version` until `stop` is set, recording each latency.
+    """
+    query = registry.query
+    clock = time.perf_counter
+    while not stop.is_set():
+        start = clock()
+        query(*KEY, version=version)
+        latencies.append(clock() - start)
+
+
+def stall_run(registry, loads, seconds):
+    """
+    Runs the reader against the default release while `loads` (version
+    list) are loaded, or for `seconds` if there is nothing to load.
+    outputs:
+    (float, np.ndarray): wall-clock seconds and reader latencies.
+    """
+    stop = threading.Event()
+    latencies = []
+    thread = threading.Thread(
+        target=reader, args=(registry, registry.default, stop, latencies)
+    )
+    thread.start()
+    start = time.perf_counter()
+    for version in loads:
+        registry.get(version)
+    if not loads:
+        time.sleep(seconds)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    thread.join()
+    return elapsed, np.array(latencies)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--releases", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as directory:
+        releases = write_releases(directory, args.releases)
+        cache_dir = os.path.join(directory, "cache")
+        report("first load: JSON", first_loads(releases, cache_dir, False))
+        first_loads(releases, cache_dir, True)
+        report("first load: warm cache", first_loads(
+            releases, cache_dir, True
+        ))
+        registry = Registry(
+            {DEFAULT_VERSION: DATA_FILE, **releases}, cache_dir=cache_dir,
+            use_cache=True
+        )
+        gleam = registry.get()
+        report("GLEAM.query", best_of(lambda: gleam.query(*KEY), 100000))
+        report("registry.query (default)", best_of(
+            lambda: registry.query(*KEY), 100000
+        ))
+        report("registry.query (version=)", best_of(
+            lambda: registry.query(*KEY, version="r1"), 100000
+        ))
+        loaded = [registry.get(version) for version in registry.versions()]
+        strings = [
+            value for gleam in loaded
+            for table in (gleam.store.modes, gleam.store.engines,
+                          gleam.store.fuels)
+            for value in table
+        ]
+        print(f"{len(loaded)} releases: {len(strings):,d} mode/engine/fuel "
+              f"entries, {len({id(value) for value in strings}):,d} "
+              f"distinct string objects")
+        assert np.isclose(
+            registry.query(*KEY, version="r1")[0], gleam.query(*KEY)[0] * 1.01
+        )
+        # loads without the cache, so they take long enough to overlap
+        registry = Registry({DEFAULT_VERSION: DATA_FILE, **releases})
+        registry.get()
+        idle = stall_run(registry, [], args.seconds)
+        print(f"{'reader':<28s} {'[queries/s]':>12s} {'p50 [us]':>9s} "
+              f"{'p99 [us]':>9s} {'max [ms]':>9s}")
+        for label, (elapsed, latencies) in (
+            ("idle", idle),
+            (f"while loading {len(releases)} releases",
+             stall_run(registry, list(releases), args.seconds)),
+        ):
+            print(f"{label:<28s} {len(latencies) / elapsed:12,.0f} "
+                  f"{np.percentile(latencies, 50) * 1e6:9.2f} "
+                  f"{np.percentile(latencies, 99) * 1e6:9.2f} "
+                  f"{latencies.max() * 1e3:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
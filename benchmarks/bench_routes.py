@@ -0,0 +1,139 @@
+"""
+Benchmark: multimodal route emissions in CSR form.
+Generates routes of 2-6 legs (drayage -> rail/long haul -> marine ->
+drayage patterns, about 4 legs on average) and times `route_emissions`
+on string (numpy unicode), object and (with pandas) categorical leg
+columns, against a Python loop calling `query` per leg on a sample of
+the routes.
+Usage: python benchmarks/bench_routes.py [routes ...]
+"""
+import sys
+import time
+
+import numpy as np
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+import _common  # noqa: F401
+from _common import best_of, report
+
+from GLEAM import GLEAM
+
+# (mode, engine, fuel) leg choices per position of a route
+LEGS = {
+    "drayage": [
+        ("Short_Haul", "CIDI", "Diesel"),
+        ("Short_Haul", "Electric", "Electricity"),
+        ("Short_Haul", "CIDI", "Renewable-Diesel"),
+    ],
+    "line_haul": [
+        ("Rail", "Diesel-Electric", "Diesel"),
+        ("Rail", "Diesel-Electric", "Biodiesel-20"),
+        ("Long_Haul", "CIDI", "Diesel"),
+        ("Long_Haul", "Electric", "Electricity"),
+    ],
+    "marine": [
+        ("Marine", "LNG", "LNG"),
+        ("Marine", "MeOH", "Biomass"),
+        ("Marine", "HFO", "HFO-0.5"),
+    ],
+}
+
+
+def synthetic_routes(routes, seed=0):
+    """
+    Random routes as CSR leg arrays.
+    outputs:
+    (np.ndarray, dict): offsets and leg columns (year, mode, engine,
+        fuel as numpy unicode arrays; miles, tons as float64).
+    """
+    rng = np.random.default_rng(seed)
+    lengths = rng.choice([2, 3, 4, 5, 6], routes, p=[.1, .2, .4, .2, .1])
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    legs = int(offsets[-1])
+    # leg position: first and last legs are drayage, the middle ones
+    # alternate between line haul and marine
+    position = np.arange(legs) - np.repeat(offsets[:-1], lengths)
+    last = position == np.repeat(lengths, lengths) - 1
+    kind = np.where(
+        (position == 0) | last, 0, np.where(position % 2 == 1, 1, 2)
+    )
+    choices = [LEGS["drayage"], LEGS["line_haul"], LEGS["marine"]]
+    table = np.array(
+        [leg for legs_ in choices for leg in legs_], dtype=str
+    )
+    start = np.cumsum([0] + [len(legs_) for legs_ in choices])[:-1]
+    size = np.array([len(legs_) for legs_ in choices])
+    pick = start[kind] + rng.integers(0, 1 << 30, legs) % size[kind]
+    year = np.repeat(rng.choice([2025, 2030, 2035, 2040], routes), lengths)
+    columns = {
+        "years": year,
+        "modes": table[pick, 0], "engines": table[pick, 1],
+        "fuels": table[pick, 2],
+        "miles": np.where(kind == 0, 30.0, rng.uniform(200, 3000, legs)),
+        "tons": np.repeat(rng.uniform(5, 40, routes), lengths),
+    }
+    return offsets, columns
+
+
+def loop(gleam, offsets, columns, routes):
+    """
+    Route totals of the first `routes` routes, one `query` per leg.
+    """
+    totals = []
+    for route in range(routes):
+        total = 0.0
+        for leg in range(offsets[route], offsets[route + 1]):
+            emission, unit = gleam.query(
+                int(columns["years"][leg]), str(columns["modes"][leg]),
+                str(columns["engines"][leg]), str(columns["fuels"][leg])
+            )
+            total += emission * columns["miles"][leg] * (
+                columns["tons"][leg] if unit == "g/ton.mile" else 1.0
+            )
+        totals.append(total)
+    return totals
+
+
+def main(sizes):
+    gleam = GLEAM()
+    for routes in sizes:
+        offsets, columns = synthetic_routes(routes)
+        legs = int(offsets[-1])
+        print(f"{routes:,d} routes, {legs:,d} legs")
+        seconds = best_of(
+            lambda: gleam.route_emissions(offsets, **columns), 1, 3
+        )
+        report("route_emissions (str columns)", seconds, routes)
+        objects = dict(columns)
+        for name in ("modes", "engines", "fuels"):
+            objects[name] = columns[name].astype(object)
+        report("route_emissions (object columns)", best_of(
+            lambda: gleam.route_emissions(offsets, **objects), 1, 3
+        ), routes)
+        if pd is not None:
+            categories = dict(columns)
+            for name in ("modes", "engines", "fuels"):
+                categories[name] = pd.Categorical(columns[name])
+            report("route_emissions (categorical columns)", best_of(
+                lambda: gleam.route_emissions(offsets, **categories), 1, 3
+            ), routes)
+        leg, route = gleam.route_emissions(offsets, **columns)
+        start = time.perf_counter()
+        sums = np.add.reduceat(leg, offsets[:-1])
+        report("  of which segmented sum", time.perf_counter() - start,
+               routes)
+        sample = min(routes, 20000)
+        seconds = best_of(
+            lambda: loop(gleam, offsets, columns, sample), 1, 1
+        )
+        report(f"query per leg (first {sample:,d} routes)", seconds, sample)
+        assert np.allclose(loop(gleam, offsets, columns, 100), route[:100])
+        assert np.allclose(sums, route)
+
+
+if __name__ == "__main__":
+    main([int(float(arg)) for arg in sys.argv[1:]] or [1000000])
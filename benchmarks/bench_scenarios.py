@@ -0,0 +1,85 @@
+"""
+Benchmark: copy-on-write scenario overlays.
+Builds hundreds of scenarios (each scaling one fuel from a random year
+and overriding a few records) and compares their memory with one deep
+copy of `GLEAM.data` per scenario, then times point and batch queries
+through a scenario against the base table.
+Usage: python benchmarks/bench_scenarios.py [scenarios]
+"""
+import copy
+import sys
+import tracemalloc
+
+import numpy as np
+
+import _common  # noqa: F401
+from _common import best_of, report
+from _ledger import synthetic_keys
+
+from GLEAM import GLEAM
+from GLEAM_scenario import Scenario
+
+
+def build_scenarios(base, count, seed=0):
+    """
+    `count` random scenarios over `base`.
+    """
+    rng = np.random.default_rng(seed)
+    keys = base.store.keys
+    fuels = base.store.fuels
+    scenarios = []
+    for i in range(count):
+        scenario = Scenario(base, name=f"scenario-{i}").scale(
+            float(rng.uniform(0.5, 1.0)),
+            fuel=fuels[rng.integers(len(fuels))],
+            since=int(rng.choice(base.store.years))
+        )
+        for row in rng.integers(0, len(keys), 3).tolist():
+            scenario.override(*keys[row], float(rng.uniform(0, 100)))
+        scenarios.append(scenario)
+    return scenarios
+
+
+def main(count):
+    base = GLEAM()
+    tracemalloc.start()
+    scenarios = build_scenarios(base, count)
+    overlay = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    tracemalloc.start()
+    copies = [copy.deepcopy(GLEAM(mutable=True).data) for _ in range(count)]
+    deep = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del copies
+    records = sum(len(scenario) for scenario in scenarios)
+    print(f"{count:,d} scenarios, {records:,d} overridden records")
+    print(f"{'overlays (traced)':<40s} {overlay / 2 ** 20:14.3f} MB")
+    print(f"{'deep copies of GLEAM.data (traced)':<40s} "
+          f"{deep / 2 ** 20:14.3f} MB")
+    scenario = scenarios[0]
+    hit = scenario.select()[0]
+    override = next(iter(scenario.overrides))
+    number = 200000
+    report("base query", best_of(lambda: base.query(*hit), number))
+    report("scenario query (not overridden)", best_of(
+        lambda: scenario.query(*hit), number
+    ))
+    report("scenario query (overridden)", best_of(
+        lambda: scenario.query(*override), number
+    ))
+    rows = 1000000
+    keys = synthetic_keys(rows)
+    handles = base.store.locate(*keys)
+    report("base query_handles", best_of(
+        lambda: base.query_handles(handles), 1, 3
+    ), rows)
+    report("scenario query_handles", best_of(
+        lambda: scenario.query_handles(handles), 1, 3
+    ), rows)
+    report("scenario query_many", best_of(
+        lambda: scenario.query_many(*keys), 1, 3
+    ), rows)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
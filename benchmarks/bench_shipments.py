@@ -0,0 +1,44 @@
+"""
+Benchmark: bulk shipment emissions over batches mixing g/mile (truck)
+and g/ton.mile (rail/marine) records.
+Times the full `emissions` call and the unit-applying arithmetic step
+(`EmissionStore.apply_activity`) alone; the target for the latter is
+at least 10M shipments/s on one thread.
+Usage: python benchmarks/bench_shipments.py [rows ...]
+"""
+import sys
+import time
+
+import numpy as np
+
+import _common  # noqa: F401
+from _ledger import synthetic_keys
+
+from GLEAM import GLEAM
+
+
+def main(sizes):
+    gleam = GLEAM()
+    for rows in sizes:
+        years, modes, engines, fuels = synthetic_keys(rows)
+        rng = np.random.default_rng(2)
+        miles = rng.uniform(10, 3000, rows)
+        tons = rng.uniform(1, 40, rows)
+        start = time.perf_counter()
+        grams = gleam.emissions(years, modes, engines, fuels, miles, tons)
+        full = time.perf_counter() - start
+        emission, unit, _ = gleam.query_many(years, modes, engines, fuels)
+        start = time.perf_counter()
+        gleam.store.apply_activity(emission, unit, miles, tons)
+        arithmetic = time.perf_counter() - start
+        per_ton = gleam.store.unit_activity[unit] == 1
+        print(f"rows={rows:,d} per-ton rows={int(per_ton.sum()):,d} "
+              f"total={np.nansum(grams) / 1e6:,.0f} t")
+        print(f"  emissions (lookup + arithmetic): {full:8.3f} s "
+              f"{rows / full:14,.0f} rows/s")
+        print(f"  apply_activity (arithmetic):     {arithmetic:8.3f} s "
+              f"{rows / arithmetic:14,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main([int(float(arg)) for arg in sys.argv[1:]] or [10 ** 6, 10 ** 7])
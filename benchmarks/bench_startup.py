@@ -0,0 +1,97 @@
+"""
+Benchmark: process start-up cost of the GLEAM data sources.
+Each case runs in a fresh interpreter and ends with one `query`:
+- `default`: `GLEAM()`, the packaged GLEAM_data.json (no cache);
+- `json`: `GLEAM.from_file(use_cache=False)`, parsing GLEAM_data.json;
+- `cache cold`: `GLEAM.from_file(use_cache=True)` with an empty cache
+  directory;
+- `cache warm`: `GLEAM.from_file(use_cache=True)` memory-mapping the
+  cached store.
+Wall-clock times (whole process, and data load + first query measured
+inside the process) are the best of several runs; import times of the
+GLEAM module (self and including numpy) come from `python -X importtime`.
+Usage: python benchmarks/bench_startup.py [runs]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import _common  # noqa: F401
+from _common import REPO_ROOT
+
+QUERY = "g.query(2025, 'Long_Haul', 'CIDI', 'Diesel')"
+CASES = {
+    "default": "g = GLEAM()",
+    "json": "g = GLEAM.from_file(use_cache=False)",
+    "cache cold": "g = GLEAM.from_file(use_cache=True)",
+    "cache warm": "g = GLEAM.from_file(use_cache=True)",
+}
+
+
+def run(code, cache_dir, importtime=False):
+    """
+    Runs `code` in a fresh interpreter.
+    outputs:
+    (float, str, str): wall-clock seconds, stdout and stderr.
+    """
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", code]
+    env = dict(os.environ, GLEAM_CACHE_DIR=cache_dir)
+    start = time.perf_counter()
+    result = subprocess.run(
+        command, cwd=REPO_ROOT, env=env, check=True,
+        capture_output=True, text=True
+    )
+    return time.perf_counter() - start, result.stdout, result.stderr
+
+
+def gleam_import_us(stderr):
+    """
+    Self and cumulative import time of the GLEAM module, in microseconds.
+    """
+    for line in stderr.splitlines():
+        if line.rstrip().endswith("| GLEAM"):
+            fields = line.split(":", 1)[1].split("|")
+            return int(fields[0]), int(fields[1])
+    return None, None
+
+
+def main(runs):
+    baseline, _, _ = run("pass", tempfile.gettempdir())
+    print(f"{'case':<12s} {'wall [ms]':>10s} {'load [ms]':>10s} "
+          f"{'import self [ms]':>17s} {'import cum. [ms]':>17s}")
+    print(f"{'python':<12s} {baseline * 1e3:10.1f}")
+    for case, setup in CASES.items():
+        code = (
+            "import time; from GLEAM import GLEAM; "
+            f"start = time.perf_counter(); {setup}; {QUERY}; "
+            "print(time.perf_counter() - start)"
+        )
+        walls, loads = [], []
+        cache_dir = tempfile.mkdtemp(prefix="gleam-bench-")
+        try:
+            if case == "cache warm":
+                run(code, cache_dir)
+            for _ in range(runs):
+                if case == "cache cold":
+                    shutil.rmtree(cache_dir)
+                    os.makedirs(cache_dir)
+                wall, stdout, _ = run(code, cache_dir)
+                walls.append(wall)
+                loads.append(float(stdout))
+            _, _, stderr = run(code, cache_dir, importtime=True)
+            own, cumulative = gleam_import_us(stderr)
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+        print(f"{case:<12s} {min(walls) * 1e3:10.1f} "
+              f"{min(loads) * 1e3:10.2f} {own / 1e3:17.1f} "
+              f"{cumulative / 1e3:17.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,73 @@
+"""
+Benchmark: columnar `EmissionStore` vs. the nested dict layout.
+Reports the memory footprint of both layouts and the latency of
+`query` hits and misses against a five-deep dict traversal.
+"""
+import sys
+from types import MappingProxyType
+
+import _common  # noqa: F401
+from _common import best_of, report
+
+from GLEAM import GLEAM
+
+
+def deep_sizeof(obj, seen=None):
+    """
+    Approximate recursive size of containers and their contents.
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (dict, MappingProxyType)):
+        size += sum(
+            deep_sizeof(key, seen) + deep_sizeof(value, seen)
+            for key, value in obj.items()
+        )
+    elif isinstance(obj, (list, tuple)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+def nested_query(data, year, mode, engine, fuel):
+    """
+    The former dict-of-dicts `query` implementation.
+    """
+    try:
+        emission = data[year][mode][engine][fuel]["GHG"]
+        unit = data[year][mode][engine][fuel]["Unit"]
+    except KeyError:
+        return None, None
+    return emission, unit
+
+
+def main():
+    gleam = GLEAM(mutable=True)
+    data, store = gleam.data, gleam.store
+    # memory
+    nested = deep_sizeof(data)
+    tables = deep_sizeof(
+        (store.years, store.modes, store.engines, store.fuels, store.units)
+    )
+    index = deep_sizeof(store.index)
+    print(f"records: {len(store)}")
+    print(f"nested dict layout:      {nested:10,d} bytes")
+    print(f"columnar record columns: {store.nbytes:10,d} bytes")
+    print(f"  + category tables:     {tables:10,d} bytes")
+    print(f"  + key -> row index:    {index:10,d} bytes")
+    # latency
+    hit = (2040, "Marine", "MeOH", "Biomass")
+    miss = (2040, "Marine", "MeOH", "Coal")
+    number = 200000
+    report("nested dict query (hit)",
+           best_of(lambda: nested_query(data, *hit), number))
+    report("GLEAM.query (hit)", best_of(lambda: gleam.query(*hit), number))
+    report("nested dict query (miss)",
+           best_of(lambda: nested_query(data, *miss), number))
+    report("GLEAM.query (miss)", best_of(lambda: gleam.query(*miss), number))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark: concurrent queries from a ThreadPoolExecutor.
+One shared GLEAM instance is queried from 1-32 threads: scalar `query`
+calls, `query_many` batches, and `query_many(normalize=True)` batches
+while another thread keeps adding aliases to the shared resolver. Every
+result is checked against a single-threaded reference; the report
+lists throughput per thread count and the number of wrong results,
+which must be 0. Run it on a free-threaded build (e.g. python3.13t)
+to see scaling beyond one core; with the GIL, throughput stays flat.
+Usage: python benchmarks/bench_threads.py [--threads 1 2 4 ...]
+    [--keys N] [--batch N]
+"""
+import argparse
+import sys
+import sysconfig
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import _common  # noqa: F401
+from _ledger import synthetic_keys
+
+from GLEAM import GLEAM
+
+
+def scalar_task(gleam, keys, expected):
+    """
+    Queries every key once; returns the number of wrong results.
+    """
+    query = gleam.query
+    return sum(
+        query(*key) != result for key, result in zip(keys, expected)
+    )
+
+
+def batch_task(gleam, columns, expected, normalize=False):
+    """
+    Queries one batch; returns the number of wrong results.
+    """
+    emission, unit, found = gleam.query_many(*columns, normalize=normalize)
+    return int(
+        np.count_nonzero(~np.isclose(emission, expected[0], equal_nan=True))
+        + np.count_nonzero(unit != expected[1])
+        + np.count_nonzero(found != expected[2])
+    )
+
+
+def run(threads, tasks):
+    """
+    Runs `tasks` (callables) in a pool of `threads` threads.
+    outputs:
+    (float, int): wall-clock seconds and total wrong results.
+    """
+    with ThreadPoolExecutor(threads) as pool:
+        start = time.perf_counter()
+        wrong = sum(pool.map(lambda task: task(), tasks))
+        return time.perf_counter() - start, wrong
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32]
+    )
+    parser.add_argument("--keys", type=int, default=200000)
+    parser.add_argument("--batch", type=int, default=10000)
+    args = parser.parse_args(argv)
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, free-threaded build: "
+          f"{bool(sysconfig.get_config_var('Py_GIL_DISABLED'))}, "
+          f"GIL enabled: {gil}")
+    gleam = GLEAM()
+    columns = synthetic_keys(args.keys)
+    keys = list(zip(*(column.tolist() for column in columns)))
+    expected = [gleam.query(*key) for key in keys]
+    # raw spellings for the normalized batches
+    raw = (
+        columns[0].astype(str), np.char.lower(columns[1].astype(str)),
+        columns[2], columns[3]
+    )
+    reference = gleam.query_many(*columns)
+    # scalar work is split in slices, batch work in batches
+    size = args.batch
+    slices = [
+        (keys[start:start + size], expected[start:start + size])
+        for start in range(0, len(keys), size)
+    ]
+    batches = [
+        (
+            [column[start:start + size] for column in columns],
+            [column[start:start + size] for column in raw],
+            [column[start:start + size] for column in reference],
+        )
+        for start in range(0, len(keys), size)
+    ]
+    print(f"{'threads':>7s} {'query [keys/s]':>16s} "
+          f"{'query_many [keys/s]':>20s} {'normalized [keys/s]':>20s} "
+          f"{'wrong':>6s}")
+    for threads in args.threads:
+        seconds, wrong = run(threads, [
+            (lambda part=part: scalar_task(gleam, *part)) for part in slices
+        ])
+        scalar_rate = len(keys) / seconds
+        seconds, batch_wrong = run(threads, [
+            (lambda batch=batch: batch_task(gleam, batch[0], batch[2]))
+            for batch in batches
+        ])
+        wrong += batch_wrong
+        batch_rate = len(keys) / seconds
+        # a writer swaps in new resolver tables while readers resolve
+        stop = threading.Event()
+
+        def writer():
+            count = 0
+            while not stop.is_set():
+                gleam.resolver.add_alias("fuel", f"alias-{count}", "Diesel")
+                count += 1
+                time.sleep(0.001)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            seconds, normalized_wrong = run(threads, [
+                (lambda batch=batch: batch_task(
+                    gleam, batch[1], batch[2], normalize=True
+                ))
+                for batch in batches
+            ])
+        finally:
+            stop.set()
+            thread.join()
+        wrong += normalized_wrong
+        normalized_rate = len(keys) / seconds
+        print(f"{threads:7d} {scalar_rate:16,.0f} {batch_rate:20,.0f} "
+              f"{normalized_rate:20,.0f} {wrong:6d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: unit conversion of batch query results.
+Compares `query_many(..., unit=...)` (unit codes and a precomputed
+conversion-factor matrix) with converting the `query` results row by
+row from their unit strings, for g/km and g/tonne.km targets.
+Usage: python benchmarks/bench_units.py [rows ...]
+"""
+import sys
+
+import numpy as np
+
+import _common  # noqa: F401
+from _common import best_of, report
+from _ledger import synthetic_keys
+
+from GLEAM import GLEAM
+from GLEAM_units import MILE_KM, SHORT_TON_TONNE
+
+
+def per_row(gleam, keys, tons, target):
+    """
+    Converts `query` results one row at a time, parsing unit strings.
+    """
+    converted = []
+    for year, mode, engine, fuel, payload in zip(*keys, tons):
+        emission, unit = gleam.query(year, mode, engine, fuel)
+        if emission is None:
+            converted.append(float("nan"))
+            continue
+        mass, per = unit.split("/")
+        value = emission / MILE_KM
+        if per == "ton.mile":
+            value /= SHORT_TON_TONNE
+            if target == "g/km":
+                value *= payload * SHORT_TON_TONNE
+        elif target == "g/tonne.km":
+            value /= payload * SHORT_TON_TONNE
+        converted.append(value)
+    return converted
+
+
+def main(sizes):
+    gleam = GLEAM()
+    for rows in sizes:
+        years, modes, engines, fuels = synthetic_keys(rows)
+        keys = (years.tolist(), modes.tolist(), engines.tolist(),
+                fuels.tolist())
+        tons = np.random.default_rng(0).uniform(1, 40, rows)
+        print(f"{rows:,d} rows")
+        for target in ("g/km", "g/tonne.km"):
+            report(f"per-row string conversion ({target})", best_of(
+                lambda: per_row(gleam, keys, tons.tolist(), target), 1, 1
+            ), rows)
+            report(f"query_many(unit={target!r})", best_of(
+                lambda: gleam.query_many(
+                    years, modes, engines, fuels, unit=target, tons=tons
+                ), 1, 3
+            ), rows)
+        emission, unit, _ = gleam.query_many(years, modes, engines, fuels)
+        report("  of which convert()", best_of(
+            lambda: gleam._convert(
+                (emission, unit, None), "g/tonne.km", tons
+            ), 1, 3
+        ), rows)
+        reference = per_row(gleam, keys, tons.tolist(), "g/tonne.km")
+        assert np.allclose(
+            reference, gleam.query_many(
+                years, modes, engines, fuels, unit="g/tonne.km", tons=tons
+            )[0], equal_nan=True
+        )
+
+
+if __name__ == "__main__":
+    main([int(float(arg)) for arg in sys.argv[1:]] or [1000000])
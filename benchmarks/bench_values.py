@@ -0,0 +1,79 @@
+"""
+Micro-benchmark: range, threshold and nearest-value queries.
+Compares the sorted value index behind `options_between`,
+`options_below` and `nearest_options` with a full traversal of the
+nested `GLEAM.data` tree (filter, then sort), per year/unit and per
+year/unit/mode.
+"""
+import heapq
+
+import _common  # noqa: F401
+from _common import best_of, report
+
+from GLEAM import GLEAM
+
+
+def traverse(data, year, unit, mode=None):
+    """
+    All (key, GHG) options of a year and unit, by walking the tree.
+    """
+    options = []
+    for mode_name, engines in data[year].items():
+        if mode is not None and mode_name != mode:
+            continue
+        for engine, fuels in engines.items():
+            for fuel, record in fuels.items():
+                if record["Unit"] == unit:
+                    options.append(
+                        ((year, mode_name, engine, fuel), record["GHG"])
+                    )
+    return options
+
+
+def traverse_between(data, year, unit, low, high, mode=None):
+    """
+    Options in [low, high] by ascending GHG, by walking the tree.
+    """
+    return sorted(
+        (option for option in traverse(data, year, unit, mode)
+         if low <= option[1] <= high),
+        key=lambda option: option[1]
+    )
+
+
+def traverse_nearest(data, year, unit, target, k, mode=None):
+    """
+    The `k` options closest to `target`, by walking the tree.
+    """
+    return heapq.nsmallest(
+        k, traverse(data, year, unit, mode),
+        key=lambda option: abs(option[1] - target)
+    )
+
+
+def main():
+    gleam = GLEAM()
+    data = gleam.data
+    number = 20000
+    for mode in (None, "Marine"):
+        label = "year/unit" if mode is None else "year/unit/mode"
+        args = (2035, "g/ton.mile")
+        report(f"traversal, range ({label})", best_of(
+            lambda: traverse_between(data, *args, 5, 20, mode), number
+        ))
+        report(f"options_between ({label})", best_of(
+            lambda: gleam.options_between(*args, 5, 20, mode), number
+        ))
+        report(f"options_below ({label})", best_of(
+            lambda: gleam.options_below(*args, 10, mode), number
+        ))
+        report(f"traversal, 3 nearest ({label})", best_of(
+            lambda: traverse_nearest(data, *args, 15, 3, mode), number
+        ))
+        report(f"nearest_options, k=3 ({label})", best_of(
+            lambda: gleam.nearest_options(*args, 15, 3, mode), number
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Load test of the GLEAM HTTP service (`python -m GLEAM serve`).
+Starts the service on a free local port (unless --port is given for an
+already running one), then drives it with concurrent keep-alive
+connections in two phases: single-key `GET /query` requests (hits and
+misses) and `POST /batch` requests of --batch-size keys. Reports
+requests/s and p50/p99 latency per phase.
+Usage: python benchmarks/loadtest_server.py [--connections 64]
+    [--requests 20000] [--batch-size 2000] [--port PORT]
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlencode
+
+import numpy as np
+
+import _common  # noqa: F401
+from _common import REPO_ROOT
+
+from GLEAM import GLEAM
+
+
+def free_port():
+    """
+    An unused local TCP port.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for(port, timeout=30):
+    """
+    Waits until the service accepts connections.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def client(port, requests, latencies):
+    """
+    Sends `requests` (raw HTTP bytes) over one keep-alive connection.
+    """
+    reader, writer = await asyncio.open_connection(
+        "127.0.0.1", port, limit=2 ** 24
+    )
+    for request in requests:
+        start = time.perf_counter()
+        writer.write(request)
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def phase(port, label, requests, connections):
+    """
+    Spreads `requests` over `connections` clients and reports.
+    """
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(port, requests[i::connections], latencies)
+        for i in range(connections)
+    ))
+    seconds = time.perf_counter() - start
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1e3
+    print(f"{label:<28s} {len(requests):8,d} req "
+          f"{len(requests) / seconds:10,.0f} req/s  "
+          f"p50 {p50:7.2f} ms  p99 {p99:7.2f} ms")
+
+
+def query_request(key):
+    """
+    Raw `GET /query` request for one key.
+    """
+    target = "/query?" + urlencode(dict(zip(
+        ("year", "mode", "engine", "fuel"), key
+    )))
+    return f"GET {target} HTTP/1.1\r\nHost: gleam\r\n\r\n".encode()
+
+
+def batch_request(keys):
+    """
+    Raw `POST /batch` request for many keys.
+    """
+    body = json.dumps({"keys": keys}).encode()
+    return (
+        f"POST /batch HTTP/1.1\r\nHost: gleam\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    ).encode() + body
+
+
+async def main(args):
+    port = args.port or free_port()
+    service = None
+    if not args.port:
+        service = subprocess.Popen(
+            [sys.executable, "-m", "GLEAM", "serve", "--port", str(port)],
+            cwd=REPO_ROOT, stderr=subprocess.DEVNULL
+        )
+    try:
+        await wait_for(port)
+        rng = random.Random(0)
+        keys = [list(key) for key in GLEAM().store.index]
+        misses = [[2027, "Rail", "Diesel-Electric", "Coal"]]
+        singles = [
+            query_request(rng.choice(misses if rng.random() < 0.1 else keys))
+            for _ in range(args.requests)
+        ]
+        await phase(
+            port, "GET /query (10% misses)", singles, args.connections
+        )
+        batches = [
+            batch_request([rng.choice(keys) for _ in range(args.batch_size)])
+            for _ in range(max(args.requests // 100, 1))
+        ]
+        await phase(
+            port, f"POST /batch ({args.batch_size:,d} keys)", batches,
+            min(args.connections, len(batches))
+        )
+    finally:
+        if service is not None:
+            service.terminate()
+            service.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--port", type=int)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,317 @@
+"""
+Benchmark suite over the GLEAM code paths, with machine-readable results.
+`run` times every registered case (best of several repeats) and writes
+a JSON file with the environment and per-case seconds; `compare` lists
+the ratio of two runs per case and flags regressions beyond a threshold
+(exit status 1 if any). Runs offline with the standard library and
+numpy only.
+Usage:
+    python benchmarks/suite.py run [--output results.json] [--quick]
+        [--filter SUBSTRING] [--repeat 5]
+    python benchmarks/suite.py compare BASE.json NEW.json [--threshold 0.1]
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+import numpy as np
+
+import _common  # noqa: F401
+from _common import REPO_ROOT
+from _ledger import synthetic_keys, write_csv_ledger
+
+import GLEAM as gleam_module
+from GLEAM import GLEAM, load_json
+from GLEAM_enrich import enrich
+
+# name -> (factory, rows, sizes, quick sizes); see `case`
+CASES = {}
+# scratch directory of the run, removed at exit
+_scratch = None
+
+
+def case(name, rows=None, sizes=(), quick_sizes=None):
+    """
+    Registers a benchmark case.
+    `factory(size)` prepares the inputs and returns (callable, number):
+    the callable to time and how many calls make one timing run. With
+    `sizes`, one case `<name>[<size>]` is registered per size and `rows`
+    is the size; `quick_sizes` replaces `sizes` under --quick.
+    """
+    def register(factory):
+        CASES[name] = (factory, rows, tuple(sizes), quick_sizes)
+        return factory
+    return register
+
+
+def scratch():
+    """
+    A fresh directory inside the scratch directory of the run.
+    """
+    global _scratch
+    if _scratch is None:
+        _scratch = tempfile.TemporaryDirectory(prefix="gleam-suite-")
+    return tempfile.mkdtemp(dir=_scratch.name)
+
+
+def _python(code):
+    """
+    Wall-clock seconds of `code` in a fresh interpreter.
+    """
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", code], cwd=REPO_ROOT, check=True,
+        capture_output=True
+    )
+    return time.perf_counter() - start
+
+
+@case("import.interpreter")
+def _interpreter(size):
+    return (lambda: _python("pass")), 1
+
+
+@case("import.GLEAM")
+def _import(size):
+    return (lambda: _python("import GLEAM")), 1
+
+
+@case("construct.shared")
+def _construct_shared(size):
+    GLEAM()
+    return GLEAM, 10000
+
+
+@case("construct.mutable")
+def _construct_mutable(size):
+    return (lambda: GLEAM(mutable=True)), 10
+
+
+@case("load.json")
+def _load_json(size):
+    return load_json, 10
+
+
+@case("load.from_file.nocache")
+def _from_file(size):
+    return (lambda: GLEAM.from_file(use_cache=False)), 10
+
+
+@case("load.from_file.cached")
+def _from_file_cached(size):
+    cache_dir = scratch()
+    GLEAM.from_file(cache_dir=cache_dir, use_cache=True)
+    return (
+        lambda: GLEAM.from_file(cache_dir=cache_dir, use_cache=True)
+    ), 10
+
+
+@case("query.hit")
+def _query_hit(size):
+    gleam = GLEAM()
+    return (lambda: gleam.query(2040, "Marine", "MeOH", "Biomass")), 100000
+
+
+@case("query.miss")
+def _query_miss(size):
+    gleam = GLEAM()
+    return (lambda: gleam.query(2040, "Marine", "MeOH", "Coal")), 100000
+
+
+@case("query.hit.metrics")
+def _query_hit_metrics(size):
+    gleam = GLEAM()
+    gleam.enable_metrics()
+    return (lambda: gleam.query(2040, "Marine", "MeOH", "Biomass")), 100000
+
+
+@case("query.hit.metrics_disabled")
+def _query_hit_metrics_disabled(size):
+    gleam = GLEAM()
+    gleam.enable_metrics()
+    gleam.disable_metrics()
+    return (lambda: gleam.query(2040, "Marine", "MeOH", "Biomass")), 100000
+
+
+@case("interpolate.one")
+def _interpolate_one(size):
+    gleam = GLEAM()
+    return (
+        lambda: gleam.interpolate(2037.5, "Long_Haul", "CIDI", "Diesel")
+    ), 100000
+
+
+@case("query_many", sizes=(10 ** 4, 10 ** 5, 10 ** 6),
+      quick_sizes=(10 ** 4, 10 ** 5))
+def _query_many(size):
+    gleam = GLEAM()
+    keys = synthetic_keys(size)
+    return (lambda: gleam.query_many(*keys)), 1
+
+
+@case("interpolate_many", sizes=(10 ** 4, 10 ** 5, 10 ** 6),
+      quick_sizes=(10 ** 4, 10 ** 5))
+def _interpolate_many(size):
+    gleam = GLEAM()
+    years, modes, engines, fuels = synthetic_keys(size)
+    years = years + np.random.default_rng(0).uniform(0, 5, size)
+    return (lambda: gleam.interpolate_many(
+        years, modes, engines, fuels, bounds="clamp"
+    )), 1
+
+
+@case("emissions", sizes=(10 ** 4, 10 ** 5, 10 ** 6),
+      quick_sizes=(10 ** 4, 10 ** 5))
+def _emissions(size):
+    gleam = GLEAM()
+    keys = synthetic_keys(size)
+    rng = np.random.default_rng(0)
+    miles, tons = rng.uniform(10, 3000, size), rng.uniform(1, 40, size)
+    return (lambda: gleam.emissions(*keys, miles, tons)), 1
+
+
+@case("enrich.csv", sizes=(10 ** 4, 10 ** 5, 10 ** 6),
+      quick_sizes=(10 ** 4, 10 ** 5))
+def _enrich(size):
+    gleam = GLEAM()
+    directory = scratch()
+    source = os.path.join(directory, "ledger.csv")
+    output = os.path.join(directory, "enriched.csv")
+    write_csv_ledger(source, size)
+    return (lambda: enrich(
+        source, output, "year", "mode", "engine", "fuel", "miles", "tons",
+        gleam=gleam
+    )), 1
+
+
+def expand(quick=False, pattern=None):
+    """
+    Concrete cases: name -> (factory, size, rows).
+    """
+    cases = {}
+    for name, (factory, rows, sizes, quick_sizes) in CASES.items():
+        if quick and quick_sizes is not None:
+            sizes = quick_sizes
+        for size in sizes or (None,):
+            label = name if size is None else f"{name}[{size}]"
+            if pattern is None or pattern in label:
+                cases[label] = (factory, size, size or rows)
+    return cases
+
+
+def environment():
+    """
+    Machine, software and data description of a run.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, check=True,
+            capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    with open(gleam_module.DATA_FILE, "rb") as file:
+        data_sha256 = hashlib.sha256(file.read()).hexdigest()
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc)
+        .isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "data_sha256": data_sha256,
+    }
+
+
+def run(args):
+    """
+    Runs the suite and writes the JSON results.
+    """
+    results = {}
+    for label, (factory, size, rows) in expand(
+        args.quick, args.filter
+    ).items():
+        func, number = factory(size)
+        times = timeit.repeat(func, number=number, repeat=args.repeat)
+        seconds = min(times) / number
+        results[label] = {
+            "seconds": seconds, "number": number, "repeat": args.repeat,
+            "rows": rows,
+        }
+        line = f"{label:<32s} {seconds * 1e6:14.3f} us"
+        if rows:
+            line += f" {rows / seconds:16,.0f} rows/s"
+        print(line, flush=True)
+    document = {"environment": environment(), "results": results}
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(document, file, indent=2)
+    print(f"results written to {args.output}")
+    return 0
+
+
+def compare(args):
+    """
+    Compares two runs and flags regressions.
+    outputs:
+    int, exit status: 1 if any case regressed beyond the threshold.
+    """
+    with open(args.base, encoding="utf-8") as file:
+        base = json.load(file)["results"]
+    with open(args.new, encoding="utf-8") as file:
+        new = json.load(file)["results"]
+    regressions = 0
+    print(f"{'case':<32s} {'base [us]':>12s} {'new [us]':>12s} "
+          f"{'ratio':>7s}")
+    for label in sorted(set(base) | set(new)):
+        if label not in base or label not in new:
+            side = "base" if label not in base else "new"
+            print(f"{label:<32s} (missing in {side})")
+            continue
+        before, after = base[label]["seconds"], new[label]["seconds"]
+        ratio = after / before
+        flag = ""
+        if ratio > 1 + args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 / (1 + args.threshold):
+            flag = "  improved"
+        print(f"{label:<32s} {before * 1e6:12.3f} {after * 1e6:12.3f} "
+              f"{ratio:7.2f}{flag}")
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+    runner = commands.add_parser("run", help="run the suite")
+    runner.add_argument("--output", default="benchmark-results.json")
+    runner.add_argument(
+        "--quick", action="store_true", help="skip the largest sizes"
+    )
+    runner.add_argument("--filter", help="only cases containing this")
+    runner.add_argument("--repeat", type=int, default=5)
+    runner.set_defaults(run=run)
+    comparer = commands.add_parser("compare", help="compare two runs")
+    comparer.add_argument("base")
+    comparer.add_argument("new")
+    comparer.add_argument(
+        "--threshold", type=float, default=0.1,
+        help="relative slowdown flagged as a regression (default 0.1)"
+    )
+    comparer.set_defaults(run=compare)
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
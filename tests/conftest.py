@@ -0,0 +1,10 @@
+"""
+Shared pytest setup: puts the repository root on `sys.path`, so the
+GLEAM modules import when the tests are run from any directory.
+"""
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
@@ -0,0 +1,134 @@
+"""
+Tests of the GLEAM lookup.
+"""
+import hashlib
+import itertools
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from GLEAM import GLEAM
+
+KEY = (2025, "Long_Haul", "CIDI", "Diesel")
+# SHA-256 of the metadata and of every `query` result over the product
+# of all years, modes, engines and fuels, computed with the GLEAM.py
+# that held the data as a Python literal
+LITERAL_QUERY_DIGEST = (
+    "a34e0783db9c2c4716addbe014a15a337ca992102ceb9aa3c8b158b1b56f6348"
+)
+LITERAL_QUERY_COUNT = 17136
+
+
+def query_digest(gleam):
+    """
+    (number of keys, SHA-256) of the `query` results of `gleam` over
+    the product of the key values in its data.
+    """
+    data = gleam.data
+    years = sorted(key for key in data if key != "metadata")
+    modes, engines, fuels = set(), set(), set()
+    for year in years:
+        for mode, table in data[year].items():
+            modes.add(mode)
+            for engine, records in table.items():
+                engines.add(engine)
+                fuels.update(records)
+    digest = hashlib.sha256(repr(data["metadata"]).encode("utf-8"))
+    count = 0
+    for key in itertools.product(
+        years, sorted(modes), sorted(engines), sorted(fuels)
+    ):
+        digest.update(repr((key, gleam.query(*key))).encode("utf-8"))
+        count += 1
+    return count, digest.hexdigest()
+
+
+def test_json_data_matches_the_former_literal():
+    assert query_digest(GLEAM()) == (
+        LITERAL_QUERY_COUNT, LITERAL_QUERY_DIGEST
+    )
+    assert query_digest(GLEAM(mutable=True)) == (
+        LITERAL_QUERY_COUNT, LITERAL_QUERY_DIGEST
+    )
+
+
+def test_import_does_not_load_numpy():
+    # a fresh interpreter, as numpy is loaded by the other tests
+    code = "import sys, GLEAM; print('numpy' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True,
+        check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_mutable_copy_edits_are_queried():
+    gleam = GLEAM(mutable=True)
+    assert gleam.query(*KEY) == (1489.0, "g/mile")
+    gleam.data[2025]["Long_Haul"]["CIDI"]["Diesel"]["GHG"] = 1.0
+    assert gleam.query(*KEY) == (1.0, "g/mile")
+    emission, _, found = gleam.query_many(*([part] for part in KEY))
+    assert found.tolist() == [True] and emission.tolist() == [1.0]
+    del gleam.data[2030]
+    assert gleam.query(2030, "Long_Haul", "CIDI", "Diesel") == (None, None)
+    gleam.data[2030] = {
+        "Long_Haul": {"CIDI": {"Diesel": {"GHG": 5.0, "Unit": "g/mile"}}}
+    }
+    assert gleam.query(2030, "Long_Haul", "CIDI", "Diesel") == (
+        5.0, "g/mile"
+    )
+    # dicts assigned into the copy are tracked as well
+    gleam.data[2030]["Long_Haul"]["CIDI"]["Diesel"]["GHG"] = 6.0
+    assert gleam.query(2030, "Long_Haul", "CIDI", "Diesel") == (
+        6.0, "g/mile"
+    )
+
+
+def test_mutable_copy_does_not_change_shared_table():
+    gleam = GLEAM(mutable=True)
+    gleam.data[2025]["Long_Haul"]["CIDI"]["Diesel"]["GHG"] = 1.0
+    assert GLEAM().query(*KEY) == (1489.0, "g/mile")
+
+
+def test_units_of_the_wrong_kind_are_rejected():
+    gleam = GLEAM()
+    keys = ([2025], ["Long_Haul"], ["CIDI"], ["Diesel"])
+    with pytest.raises(ValueError, match="mass unit"):
+        gleam.query_many(*keys, unit="kg")
+    with pytest.raises(ValueError, match="mass unit"):
+        gleam.interpolate_many(*keys, unit="t")
+    with pytest.raises(ValueError, match="rate unit"):
+        gleam.emissions(*keys, [10.0], unit="g/km")
+    assert gleam.emissions(*keys, [10.0], unit="kg").tolist() == [14.89]
+    # a missing payload is still masked per row
+    emission, _, found = gleam.query_many(
+        [2025], ["Rail"], ["Diesel-Electric"], ["Diesel"], unit="g/km"
+    )
+    assert found.tolist() == [True] and np.isnan(emission).all()
+
+
+def test_option_exclusions_take_single_names():
+    gleam = GLEAM()
+    options = gleam.top_options(2040, "Short_Haul", k=100)
+    fuels = {key[3] for key, _ in options}
+    assert "GH2" in fuels
+    for excluded in ("GH2", ["GH2"]):
+        left = gleam.top_options(
+            2040, "Short_Haul", k=100, exclude_fuels=excluded
+        )
+        assert [option for option in options if option[0][3] != "GH2"] == (
+            left
+        )
+    engine = options[0][0][2]
+    assert all(
+        key[2] != engine for key, _ in gleam.top_options(
+            2040, "Short_Haul", k=100, exclude_engines=engine
+        )
+    )
+    assert gleam.top_options(2040, "Short_Haul", k=0) == []
+    with pytest.raises(ValueError, match="non-negative"):
+        gleam.top_options(2040, "Short_Haul", k=-1)
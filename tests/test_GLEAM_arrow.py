@@ -0,0 +1,40 @@
+"""
+Tests of the Arrow interop.
+"""
+import pytest
+
+import GLEAM_arrow
+from GLEAM import GLEAM
+
+pytest.importorskip("pyarrow")
+
+
+def test_failed_conversions_are_null():
+    # a ton-mile Rail rate cannot become g/km without payloads
+    table = GLEAM_arrow.query_table(
+        GLEAM(), [2025, 2025], ["Rail", "Long_Haul"],
+        ["Diesel-Electric", "CIDI"], ["Diesel", "Diesel"], unit="g/km"
+    )
+    assert table.column("GHG").null_count == 1
+    assert table.column("GHG").to_pylist()[0] is None
+    assert table.column("Unit").to_pylist() == [None, "g/km"]
+
+
+def test_normalize_dictionary_columns():
+    import pyarrow
+    table = pyarrow.table({
+        "year": [2025, 2025, 2025],
+        "mode": pyarrow.array(
+            ["long haul", "Long_Haul", "nowhere"]
+        ).dictionary_encode(),
+        "engine": pyarrow.array(["cidi"] * 3).dictionary_encode(),
+        "fuel": pyarrow.array(["diesel"] * 3).dictionary_encode(),
+    })
+    expected = [1489.0, 1489.0, None]
+    result = GLEAM_arrow.query_table(
+        GLEAM(), *(table.column(name) for name in table.column_names),
+        normalize=True
+    )
+    assert result.column("GHG").to_pylist() == expected
+    enriched = GLEAM_arrow.enrich_table(table, normalize=True)
+    assert enriched.column("GHG").to_pylist() == expected
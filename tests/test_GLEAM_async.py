@@ -0,0 +1,49 @@
+"""
+Tests of the micro-batching asyncio facade.
+"""
+import asyncio
+
+import pytest
+
+from GLEAM_async import AsyncGLEAM
+
+
+def test_malformed_request_fails_alone():
+    async def run():
+        agleam = AsyncGLEAM()
+        return await asyncio.gather(
+            agleam.aquery(2025, ["x"], "y", "z"),
+            agleam.aquery(2025, "Long_Haul", "CIDI", "Diesel"),
+            agleam.aquery(2025, "Long_Haul", "CIDI", "Coal"),
+            return_exceptions=True,
+        )
+
+    bad, good, miss = asyncio.run(run())
+    assert isinstance(bad, TypeError)
+    assert good == (1489.0, "g/mile")
+    assert miss == (None, None)
+
+
+def test_batches_match_query():
+    async def run():
+        agleam = AsyncGLEAM(max_batch=2)
+        results = await asyncio.gather(*(
+            agleam.aquery(year, "Long_Haul", "CIDI", "Diesel")
+            for year in (2025, 2030, 2035, 2031)
+        ))
+        return results, agleam.stats()
+
+    results, stats = asyncio.run(run())
+    assert results[0] == (1489.0, "g/mile")
+    assert results[3] == (None, None)
+    assert stats["batches"] == 2 and stats["requests"] == 4
+
+
+@pytest.mark.parametrize("window", [0, 0.001])
+def test_window_flushes_pending_requests(window):
+    async def run():
+        return await AsyncGLEAM(window=window).aquery(
+            2025, "Long_Haul", "CIDI", "Diesel"
+        )
+
+    assert asyncio.run(run()) == (1489.0, "g/mile")
@@ -0,0 +1,18 @@
+"""
+Tests of the chunked ledger enrichment.
+"""
+from GLEAM_enrich import enrich
+
+
+def test_header_only_input_writes_enriched_header(tmp_path):
+    source = tmp_path / "empty.csv"
+    source.write_text("year,mode,engine,fuel,miles\n")
+    output = tmp_path / "out.csv"
+    stats = enrich(
+        str(source), str(output), "year", "mode", "engine", "fuel",
+        miles="miles"
+    )
+    assert stats["rows"] == 0
+    assert output.read_text().splitlines() == [
+        "year,mode,engine,fuel,miles,GHG,Unit,GHG_total_g"
+    ]
@@ -0,0 +1,82 @@
+"""
+Tests of the key normalization and alias resolution.
+"""
+import numpy as np
+
+from GLEAM import GLEAM
+from GLEAM_keys import KeyResolver, fold
+from GLEAM_store import EmissionStore
+
+
+def record(ghg):
+    return {"GHG": ghg, "Unit": "g/mile"}
+
+
+def small_store():
+    """
+    A store whose fuels "Bio-Diesel" and "BioDiesel" fold alike.
+    """
+    return EmissionStore.from_nested({
+        2025: {"Long_Haul": {"CIDI": {
+            "Diesel": record(1.0), "Bio-Diesel": record(2.0),
+            "BioDiesel": record(3.0),
+        }}},
+    })
+
+
+def test_fold():
+    assert fold("HFO 2.7%") == fold("HFO-2.7") == "hfo2.7"
+    assert fold("Long_Haul") == fold(" long haul ") == "longhaul"
+
+
+def test_folding_and_aliases():
+    resolver = KeyResolver(GLEAM().store)
+    assert resolver.resolve("mode", "long-haul") == "Long_Haul"
+    assert resolver.resolve("mode", "LONG HAUL") == "Long_Haul"
+    assert resolver.resolve("fuel", "b20") == "Biodiesel-20"
+    assert resolver.resolve("mode", "vessel") == "Marine"
+    assert resolver.resolve("year", "2025") == 2025
+    assert resolver.resolve("year", 2030.0) == 2030
+    assert resolver.resolve("year", "2027.5") is None
+    assert resolver.resolve("mode", "hovercraft") is None
+    assert resolver.encode(
+        "mode", np.array(["short haul", "Rail", "?"])
+    ).tolist() == [
+        GLEAM().store.modes.index("Short_Haul"),
+        GLEAM().store.modes.index("Rail"), -1,
+    ]
+
+
+def test_ambiguous_folds_are_unresolved():
+    resolver = KeyResolver(small_store(), aliases={})
+    # exact spellings still resolve; folded ones are ambiguous
+    assert resolver.resolve("fuel", "Bio-Diesel") == "Bio-Diesel"
+    assert resolver.resolve("fuel", "BioDiesel") == "BioDiesel"
+    assert resolver.resolve("fuel", "bio diesel") is None
+    assert resolver.resolve("fuel", "diesel") == "Diesel"
+
+
+def test_add_alias():
+    resolver = KeyResolver(small_store(), aliases={})
+    assert resolver.resolve("fuel", "bio diesel") is None
+    resolver.add_alias("fuel", "bio diesel", "BioDiesel")
+    assert resolver.resolve("fuel", "Bio Diesel") == "BioDiesel"
+    # aliases to keys that are not in the store are ignored
+    resolver.add_alias("fuel", "coal", "Coal")
+    assert resolver.resolve("fuel", "coal") is None
+
+
+def test_stats():
+    resolver = KeyResolver(GLEAM().store)
+    resolver.encode("mode", ["long haul", "long haul", "Rail", "?"])
+    resolver.resolve("engine", "cidi")
+    stats = resolver.stats()
+    assert stats["mode"] == {
+        "hits": 1, "misses": 3, "size": 3, "unresolved": 1
+    }
+    assert stats["engine"]["unresolved"] == 0
+    assert stats["engine"]["misses"] == 1
+    resolver.clear()
+    assert resolver.stats()["mode"] == {
+        "hits": 0, "misses": 0, "size": 0, "unresolved": 0
+    }
@@ -0,0 +1,73 @@
+"""
+Tests of the lookup instrumentation.
+"""
+from GLEAM import GLEAM
+from GLEAM_metrics import OTHER_KEY, Metrics
+
+KEY = (2025, "Long_Haul", "CIDI", "Diesel")
+
+
+def test_reset_keeps_counting_scalar_queries():
+    gleam = GLEAM()
+    metrics = gleam.enable_metrics()
+    gleam.query(*KEY)
+    metrics.reset()
+    assert metrics.hit_counts() == {}
+    gleam.query(*KEY)
+    gleam.query(2025, "Long_Haul", "CIDI", "Coal")
+    assert metrics.hit_counts() == {KEY: 1}
+    assert metrics.miss_counts()["fuel"] == {
+        (2025, "Long_Haul", "CIDI", "Coal"): 1
+    }
+
+
+def test_miss_keys_are_capped_per_level():
+    gleam = GLEAM()
+    metrics = gleam.enable_metrics(Metrics(gleam.store, max_miss_keys=2))
+    for number in range(5):
+        gleam.query(2025, "Long_Haul", "CIDI", f"Fuel-{number}")
+    gleam.query(2025, "Long_Haul", "CIDI", "Fuel-0")
+    assert metrics.miss_counts()["fuel"] == {
+        OTHER_KEY: 3,
+        (2025, "Long_Haul", "CIDI", "Fuel-0"): 2,
+        (2025, "Long_Haul", "CIDI", "Fuel-1"): 1,
+    }
+    gleam.query_many(
+        [2025] * 3, "Long_Haul", "CIDI", ["Fuel-1", "Fuel-9", "Diesel"]
+    )
+    assert metrics.miss_counts()["fuel"][OTHER_KEY] == 4
+
+
+def test_normalized_emissions_are_classified_after_resolution():
+    gleam = GLEAM()
+    metrics = gleam.enable_metrics()
+    gleam.emissions(
+        ["2025"], ["long haul"], ["cidi"], ["coal"], [10.0], normalize=True
+    )
+    misses = metrics.miss_counts()
+    assert misses["year"] == {}
+    assert misses["fuel"] == {(2025, "Long_Haul", "CIDI", None): 1}
+
+
+def test_interpolations_count_hits_and_misses():
+    gleam = GLEAM()
+    metrics = gleam.enable_metrics()
+    gleam.interpolate(2027.5, "Long_Haul", "CIDI", "Diesel")
+    gleam.interpolate(2027.5, "Long_Haul", "CIDI", "Coal")
+    gleam.interpolate_many(
+        [2027.5, 2027.5, 2030.0, 2030], "Long_Haul", "CIDI",
+        ["Diesel", "Diesel", "Diesel", "Coal"]
+    )
+    gleam.interpolate_many(
+        [2031], ["long haul"], ["cidi"], ["diesel"], normalize=True
+    )
+    assert metrics.hit_counts() == {
+        (2027.5, "Long_Haul", "CIDI", "Diesel"): 3,
+        (2030, "Long_Haul", "CIDI", "Diesel"): 1,
+        (2031, "Long_Haul", "CIDI", "Diesel"): 1,
+    }
+    assert metrics.miss_counts()["fuel"] == {
+        (2027.5, "Long_Haul", "CIDI", "Coal"): 1,
+        (2030, "Long_Haul", "CIDI", "Coal"): 1,
+    }
+    assert metrics.miss_counts()["year"] == {}
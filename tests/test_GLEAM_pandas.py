@@ -0,0 +1,26 @@
+"""
+Tests of the `df.gleam` DataFrame accessor.
+"""
+import pytest
+
+pd = pytest.importorskip("pandas")
+import GLEAM_pandas  # noqa: E402,F401
+
+
+def ledger():
+    return pd.DataFrame({
+        "year": [2025], "mode": ["Long_Haul"], "engine": ["CIDI"],
+        "fuel": ["Diesel"], "miles": [100.0],
+    })
+
+
+def test_mass_unit_totals_are_named_after_the_unit():
+    frame = ledger().gleam.enrich(miles="miles", unit="kg")
+    assert "GHG_total_g" not in frame
+    assert frame["GHG_total_kg"].tolist() == [pytest.approx(148.9)]
+    assert frame["GHG"].tolist() == [1489.0]
+
+
+def test_mass_unit_without_miles_is_rejected():
+    with pytest.raises(ValueError):
+        ledger().gleam.enrich(unit="kg")
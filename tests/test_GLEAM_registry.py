@@ -0,0 +1,74 @@
+"""
+Tests of the registry of GREET releases.
+"""
+import json
+
+import pytest
+
+from GLEAM import DATA_FILE, GLEAM, load_json
+from GLEAM_registry import DEFAULT_VERSION, Registry
+from GLEAM_scenario import Scenario
+
+KEY = (2030, "Long_Haul", "CIDI", "Diesel")
+
+
+@pytest.fixture
+def release(tmp_path):
+    """
+    A release file with every GHG value doubled.
+    """
+    data = load_json()
+    for year, modes in data.items():
+        if year == "metadata":
+            continue
+        for engines in modes.values():
+            for fuels in engines.values():
+                for record in fuels.values():
+                    record["GHG"] *= 2
+    path = tmp_path / "release.json"
+    path.write_text(json.dumps({str(key): data[key] for key in data}))
+    return str(path)
+
+
+def test_releases_load_on_first_use(release):
+    registry = Registry({DEFAULT_VERSION: DATA_FILE, "doubled": release})
+    assert registry.versions() == [DEFAULT_VERSION, "doubled"]
+    assert registry.default == DEFAULT_VERSION
+    assert not registry.is_loaded(DEFAULT_VERSION)
+    assert not registry.is_loaded("doubled")
+    assert registry.query(*KEY) == GLEAM().query(*KEY)
+    # the packaged extract shares the process-wide store
+    assert registry.get().store is GLEAM().store
+    assert registry.is_loaded(DEFAULT_VERSION)
+    assert not registry.is_loaded("doubled")
+    assert registry.query(*KEY, version="doubled") == (2684.0, "g/mile")
+    assert registry.get("doubled") is registry.get("doubled")
+
+
+def test_duplicate_and_unknown_versions():
+    registry = Registry()
+    with pytest.raises(ValueError, match="already exists"):
+        registry.register(DEFAULT_VERSION, DATA_FILE)
+    with pytest.raises(ValueError, match="unknown GLEAM release"):
+        registry.query(*KEY, version="1999")
+    with pytest.raises(ValueError, match="unknown GLEAM release"):
+        registry.get("1999")
+
+
+def test_compare(release):
+    restated = Scenario(name="restated").override(*KEY, 1000.0)
+    registry = Registry(
+        {DEFAULT_VERSION: DATA_FILE, "doubled": release},
+        default="doubled"
+    )
+    registry.register("restated", restated)
+    assert registry.is_loaded("restated")
+    assert registry.compare(*KEY) == {
+        DEFAULT_VERSION: (1342.0, "g/mile"),
+        "doubled": (2684.0, "g/mile"),
+        "restated": (1000.0, "g/mile"),
+    }
+    assert registry.compare(*KEY, versions=["restated"]) == {
+        "restated": (1000.0, "g/mile")
+    }
+    assert registry.query(*KEY) == (2684.0, "g/mile")
@@ -0,0 +1,37 @@
+"""
+Tests of the scenario overlays.
+"""
+from GLEAM_scenario import Scenario
+
+KEY = (2030, "Long_Haul", "CIDI", "Diesel")
+
+
+def test_edits_swap_the_overrides():
+    scenario = Scenario().override(*KEY, 100.0)
+    overrides = scenario.overrides
+    scenario.scale(0.5, mode="Long_Haul", fuel="Diesel")
+    scenario.revert(year=2025)
+    # readers holding the former dict never see it change
+    assert overrides == {KEY: (100.0, "g/mile")}
+    assert scenario.overrides[KEY] == (50.0, "g/mile")
+    assert scenario.query(*KEY) == (50.0, "g/mile")
+
+
+def test_materialized_store_follows_the_delta():
+    scenario = Scenario().override(*KEY, 100.0)
+    assert scenario.interpolate(2030, *KEY[1:]) == (100.0, "g/mile")
+    stale = scenario._materialized
+    scenario.override(*KEY, 200.0)
+    # a reader that built from the former delta stores its result after
+    # the edit
+    scenario._materialized = stale
+    assert scenario.interpolate(2030, *KEY[1:]) == (200.0, "g/mile")
+    assert scenario.materialize() is scenario.materialize()
+
+
+def test_derived_scenario_follows_its_base():
+    base = Scenario().override(*KEY, 100.0)
+    derived = Scenario(base)
+    assert derived.interpolate(2030, *KEY[1:]) == (100.0, "g/mile")
+    base.override(*KEY, 300.0)
+    assert derived.interpolate(2030, *KEY[1:]) == (300.0, "g/mile")
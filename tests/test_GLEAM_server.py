@@ -0,0 +1,70 @@
+"""
+Tests of the HTTP query service handlers.
+"""
+import asyncio
+import json
+
+from GLEAM_server import GLEAMServer
+
+
+def test_batch_rejects_malformed_keys():
+    status, _ = GLEAMServer().batch(json.dumps({"keys": [
+        [2025, "Long_Haul", "CIDI", "Diesel", 1], [2025, "x", "y", "z"]
+    ]}).encode("utf-8"))
+    assert status == 400
+
+
+def test_batch_parses_string_years_like_query():
+    status, body = GLEAMServer().batch(json.dumps({"keys": [
+        ["2025", "Long_Haul", "CIDI", "Diesel"],
+        ["x", "Long_Haul", "CIDI", "Diesel"],
+    ]}).encode("utf-8"))
+    assert status == 200
+    assert json.loads(body)["results"] == [
+        {"GHG": 1489.0, "Unit": "g/mile"}, None
+    ]
+
+
+def test_query_and_batch_parse_years_alike():
+    server = GLEAMServer()
+    years = ["2025", "2025.0", 2025, 2025.0, "2025.5", "x"]
+    status, body = server.batch(json.dumps({"keys": [
+        [year, "Long_Haul", "CIDI", "Diesel"] for year in years
+    ]}).encode("utf-8"))
+    assert status == 200
+    batch = [result is not None for result in json.loads(body)["results"]]
+    query = [
+        server.respond(
+            "GET", f"/query?year={year}&mode=Long_Haul&engine=CIDI"
+            "&fuel=Diesel", b""
+        ).startswith(b"HTTP/1.1 200")
+        for year in years
+    ]
+    assert batch == query == [True, True, True, True, False, False]
+
+
+def request(head):
+    """
+    Sends a raw request head to a running server and reads the reply.
+    """
+    async def exchange():
+        server = await GLEAMServer().start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(head)
+        reply = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return reply
+    return asyncio.run(exchange())
+
+
+def test_invalid_content_length_is_rejected():
+    for length in (b"abc", b"-5"):
+        reply = request(
+            b"POST /batch HTTP/1.1\r\nContent-Length: " + length
+            + b"\r\n\r\n"
+        )
+        assert reply.startswith(b"HTTP/1.1 400 Bad Request")
+        assert b"Connection: close" in reply
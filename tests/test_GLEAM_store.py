@@ -0,0 +1,133 @@
+"""
+Tests of the columnar store and its binary cache.
+"""
+import os
+import stat
+
+import numpy as np
+import pytest
+
+from GLEAM import GLEAM
+from GLEAM_store import DATA_FILE, load_store
+
+KEY = (2025, "Long_Haul", "CIDI", "Diesel")
+
+
+def cache_file(cache_dir):
+    """
+    The single cache file written to `cache_dir`.
+    """
+    names = os.listdir(cache_dir)
+    assert len(names) == 1 and names[0].endswith(".store")
+    return os.path.join(cache_dir, names[0])
+
+
+def test_default_gleam_writes_no_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("GLEAM_CACHE_DIR", str(tmp_path))
+    GLEAM.from_file()
+    assert os.listdir(tmp_path) == []
+
+
+def test_cache_is_world_readable(tmp_path):
+    load_store(DATA_FILE, str(tmp_path), use_cache=True)
+    mode = stat.S_IMODE(os.stat(cache_file(tmp_path)).st_mode)
+    assert mode == 0o644
+
+
+@pytest.mark.parametrize("damage", [
+    lambda data: data[:len(data) // 2],
+    lambda data: data[:100],
+    lambda data: b"",
+    lambda data: b"garbage" * 100,
+])
+def test_damaged_cache_is_rebuilt(tmp_path, damage):
+    load_store(DATA_FILE, str(tmp_path), use_cache=True)
+    path = cache_file(tmp_path)
+    with open(path, "rb") as file:
+        data = file.read()
+    with open(path, "wb") as file:
+        file.write(damage(data))
+    store = load_store(DATA_FILE, str(tmp_path), use_cache=True)
+    assert store.lookup[KEY] == (1489.0, "g/mile")
+    # the cache was rewritten
+    with open(path, "rb") as file:
+        assert file.read() == data
+
+
+SERIES = ("Long_Haul", "CIDI", "Diesel")
+# a series with a single knot, in 2025
+GAP = ("Marine", "MeOH", "Flare-Gas")
+
+
+@pytest.mark.parametrize("method, bounds, year, expected", [
+    ("linear", "error", 2025, 1489.0),
+    ("linear", "error", 2027.5, (1489.0 + 1342.0) / 2),
+    ("linear", "error", 2049, 1237.0 + (1096.0 - 1237.0) * 4 / 5),
+    ("linear", "error", 2050, 1096.0),
+    ("step", "error", 2034.9, 1342.0),
+    ("step", "error", 2050, 1096.0),
+    ("linear", "clamp", 2020, 1489.0),
+    ("linear", "clamp", 2060, 1096.0),
+    ("step", "clamp", 2060, 1096.0),
+    ("linear", "extrapolate", 2020, 1489.0 + (1489.0 - 1342.0)),
+    ("linear", "extrapolate", 2055, 1096.0 + (1096.0 - 1237.0)),
+    ("step", "extrapolate", 2020, 1489.0),
+    ("step", "extrapolate", 2055, 1096.0),
+])
+def test_interpolation(method, bounds, year, expected):
+    store = GLEAM().store
+    series = store.series_index[SERIES]
+    assert store.interpolate_one(series, year, method, bounds) == (
+        pytest.approx(expected)
+    )
+    emission, unit, found = store.interpolate(
+        [series], [year], method, bounds
+    )
+    assert found.tolist() == [True]
+    assert emission[0] == pytest.approx(expected)
+    assert store.units[unit[0]] == "g/mile"
+
+
+def test_interpolation_errors():
+    store = GLEAM().store
+    series = store.series_index[SERIES]
+    for interpolate in (store.interpolate_one, store.interpolate):
+        with pytest.raises(ValueError, match="outside the covered range"):
+            interpolate(series, 2051)
+        with pytest.raises(ValueError, match="method"):
+            interpolate(series, 2030, method="cubic")
+        with pytest.raises(ValueError, match="bounds"):
+            interpolate(series, 2060, bounds="wrap")
+
+
+def test_interpolation_needs_both_knots():
+    store = GLEAM().store
+    gap = store.series_index[GAP]
+    assert store.interpolate_one(gap, 2025) == 1.77
+    assert store.interpolate_one(gap, 2027) is None
+    assert store.interpolate_one(gap, 2027, "step") == 1.77
+    emission, unit, found = store.interpolate([gap, -1], 2027)
+    assert found.tolist() == [False, False]
+    assert unit.tolist() == [-1, -1] and np.isnan(emission).all()
+
+
+def test_scalar_and_vectorized_interpolation_agree():
+    store = GLEAM().store
+    years = np.linspace(2015, 2060, 91)
+    for method in ("linear", "step"):
+        for bounds in ("clamp", "extrapolate"):
+            series = np.repeat(np.arange(len(store.series)), len(years))
+            grid = np.tile(years, len(store.series))
+            emission, _, found = store.interpolate(
+                series, grid, method, bounds
+            )
+            scalar = [
+                store.interpolate_one(code, year, method, bounds)
+                for code, year in zip(series.tolist(), grid.tolist())
+            ]
+            assert found.tolist() == [value is not None for value in scalar]
+            np.testing.assert_allclose(
+                emission[found],
+                [value for value in scalar if value is not None],
+                rtol=1e-12
+            )
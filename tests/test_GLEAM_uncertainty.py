@@ -0,0 +1,91 @@
+"""
+Tests of the Monte Carlo uncertainty propagation.
+"""
+import numpy as np
+
+from GLEAM import GLEAM
+from GLEAM_uncertainty import MonteCarlo, Uncertainty
+
+SAMPLES = 200
+PERCENTILES = (5, 50, 95)
+# three routes (two multi-leg, one single leg) and an empty one, with a
+# ton-mile Rail leg and a leg that is not found
+OFFSETS = np.array([0, 3, 4, 4, 6])
+LEGS = (
+    [2025, 2030, 2025, 2040, 2035, 2025],
+    ["Short_Haul", "Rail", "Short_Haul", "Marine", "Long_Haul", "Long_Haul"],
+    ["CIDI", "Diesel-Electric", "CIDI", "MeOH", "CIDI", "CIDI"],
+    ["Diesel", "Diesel", "Diesel", "Biomass", "Diesel", "Coal"],
+    np.array([100.0, 500.0, 50.0, 2000.0, 300.0, 10.0]),
+    np.array([20.0, 20.0, 20.0, 30.0, 10.0, 10.0]),
+)
+
+
+def monte_carlo():
+    uncertainty = Uncertainty(GLEAM().store, "triangular", 0.2).pathway(
+        "Diesel", "lognormal", 0.3
+    )
+    return MonteCarlo(uncertainty=uncertainty, samples=SAMPLES, seed=7,
+                      block_size=64)
+
+
+def brute_force(monte_carlo):
+    """
+    Route percentiles summed sample by sample from the factor matrix.
+    """
+    rows, activity = monte_carlo.legs(*LEGS)
+    factors = monte_carlo.factors()
+    summary = []
+    for start, stop in zip(OFFSETS[:-1], OFFSETS[1:]):
+        totals = np.zeros(SAMPLES)
+        for leg in range(start, stop):
+            if rows[leg] < 0:
+                totals = totals + np.nan
+            else:
+                totals = totals + factors[:, rows[leg]] * activity[leg]
+        summary.append(np.percentile(totals, PERCENTILES))
+    return np.array(summary)
+
+
+def collect(chunks):
+    return np.concatenate([summary for _, summary in chunks])
+
+
+def test_draws_are_reproducible():
+    uncertainty = Uncertainty(GLEAM().store).pathway(
+        "Electricity", "triangular", 0.3
+    )
+    draws = uncertainty.draw(100, seed=3, block_size=32)
+    assert np.array_equal(draws, uncertainty.draw(100, seed=3, block_size=32))
+    assert not np.array_equal(draws, uncertainty.draw(100, seed=4,
+                                                      block_size=32))
+    # blocks are independent streams: a shorter draw is a prefix
+    assert np.array_equal(draws[:64], uncertainty.draw(64, seed=3,
+                                                       block_size=32))
+    # a shared pathway takes one draw per sample
+    rows = [row for row, key in enumerate(uncertainty.store.keys)
+            if key[3] == "Electricity"]
+    assert np.all(draws[:, rows] == draws[:, rows[:1]])
+    assert np.all(np.abs(draws[:, rows] - 1) <= 0.3)
+
+
+def test_route_percentiles_match_brute_force():
+    expected = brute_force(monte_carlo())
+    for workers in (1, 2):
+        summary = collect(monte_carlo().summaries(
+            *LEGS, offsets=OFFSETS, percentiles=PERCENTILES,
+            memory=8 * SAMPLES * 2, workers=workers
+        ))
+        np.testing.assert_allclose(summary, expected, rtol=1e-12)
+    assert np.isnan(expected[3]).all() and (expected[2] == 0).all()
+
+
+def test_total_matches_brute_force():
+    mc = monte_carlo()
+    rows, activity = mc.legs(*LEGS)
+    found = rows >= 0
+    totals = mc.factors()[:, rows[found]] @ activity[found]
+    np.testing.assert_allclose(
+        mc.total(*LEGS, percentiles=PERCENTILES),
+        np.percentile(totals, PERCENTILES), rtol=1e-12
+    )